@@ -24,6 +24,8 @@ from icml_exp.KG.builder.kg_schema import (
 from icml_exp.KG.extraction.nlp_extractor import NLPFeatureExtractor
 from icml_exp.KG.extraction.keyword_extractor import KeywordExtractor
 from icml_exp.KG.extraction.feature_merger import FeatureMerger
+from icml_exp.columnar_logs import game_filter, is_columnar_store, read_table
+from icml_exp.log_catalog import catalog_query_paths, is_catalog_query
 
 
 class KnowledgeGraphBuilder:
@@ -84,26 +86,36 @@ class KnowledgeGraphBuilder:
         category_filter: Optional[str] = None
     ) -> List[GameRecord]:
         """
-        Load game logs from a directory or file.
+        Load game logs from a directory or file, a columnar log store or a catalog query.
 
         Args:
-            log_path: Path to log file or directory
-            max_files: Maximum number of files to load
+            log_path: Path to log file, directory, columnar log store or catalog query
+                (e.g. "logs/catalog.sqlite?mode=audience&model=gpt-4o", see log_catalog.py)
+            max_files: Maximum number of files (games, for a store) to load
             category_filter: Only load logs from this category
 
         Returns:
             List of parsed GameRecord objects
         """
+        if is_columnar_store(str(log_path)):
+            records = self._load_columnar_logs(str(log_path), max_files, category_filter)
+            self.game_records = records
+            return records
+
+        catalog_files = catalog_query_paths(str(log_path)) if is_catalog_query(str(log_path)) else None
         log_path = Path(log_path)
         records = []
 
-        if log_path.is_file():
+        if catalog_files is None and log_path.is_file():
             record = self._load_single_log(log_path)
             if record:
                 records.append(record)
         else:
-            # Recursively find all JSON files
-            json_files = list(log_path.rglob("*.json"))
+            # Recursively find all JSON files, unless the catalog selected them
+            if catalog_files is not None:
+                json_files = [Path(path) for path in catalog_files]
+            else:
+                json_files = list(log_path.rglob("*.json"))
 
             if max_files:
                 json_files = json_files[:max_files]
@@ -121,6 +133,66 @@ class KnowledgeGraphBuilder:
         self.game_records = records
         return records
 
+    def _load_columnar_logs(
+        self,
+        store_path: str,
+        max_games: Optional[int] = None,
+        category_filter: Optional[str] = None
+    ) -> List[GameRecord]:
+        """
+        Load games from a columnar log store (see columnar_logs.py).
+
+        Only the columns used for the graph are read, and the category filter
+        selects the category's partition instead of opening every file.
+        """
+        partition = game_filter(category_filter)
+        games = read_table(
+            store_path, "games",
+            ["game_key", "game_id", "topic_category", "concept_a", "concept_b", "winner_role", "source_path"],
+            partition
+        ).to_pylist()
+        games = [g for g in games if g["concept_a"] and g["concept_b"]]
+        games.sort(key=lambda g: g["source_path"] or "")
+        if max_games:
+            games = games[:max_games]
+
+        records = {}
+        for game in games:
+            records[game["game_key"]] = GameRecord(
+                game_id=game["game_id"],
+                category=game["topic_category"],
+                concept_a=game["concept_a"],
+                concept_b=game["concept_b"],
+                winner_role=game["winner_role"] or "unknown"
+            )
+        if not records:
+            return []
+
+        statements = read_table(
+            store_path, "statements",
+            ["game_key", "statement_id", "player_id", "llm_id", "content", "statement_round",
+             "assigned_concept", "role", "novelty_score", "relevance_score", "reasonableness_score"],
+            partition
+        )
+        for stmt in statements.to_pylist():
+            record = records.get(stmt["game_key"])
+            if record is None:
+                continue
+            record.statements.append(StatementRecord(
+                statement_id=stmt["statement_id"] or 0,
+                player_id=stmt["player_id"],
+                llm_id=stmt["llm_id"] or '',
+                content=stmt["content"] or '',
+                statement_round=stmt["statement_round"] or 0,
+                assigned_concept=stmt["assigned_concept"] or '',
+                role=stmt["role"] or '',
+                novelty_score=stmt["novelty_score"] or 0.0,
+                relevance_score=stmt["relevance_score"] or 0.0,
+                reasonableness_score=stmt["reasonableness_score"] or 0.0
+            ))
+
+        return list(records.values())
+
     def _load_single_log(self, file_path: Path) -> Optional[GameRecord]:
         """Load and parse a single game log file."""
         try:
@@ -0,0 +1,323 @@
+# batch_manifest.py
+
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class BatchManifest:
+    """
+    Durable record of the games of a batch, backed by SQLite
+
+    There is one row per (word pair, round index, config hash) with the state
+    pending / running / done / failed. A runner claims a game before playing it, so
+    a restarted batch skips the games that are already done, and several runner
+    processes (or hosts sharing the file) pointed at the same manifest split the
+    work between them instead of playing the same game twice.
+
+    The manifest doubles as a work queue: a coordinator stores the specification of
+    a batch with add_batch(), and workers that only know the manifest path take the
+    next game with claim_next().
+
+    A running game whose owner has died is handed out again: either its lease has
+    expired, or its owner ran on this host and the process no longer exists. Its
+    checkpoint (if the batch uses checkpoints) then resumes it where it stopped.
+
+    The manifest is safe to share between threads.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 6 * 3600, owner: Optional[str] = None):
+        """
+        Open (or create) a batch manifest
+
+        Parameters:
+            path: SQLite database file
+            lease_seconds: Time after which a running game is considered abandoned
+            owner: Name of this runner in the manifest (default "<hostname>:<pid>")
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.hostname = socket.gethostname()
+        self.owner = owner or f"{self.hostname}:{os.getpid()}"
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            " concept_a TEXT NOT NULL,"
+            " concept_b TEXT NOT NULL,"
+            " round_index INTEGER NOT NULL,"
+            " config_hash TEXT NOT NULL,"
+            " pair_index INTEGER,"
+            " state TEXT NOT NULL,"
+            " owner TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " claimed_at REAL,"
+            " updated_at REAL NOT NULL,"
+            " game_id TEXT,"
+            " error TEXT,"
+            " PRIMARY KEY (concept_a, concept_b, round_index, config_hash))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_games_state ON games (config_hash, state)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS batches ("
+            " config_hash TEXT PRIMARY KEY,"
+            " spec TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def config_hash(players: List, judges: List, base_game_settings: Dict[str, Any],
+                    batch_config: Dict[str, Any]) -> str:
+        """
+        Content hash of everything that determines how the games of a batch are played
+
+        Operational options (worker counts, retries, cache, rate limits...) are left out,
+        so a batch can be restarted with different ones and still match its manifest.
+        """
+        payload = json.dumps(
+            {
+                "players": players,
+                "judges": judges,
+                "game_settings": base_game_settings,
+                "game_mode": batch_config.get("game_mode", "standard"),
+                "audience_llm": batch_config.get("audience_llm"),
+                "seed": batch_config.get("seed"),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def register(self, word_pairs: List, rounds_per_pair: int, config_hash: str) -> int:
+        """
+        Add the games of a batch as pending; games already in the manifest are left untouched
+
+        Returns:
+            int: Number of games that were new
+        """
+        now = time.time()
+        rows = [
+            (word_pair[0], word_pair[1], round_idx, config_hash, pair_idx, PENDING, now)
+            for pair_idx, word_pair in enumerate(word_pairs)
+            for round_idx in range(rounds_per_pair)
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO games"
+                    " (concept_a, concept_b, round_index, config_hash, pair_index, state, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def add_batch(self, config_hash: str, spec: Dict[str, Any]):
+        """Store the specification of a batch (players, judges, settings...) for queue workers"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO batches (config_hash, spec, created_at) VALUES (?, ?, ?)",
+                (config_hash, json.dumps(spec, ensure_ascii=False), time.time()),
+            )
+
+    def batch_spec(self, config_hash: str) -> Optional[Dict[str, Any]]:
+        """Specification stored by add_batch(), or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT spec FROM batches WHERE config_hash = ?", (config_hash,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def claim_next(self, config_hash: Optional[str] = None, max_attempts: int = 3) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the next game of the queue for this runner
+
+        Pending games come first, then failed and abandoned ones that have been
+        tried fewer than max_attempts times.
+
+        Parameters:
+            config_hash: Only take games of this batch (None = any batch with a stored spec)
+            max_attempts: Claims after which a failed or abandoned game is given up
+
+        Returns:
+            Dict or None: word_pair, pair_index, round_index and config_hash of the game,
+                          or None when there is nothing left to claim right now
+        """
+        batch_filter = " AND config_hash = ?" if config_hash is not None else \
+            " AND config_hash IN (SELECT config_hash FROM batches)"
+        batch_params = (config_hash,) if config_hash is not None else ()
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT concept_a, concept_b, round_index, config_hash, pair_index FROM games"
+                    " WHERE (state = ? OR (state = ? AND attempts < ?))" + batch_filter +
+                    " ORDER BY state = ?, attempts, pair_index, round_index LIMIT 1",
+                    (PENDING, FAILED, max_attempts) + batch_params + (FAILED,),
+                ).fetchone()
+
+                if row is None:
+                    running = self._conn.execute(
+                        "SELECT concept_a, concept_b, round_index, config_hash, pair_index, owner, claimed_at,"
+                        " attempts FROM games WHERE state = ?" + batch_filter + " ORDER BY pair_index, round_index",
+                        (RUNNING,) + batch_params,
+                    ).fetchall()
+                    for candidate in running:
+                        if not self._is_abandoned(candidate[5], candidate[6], now):
+                            continue
+                        if candidate[7] < max_attempts:
+                            row = candidate[:5]
+                            break
+                        # Out of attempts: give the game up so that the batch can finish
+                        self._conn.execute(
+                            "UPDATE games SET state = ?, updated_at = ?, error = ?"
+                            " WHERE concept_a = ? AND concept_b = ? AND round_index = ? AND config_hash = ?",
+                            (FAILED, now, f"Abandoned by {candidate[5]}") + tuple(candidate[:4]),
+                        )
+
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                self._conn.execute(
+                    "UPDATE games SET state = ?, owner = ?, attempts = attempts + 1, claimed_at = ?,"
+                    " updated_at = ?, error = NULL"
+                    " WHERE concept_a = ? AND concept_b = ? AND round_index = ? AND config_hash = ?",
+                    (RUNNING, self.owner, now, now) + tuple(row[:4]),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return {
+            "word_pair": [row[0], row[1]],
+            "round_index": row[2],
+            "config_hash": row[3],
+            "pair_index": row[4],
+        }
+
+    def outstanding(self, config_hash: str, max_attempts: int = 3) -> int:
+        """Games of a batch that are pending, running, or failed but still to be retried"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM games WHERE config_hash = ?"
+                " AND (state IN (?, ?) OR (state = ? AND attempts < ?))",
+                (config_hash, PENDING, RUNNING, FAILED, max_attempts),
+            ).fetchone()[0]
+
+    def claim(self, word_pair, round_idx: int, config_hash: str) -> bool:
+        """
+        Atomically take a game for this runner
+
+        Returns:
+            bool: True if the game is now running here; False if it is done or
+                  running under another live owner
+        """
+        key = (word_pair[0], word_pair[1], round_idx, config_hash)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT state, owner, claimed_at FROM games"
+                    " WHERE concept_a = ? AND concept_b = ? AND round_index = ? AND config_hash = ?",
+                    key,
+                ).fetchone()
+
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO games (concept_a, concept_b, round_index, config_hash, state, updated_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        key + (PENDING, now),
+                    )
+                    row = (PENDING, None, None)
+
+                state, owner, claimed_at = row
+                if state == DONE or (state == RUNNING and not self._is_abandoned(owner, claimed_at, now)):
+                    self._conn.execute("COMMIT")
+                    return False
+
+                self._conn.execute(
+                    "UPDATE games SET state = ?, owner = ?, attempts = attempts + 1, claimed_at = ?,"
+                    " updated_at = ?, error = NULL"
+                    " WHERE concept_a = ? AND concept_b = ? AND round_index = ? AND config_hash = ?",
+                    (RUNNING, self.owner, now, now) + key,
+                )
+                self._conn.execute("COMMIT")
+                return True
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def complete(self, word_pair, round_idx: int, config_hash: str, game_id: Optional[str] = None):
+        """Mark a game as done"""
+        self._finish(word_pair, round_idx, config_hash, DONE, game_id=game_id)
+
+    def fail(self, word_pair, round_idx: int, config_hash: str, error: str):
+        """Mark a game as failed; it is claimed again by the next run of the batch"""
+        self._finish(word_pair, round_idx, config_hash, FAILED, error=error)
+
+    def counts(self, config_hash: Optional[str] = None) -> Dict[str, int]:
+        """Number of games in each state (of one batch configuration, or of all)"""
+        query = "SELECT state, COUNT(*) FROM games"
+        params = ()
+        if config_hash is not None:
+            query += " WHERE config_hash = ?"
+            params = (config_hash,)
+        with self._lock:
+            rows = self._conn.execute(query + " GROUP BY state", params).fetchall()
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
+
+    def _finish(self, word_pair, round_idx, config_hash, state, game_id=None, error=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE games SET state = ?, updated_at = ?, game_id = ?, error = ?"
+                " WHERE concept_a = ? AND concept_b = ? AND round_index = ? AND config_hash = ? AND owner = ?",
+                (state, time.time(), game_id, error, word_pair[0], word_pair[1], round_idx, config_hash, self.owner),
+            )
+
+    def _is_abandoned(self, owner: Optional[str], claimed_at: Optional[float], now: float) -> bool:
+        """Whether a running game's owner is gone (lease expired or dead local process)"""
+        if claimed_at is None or now - claimed_at > self.lease_seconds:
+            return True
+
+        hostname, _, pid = (owner or "").rpartition(":")
+        if hostname != self.hostname or not pid.isdigit():
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            return False
+        return False
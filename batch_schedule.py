@@ -0,0 +1,86 @@
+# batch_schedule.py
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class DurationHistory:
+    """
+    Wall-clock durations of past games, used to schedule the longest games of a batch first
+
+    Durations are kept per word pair as an exponential moving average and stored in a
+    small JSON file, so every batch run refines the predictions of the next one. A pair
+    that has never been played is predicted at the average of all known pairs.
+
+    The history is safe to share between threads.
+    """
+
+    def __init__(self, path: Optional[str] = None, smoothing: float = 0.3):
+        """
+        Parameters:
+            path: JSON file to load from and save to (None = keep the history in memory only)
+            smoothing: Weight of a new duration in the moving average
+        """
+        self.path = path
+        self.smoothing = smoothing
+        self.durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.durations = json.load(f)
+
+    @staticmethod
+    def _key(word_pair) -> str:
+        return f"{word_pair[0]}|{word_pair[1]}"
+
+    def predict(self, word_pair) -> float:
+        """Predicted duration of one game of a word pair, in seconds (0 when nothing is known)"""
+        with self._lock:
+            if self._key(word_pair) in self.durations:
+                return self.durations[self._key(word_pair)]
+            if not self.durations:
+                return 0.0
+            return sum(self.durations.values()) / len(self.durations)
+
+    def record(self, word_pair, seconds: float):
+        """Fold the duration of a finished game into the history"""
+        key = self._key(word_pair)
+        with self._lock:
+            previous = self.durations.get(key)
+            if previous is None:
+                self.durations[key] = seconds
+            else:
+                self.durations[key] = (1 - self.smoothing) * previous + self.smoothing * seconds
+
+    def save(self):
+        """Write the history to its file, atomically"""
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.durations, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+def longest_first(word_pairs: List, rounds_per_pair: int,
+                  history: DurationHistory) -> List[Tuple[int, int, List]]:
+    """
+    Every game of a batch as (pair_index, round_index, word_pair), longest predicted first
+
+    Feeding a worker pool in this order (longest processing time first) keeps a slow
+    game from being started last and holding up the end of the batch.
+    """
+    games = [
+        (pair_idx, round_idx, word_pair)
+        for pair_idx, word_pair in enumerate(word_pairs)
+        for round_idx in range(rounds_per_pair)
+    ]
+    # sorted() is stable, so games with equal predictions keep the batch order
+    return sorted(games, key=lambda game: -history.predict(game[2]))
@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+from undercover.history import StatementHistory
+from undercover.agents.judge_agent import LLMJudge
+from undercover.agents.usage import use_usage_log
+
+METRICS = ("novelty_score", "relevance_score", "reasonableness_score")
+
+
+def load_game_records(log_dir: str, max_games: int) -> List[Dict[str, Any]]:
+    """Game records of a log tree, in path order"""
+    paths = []
+    for root, _, files in os.walk(log_dir):
+        paths.extend(os.path.join(root, name) for name in files if name.endswith(".json"))
+
+    records = []
+    for path in sorted(paths):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if "game_record" in data and data["game_record"]["game_process"]["statements"]:
+            records.append(data["game_record"])
+        if len(records) >= max_games:
+            break
+    return records
+
+
+def round_statements(record: Dict[str, Any]) -> List[List[Dict[str, Any]]]:
+    """
+    The statements of a logged game grouped by round, as passed to Judge.evaluate_round
+
+    The history of each statement is rebuilt from the log: the statements before it and
+    the metric eliminations they caused.
+    """
+    concepts = record["concept_pair"]
+    words = {p["player_id"]: p["assigned_concept"] for p in record["players"]}
+    eliminations = {
+        (e["elimination_round"], e["player_id"]): e["elimination_reason"]
+        for e in record["game_process"].get("metric_eliminations", [])
+    }
+
+    history = StatementHistory()
+    rounds: Dict[int, List[Dict[str, Any]]] = {}
+    for statement in record["game_process"]["statements"]:
+        round_number = statement["statement_round"]
+        if round_number not in rounds:
+            rounds[round_number] = []
+            history.append_round(round_number)
+
+        word1 = words[statement["player_id"]]
+        rounds[round_number].append({
+            "player_id": statement["player_id"],
+            "statement": statement["content"],
+            "word1": word1,
+            "word2": concepts["concept_b"] if word1 == concepts["concept_a"] else concepts["concept_a"],
+            "history": history.render()
+        })
+
+        history.append_statement(round_number, statement["player_id"], statement["content"])
+        reason = eliminations.get((round_number, statement["player_id"]))
+        if reason:
+            history.append_elimination(round_number, statement["player_id"], reason)
+
+    return [rounds[round_number] for round_number in sorted(rounds)]
+
+
+def score_agreement(per_statement: List[tuple], per_round: List[tuple]) -> Dict[str, Dict[str, float]]:
+    """Exact agreement and mean absolute difference of the two modes, per metric"""
+    agreement = {}
+    for index, metric in enumerate(METRICS):
+        pairs = [(a[index], b[index]) for a, b in zip(per_statement, per_round)]
+        agreement[metric] = {
+            "exact_agreement": sum(1 for a, b in pairs if a == b) / len(pairs) if pairs else 0.0,
+            "mean_abs_difference": sum(abs(a - b) for a, b in pairs) / len(pairs) if pairs else 0.0
+        }
+    return agreement
+
+
+def benchmark_judge(judge_model: str, games: List[List[List[Dict[str, Any]]]], language: str) -> Dict[str, Any]:
+    """
+    Score every logged round with one judge model in both judge modes
+
+    Statement mode makes one call per statement, in order, as a game does; round mode
+    makes one call per round.
+    """
+    judge = LLMJudge(judge_model, "", language)
+    per_statement, per_round = [], []
+
+    with use_usage_log() as statement_usage:
+        start = time.monotonic()
+        for rounds in games:
+            for statements in rounds:
+                for item in statements:
+                    per_statement.append(judge.evaluate_statement(item["history"], item["statement"],
+                                                                  item["word1"], item["word2"]))
+        statement_seconds = time.monotonic() - start
+
+    with use_usage_log() as round_usage:
+        start = time.monotonic()
+        for rounds in games:
+            for statements in rounds:
+                per_round.extend(judge.evaluate_round(statements))
+        round_seconds = time.monotonic() - start
+
+    return {
+        "statements": len(per_statement),
+        "rounds": sum(len(rounds) for rounds in games),
+        "statement_mode": {
+            "wall_seconds": statement_seconds,
+            "requests": len(statement_usage.calls),
+            "usage": statement_usage.totals().get(judge_model, {})
+        },
+        "round_mode": {
+            "wall_seconds": round_seconds,
+            "requests": len(round_usage.calls),
+            "fallback_statements": judge.round_fallbacks,
+            "usage": round_usage.totals().get(judge_model, {})
+        },
+        "agreement": score_agreement(per_statement, per_round)
+    }
+
+
+def main(log_dir: str, judge_models: List[str], language: str, max_games: int, output_path: str):
+    """
+    Compare round-batch judging with per-statement judging on logged games
+
+    Parameters:
+        log_dir: Log tree of finished games (as written by main_batch.py)
+        judge_models: Judge models to benchmark
+        language: Judge prompt language
+        max_games: Games to re-judge
+        output_path: JSON file for the results ("" = print only)
+    """
+    games = [round_statements(record) for record in load_game_records(log_dir, max_games)]
+    print(f"Re-judging {sum(len(r) for g in games for r in g)} statements of {len(games)} games")
+
+    results = {}
+    for judge_model in judge_models:
+        result = benchmark_judge(judge_model, games, language)
+        results[judge_model] = result
+
+        statement_mode, round_mode = result["statement_mode"], result["round_mode"]
+        print(f"\n{judge_model}:")
+        print(f"  statement mode: {statement_mode['requests']} requests, {statement_mode['wall_seconds']:.1f}s")
+        print(f"  round mode:     {round_mode['requests']} requests, {round_mode['wall_seconds']:.1f}s "
+              f"({round_mode['fallback_statements']} statements fell back to single calls)")
+        for metric, agreement in result["agreement"].items():
+            print(f"  {metric}: {agreement['exact_agreement']:.0%} identical, "
+                  f"mean |difference| {agreement['mean_abs_difference']:.3f}")
+
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\nResults saved to {output_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark round-batch judging against per-statement judging")
+    parser.add_argument("log_dir", help="Directory of game logs to re-judge")
+    parser.add_argument("--judges", nargs="+", default=["gpt-4o"], help="Judge models")
+    parser.add_argument("--language", default="en", help="Judge prompt language")
+    parser.add_argument("--games", type=int, default=20, help="Number of games to re-judge")
+    parser.add_argument("--output", default="", help="JSON file for the results")
+    args = parser.parse_args()
+
+    main(args.log_dir, args.judges, args.language, args.games, args.output)
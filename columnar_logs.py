@@ -0,0 +1,461 @@
+# columnar_logs.py
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+STORE_VERSION = 1
+MARKER_FILE = "_columnar_logs.json"
+LANGUAGES = ("ar", "de", "en", "es", "fr", "it", "jp", "pt", "ru", "zh")
+
+# Columns of each table, as (name, arrow type name); every table is partitioned by topic_category
+TABLE_COLUMNS = {
+    "games": [
+        ("game_key", "string"), ("game_id", "string"), ("timestamp", "string"), ("language", "string"),
+        ("game_mode", "string"), ("concept_a", "string"), ("concept_b", "string"), ("winner_role", "string"),
+        ("total_statement_rounds", "int64"), ("total_voting_rounds", "int64"), ("total_statements", "int64"),
+        ("source_path", "string"),
+    ],
+    "players": [
+        ("game_key", "string"), ("game_id", "string"), ("language", "string"), ("game_mode", "string"),
+        ("player_id", "int64"), ("llm_id", "string"), ("role", "string"), ("assigned_concept", "string"),
+        ("is_winner", "bool_"), ("eliminated_in_voting_round", "int64"),
+    ],
+    "statements": [
+        ("game_key", "string"), ("game_id", "string"), ("language", "string"), ("game_mode", "string"),
+        ("statement_id", "int64"), ("statement_round", "int64"), ("player_id", "int64"), ("llm_id", "string"),
+        ("role", "string"), ("assigned_concept", "string"), ("content", "string"),
+        ("novelty_score", "float64"), ("relevance_score", "float64"), ("reasonableness_score", "float64"),
+    ],
+    "judge_scores": [
+        ("game_key", "string"), ("game_id", "string"), ("statement_id", "int64"), ("judge_id", "string"),
+        ("novelty_score", "float64"), ("relevance_score", "float64"), ("reasonableness_score", "float64"),
+    ],
+    "votes": [
+        ("game_key", "string"), ("game_id", "string"), ("voting_round_id", "int64"), ("voter_id", "int64"),
+        ("voted_for", "int64"),
+    ],
+}
+PARTITION_COLUMN = "topic_category"
+
+
+def _schema(table: str, with_partition: bool = True) -> "pa.Schema":
+    fields = [pa.field(name, getattr(pa, type_name)()) for name, type_name in TABLE_COLUMNS[table]]
+    if with_partition:
+        fields.append(pa.field(PARTITION_COLUMN, pa.string()))
+    return pa.schema(fields)
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("The columnar log store needs pyarrow (pip install pyarrow)")
+
+
+def game_key(game_record: Dict[str, Any]) -> str:
+    """
+    Content hash of a game record
+
+    game_ids are timestamps to the second and are not unique across batches, so rows
+    of the tables are joined on this key; the same game exported twice keeps its key.
+    """
+    # Round-trip first so an in-memory record (integer dict keys) hashes like its JSON log
+    payload = json.dumps(json.loads(json.dumps(game_record, ensure_ascii=False)), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:20]
+
+
+def infer_language(path: Optional[str]) -> Optional[str]:
+    """Language of a log file from its path (logs/<tag>_<mode>/<language>/<topic>/...)"""
+    if not path:
+        return None
+    parts = os.path.normpath(path).split(os.sep)
+    for part in reversed(parts[:-1]):
+        if part in LANGUAGES:
+            return part
+    return None
+
+
+def infer_game_mode(game_record: Dict[str, Any]) -> str:
+    """Game mode of a record: audience if the game had an audience, else standard"""
+    return "audience" if "audience" in game_record else "standard"
+
+
+def flatten_game(game_record: Dict[str, Any], source_path: Optional[str] = None, language: Optional[str] = None,
+                 game_mode: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Rows of every table for one game record
+
+    Parameters:
+        game_record: Game record (the "game_record" of a log file)
+        source_path: Log file the record was read from, if any
+        language: Game language (None = inferred from source_path)
+        game_mode: "standard" or "audience" (None = inferred from the record)
+
+    Returns:
+        Dict: {table name: list of rows}
+    """
+    key = game_key(game_record)
+    game_id = game_record.get("game_id")
+    language = language or infer_language(source_path)
+    game_mode = game_mode or infer_game_mode(game_record)
+    category = game_record.get("topic_category") or "unknown"
+    concepts = game_record.get("concept_pair") or {}
+    summary = game_record.get("game_summary") or {}
+    process = game_record.get("game_process") or {}
+    common = {"game_key": key, "game_id": game_id, PARTITION_COLUMN: category}
+    tagged = dict(common, language=language, game_mode=game_mode)
+
+    players = {p.get("player_id"): p for p in game_record.get("players", [])}
+    rows = {table: [] for table in TABLE_COLUMNS}
+    rows["games"].append(dict(
+        tagged,
+        timestamp=game_record.get("timestamp"),
+        concept_a=concepts.get("concept_a"),
+        concept_b=concepts.get("concept_b"),
+        winner_role=summary.get("winner_role"),
+        total_statement_rounds=summary.get("total_statement_rounds"),
+        total_voting_rounds=summary.get("total_voting_rounds"),
+        total_statements=len(process.get("statements", [])),
+        source_path=source_path
+    ))
+
+    for player in players.values():
+        rows["players"].append(dict(
+            tagged,
+            player_id=player.get("player_id"),
+            llm_id=player.get("llm_id"),
+            role=player.get("role"),
+            assigned_concept=player.get("assigned_concept"),
+            is_winner=player.get("is_winner"),
+            eliminated_in_voting_round=player.get("eliminated_in_voting_round")
+        ))
+
+    for statement in process.get("statements", []):
+        player = players.get(statement.get("player_id"), {})
+        metrics = statement.get("metrics") or {}
+        stats = metrics.get("judges_stats") or {}
+        rows["statements"].append(dict(
+            tagged,
+            statement_id=statement.get("statement_id"),
+            statement_round=statement.get("statement_round"),
+            player_id=statement.get("player_id"),
+            llm_id=statement.get("llm_id", player.get("llm_id")),
+            role=player.get("role"),
+            assigned_concept=player.get("assigned_concept"),
+            content=statement.get("content", ""),
+            novelty_score=stats.get("novelty_score_mean"),
+            relevance_score=stats.get("relevance_score_mean"),
+            reasonableness_score=stats.get("reasonableness_score_mean")
+        ))
+        for evaluation in metrics.get("judges_evaluations") or []:
+            scores = evaluation.get("metrics") or {}
+            rows["judge_scores"].append(dict(
+                common,
+                statement_id=statement.get("statement_id"),
+                judge_id=evaluation.get("judge_id"),
+                novelty_score=scores.get("novelty_score"),
+                relevance_score=scores.get("relevance_score"),
+                reasonableness_score=scores.get("reasonableness_score")
+            ))
+
+    for voting_round in process.get("voting_rounds", []):
+        for vote in voting_round.get("votes", []):
+            rows["votes"].append(dict(
+                common,
+                voting_round_id=voting_round.get("voting_round_id"),
+                voter_id=vote.get("voter_id"),
+                voted_for=vote.get("voted_for")
+            ))
+
+    # Invalid votes are logged as "" rather than a player id
+    for table, columns in TABLE_COLUMNS.items():
+        integers = [name for name, type_name in columns if type_name == "int64"]
+        for row in rows[table]:
+            for name in integers:
+                if not isinstance(row[name], int) or isinstance(row[name], bool):
+                    row[name] = None
+    return rows
+
+
+def is_columnar_store(path: str) -> bool:
+    """Whether a path is the root of a columnar log store"""
+    return os.path.isfile(os.path.join(path, MARKER_FILE))
+
+
+class ColumnarLogSink:
+    """
+    Append-on-write columnar store of game records
+
+    Games are flattened into five tables (games, players, statements, judge_scores,
+    votes), each a Parquet dataset under <root>/<table>/ partitioned by topic_category
+    (topic_category=<value>/ directories). Buffered games are written as new part
+    files, so appends never rewrite existing data. Games already in the store (same
+    content hash) are skipped; the check uses the keys present when the sink was
+    opened, so use one writing process per store or concurrent writers may store a
+    game twice.
+
+    The sink is safe to share between threads.
+    """
+
+    def __init__(self, root: str, flush_every: int = 50):
+        """
+        Parameters:
+            root: Directory of the store
+            flush_every: Buffered games that trigger a write
+        """
+        _require_pyarrow()
+        self.root = root
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._buffer = {table: [] for table in TABLE_COLUMNS}
+        self._buffered_games = 0
+
+        os.makedirs(root, exist_ok=True)
+        marker = os.path.join(root, MARKER_FILE)
+        if not os.path.exists(marker):
+            with open(marker, "w", encoding="utf-8") as f:
+                json.dump({"version": STORE_VERSION, "partitioning": [PARTITION_COLUMN],
+                           "tables": {table: [name for name, _ in columns]
+                                      for table, columns in TABLE_COLUMNS.items()}}, f, indent=2)
+        self._keys = set(read_table(root, "games", columns=["game_key"]).column("game_key").to_pylist())
+
+    def append(self, game_record: Dict[str, Any], source_path: Optional[str] = None, language: Optional[str] = None,
+               game_mode: Optional[str] = None) -> bool:
+        """
+        Add a game record to the store
+
+        Returns:
+            bool: False if the game was already in the store
+        """
+        rows = flatten_game(game_record, source_path, language, game_mode)
+        key = rows["games"][0]["game_key"]
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            for table, table_rows in rows.items():
+                self._buffer[table].extend(table_rows)
+            self._buffered_games += 1
+            if self._buffered_games >= self.flush_every:
+                self._flush_locked()
+        return True
+
+    def flush(self):
+        """Write the buffered games"""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        self.flush()
+
+    def _flush_locked(self):
+        if not self._buffered_games:
+            return
+        part = f"part-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:12]}-{{i}}.parquet"
+        tables = {table: pa.Table.from_pylist(rows, schema=_schema(table))
+                  for table, rows in self._buffer.items() if rows}
+        # The games table is written last: a game is listed only once all its rows are on disk
+        for table in sorted(tables, key=lambda name: name == "games"):
+            ds.write_dataset(
+                tables[table],
+                os.path.join(self.root, table),
+                format="parquet",
+                partitioning=ds.partitioning(pa.schema([pa.field(PARTITION_COLUMN, pa.string())]), flavor="hive"),
+                basename_template=part,
+                existing_data_behavior="overwrite_or_ignore"
+            )
+        self._buffer = {table: [] for table in TABLE_COLUMNS}
+        self._buffered_games = 0
+
+
+def export_logs(log_dir: str, root: str, flush_every: int = 500) -> Tuple[int, int]:
+    """
+    Export every game record of a JSON log tree into a columnar store
+
+    Returns:
+        (games added, games already in the store)
+    """
+    sink = ColumnarLogSink(root, flush_every)
+    added = skipped = 0
+    for directory, dirs, files in os.walk(log_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"Failed to read file {path}: {e}")
+                continue
+            if "game_record" not in data:
+                continue
+            if sink.append(data["game_record"], source_path=path):
+                added += 1
+            else:
+                skipped += 1
+    sink.close()
+    return added, skipped
+
+
+def game_filter(category: Optional[str] = None, language: Optional[str] = None, game_mode: Optional[str] = None,
+                table: str = "games") -> Optional["ds.Expression"]:
+    """
+    Dataset filter selecting games by category, language and mode
+
+    The category filter prunes partitions (only that category's files are opened); the
+    others are pushed down to the Parquet row groups. Tables without language/mode
+    columns (judge_scores, votes) can only be filtered by category.
+    """
+    _require_pyarrow()
+    columns = {name for name, _ in TABLE_COLUMNS[table]}
+    conditions = []
+    if category is not None:
+        conditions.append(ds.field(PARTITION_COLUMN) == category)
+    for name, value in (("language", language), ("game_mode", game_mode)):
+        if value is None:
+            continue
+        if name not in columns:
+            raise ValueError(f"Table {table} cannot be filtered by {name}")
+        conditions.append(ds.field(name) == value)
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def read_table(root: str, table: str, columns: Optional[List[str]] = None,
+               filter: Optional["ds.Expression"] = None) -> "pa.Table":
+    """
+    Read a table of the store, with column projection and a pushed-down filter
+
+    Parameters:
+        root: Directory of the store
+        table: games, players, statements, judge_scores or votes
+        columns: Columns to read (None = all)
+        filter: Dataset expression, e.g. from game_filter()
+    """
+    _require_pyarrow()
+    path = os.path.join(root, table)
+    if not os.path.isdir(path):
+        schema = _schema(table)
+        return schema.empty_table().select(columns) if columns else schema.empty_table()
+    dataset = ds.dataset(path, schema=_schema(table), format="parquet", partitioning="hive")
+    return dataset.to_table(columns=columns, filter=filter)
+
+
+def load_rating_records(root: str, category: Optional[str] = None, language: Optional[str] = None,
+                        game_mode: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Game records with the fields rating.py reads (players, voting rounds, summary)
+
+    Records are ordered by timestamp, then by the path of the log they were exported
+    from. Statements, judge scores and explanations are not read. Audience games have
+    no voting rounds, so, as with their JSON logs, rating.py cannot rate them.
+    """
+    games = read_table(root, "games", ["game_key", "game_id", "timestamp", "game_mode", "winner_role",
+                                       "total_voting_rounds", "source_path"],
+                       game_filter(category, language, game_mode))
+    records = {}
+    for row in sorted(games.to_pylist(), key=lambda r: (r["timestamp"] or "", r["source_path"] or "")):
+        record = {
+            "game_id": row["game_id"],
+            "timestamp": row["timestamp"],
+            "players": [],
+            "game_process": {},
+            "game_summary": {"winner_role": row["winner_role"], "total_voting_rounds": row["total_voting_rounds"]}
+        }
+        if row["game_mode"] != "audience":
+            record["game_process"]["voting_rounds"] = []
+        records[row["game_key"]] = record
+    if not records:
+        return []
+
+    keys = pa.array(list(records))
+    key_filter = ds.field("game_key").isin(keys)
+    partition = game_filter(category)
+    if partition is not None:
+        key_filter = partition & key_filter
+
+    players = read_table(root, "players", ["game_key", "player_id", "llm_id", "role", "assigned_concept",
+                                           "is_winner", "eliminated_in_voting_round"], key_filter)
+    for row in players.to_pylist():
+        records[row.pop("game_key")]["players"].append(row)
+
+    votes = read_table(root, "votes", ["game_key", "voting_round_id", "voter_id", "voted_for"], key_filter)
+    rounds: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    for row in sorted(votes.to_pylist(), key=lambda r: (r["game_key"], r["voting_round_id"])):
+        record = records[row["game_key"]]
+        if "voting_rounds" not in record["game_process"]:
+            continue
+        voting_round = rounds.get((row["game_key"], row["voting_round_id"]))
+        if voting_round is None:
+            voting_round = {"voting_round_id": row["voting_round_id"], "votes": []}
+            rounds[(row["game_key"], row["voting_round_id"])] = voting_round
+            record["game_process"]["voting_rounds"].append(voting_round)
+        voting_round["votes"].append({"voter_id": row["voter_id"], "voted_for": row["voted_for"]})
+    return list(records.values())
+
+
+def load_statements(root: str, category: Optional[str] = None, language: Optional[str] = None,
+                    game_mode: Optional[str] = None, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Statement rows, without reading players, votes or judge details
+
+    Parameters:
+        columns: Columns of the statements table to read (None = all)
+    """
+    return read_table(root, "statements", columns,
+                      game_filter(category, language, game_mode, table="statements")).to_pylist()
+
+
+def load_statement_records(root: str, category: Optional[str] = None, language: Optional[str] = None,
+                           game_mode: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Statements in the format of process_json_files in t-sne/ (statement, llm_id, concept, ids)
+
+    As there, statements of players missing from the player list are left out.
+    """
+    rows = load_statements(root, category, language, game_mode,
+                           ["content", "llm_id", "role", "assigned_concept", "statement_id", "statement_round",
+                            "game_id"])
+    return [
+        {
+            "statement": row["content"],
+            "llm_id": row["llm_id"],
+            "concept": row["assigned_concept"],
+            "statement_id": row["statement_id"],
+            "statement_round": row["statement_round"],
+            "game_id": row["game_id"]
+        }
+        for row in rows if row["role"] is not None
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export JSON game logs into a columnar (Parquet) store")
+    parser.add_argument("log_dir", help="Log tree to export")
+    parser.add_argument("store", help="Directory of the columnar store (created if missing)")
+    parser.add_argument("--flush-every", type=int, default=500, help="Games per written part file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    added, skipped = export_logs(args.log_dir, args.store, args.flush_every)
+    print(f"Exported {added} games ({skipped} already in the store) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+# log_catalog.py
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+CATALOG_SUFFIXES = (".sqlite", ".db")
+# Query keys a catalog query string may use, with whether they can be repeated
+QUERY_KEYS = {
+    "model": True,
+    "mode": False,
+    "language": False,
+    "category": False,
+    "winner": False,
+    "concept": False,
+    "game_id": False,
+    "after": False,
+    "before": False,
+}
+
+
+class LogCatalog:
+    """
+    SQLite index of a JSON game-log tree
+
+    One row per log file: game_id, timestamp, category, language, mode (standard or
+    audience), concept pair, winner role, statement count and the file's size, mtime
+    and sha256, plus the models and roles of its players. Loaders query the catalog and
+    open only the matching files instead of walking the tree and parsing every log.
+
+    update() stats the tree and reads only new or modified files; files that are gone
+    are dropped. Paths are stored relative to the catalog's directory, so a catalog
+    kept next to its logs can be moved with them.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters:
+            path: SQLite database file (created if it does not exist)
+        """
+        self.path = path
+        self.base_dir = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(self.base_dir):
+            os.makedirs(self.base_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " sha256 TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " game_id TEXT,"
+            " timestamp TEXT,"
+            " category TEXT,"
+            " language TEXT,"
+            " mode TEXT,"
+            " concept_a TEXT,"
+            " concept_b TEXT,"
+            " winner_role TEXT,"
+            " statement_count INTEGER)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS players ("
+            " path TEXT NOT NULL,"
+            " player_id INTEGER,"
+            " llm_id TEXT,"
+            " role TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_timestamp ON files (timestamp)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_filters ON files (mode, language, category)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_players_llm ON players (llm_id, path)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_players_path ON players (path)")
+
+    def update(self, log_dir: str) -> Dict[str, Any]:
+        """
+        Index the new and modified JSON files of a log tree, and drop the deleted ones
+
+        Files with the same mtime and size as when they were indexed are not opened; a
+        file whose mtime changed but whose content did not is only re-stamped.
+
+        Returns:
+            Dict: Counts of indexed, re-stamped, unchanged, invalid and removed files, and the time taken
+        """
+        start = time.perf_counter()
+        with self._lock:
+            known = {path: (mtime_ns, size, sha256) for path, mtime_ns, size, sha256 in
+                     self._conn.execute("SELECT path, mtime_ns, size, sha256 FROM files")}
+        prefix = self._relative(log_dir)
+
+        seen = set()
+        indexed, stamped, invalid = [], [], 0
+        for root, dirs, files in os.walk(log_dir):
+            dirs.sort()
+            for name in sorted(files):
+                if not name.endswith(".json"):
+                    continue
+                file_path = os.path.join(root, name)
+                path = self._relative(file_path)
+                seen.add(path)
+                stat = os.stat(file_path)
+                previous = known.get(path)
+                if previous is not None and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                with open(file_path, "rb") as f:
+                    content = f.read()
+                sha256 = hashlib.sha256(content).hexdigest()
+                if previous is not None and previous[2] == sha256:
+                    stamped.append((stat.st_mtime_ns, stat.st_size, path))
+                    continue
+                row, players = self._describe(file_path, content)
+                if row["status"] != "ok":
+                    invalid += 1
+                row.update(path=path, mtime_ns=stat.st_mtime_ns, size=stat.st_size, sha256=sha256)
+                indexed.append((row, players))
+
+        removed = [path for path in known if path not in seen and
+                   (prefix == "." or path == prefix or path.startswith(prefix + os.sep))]
+
+        columns = ["path", "mtime_ns", "size", "sha256", "status", "game_id", "timestamp", "category", "language",
+                   "mode", "concept_a", "concept_b", "winner_role", "statement_count"]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("DELETE FROM players WHERE path = ?",
+                                       [(path,) for path in removed + [row["path"] for row, _ in indexed]])
+                self._conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO files ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    [tuple(row[column] for column in columns) for row, _ in indexed]
+                )
+                self._conn.executemany(
+                    "INSERT INTO players (path, player_id, llm_id, role) VALUES (?, ?, ?, ?)",
+                    [(row["path"],) + player for row, players in indexed for player in players]
+                )
+                self._conn.executemany("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?", stamped)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return {
+            "indexed": len(indexed) - invalid,
+            "invalid": invalid,
+            "restamped": len(stamped),
+            "unchanged": len(seen) - len(indexed) - len(stamped),
+            "removed": len(removed),
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+
+    def query(self, model: Optional[List[str]] = None, mode: Optional[str] = None, language: Optional[str] = None,
+              category: Optional[str] = None, winner: Optional[str] = None, concept: Optional[str] = None,
+              game_id: Optional[str] = None, after: Optional[str] = None, before: Optional[str] = None,
+              columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Indexed games matching every given filter, in timestamp order (then path order)
+
+        Parameters:
+            model: llm_ids that must all have played in the game
+            mode: "standard" or "audience"
+            language: Prompt language, e.g. "en"
+            category: Topic category
+            winner: Winning role, "civilian" or "undercover"
+            concept: Word that is either concept of the pair
+            game_id: Exact game_id
+            after: Games with timestamp >= after (ISO format, e.g. "2025-05-10")
+            before: Games with timestamp < before
+            columns: Columns of the files table to return (None = all); "path" is always returned,
+                     as an absolute path
+
+        Returns:
+            List[Dict]: One dict per matching file
+        """
+        conditions, parameters = ["status = 'ok'"], []
+        for column, value in (("mode", mode), ("language", language), ("category", category),
+                              ("winner_role", winner), ("game_id", game_id)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if concept is not None:
+            conditions.append("(concept_a = ? OR concept_b = ?)")
+            parameters.extend([concept, concept])
+        if after is not None:
+            conditions.append("timestamp >= ?")
+            parameters.append(after)
+        if before is not None:
+            conditions.append("timestamp < ?")
+            parameters.append(before)
+        for llm_id in model or []:
+            conditions.append("EXISTS (SELECT 1 FROM players p WHERE p.path = files.path AND p.llm_id = ?)")
+            parameters.append(llm_id)
+
+        selected = (["path"] + [column for column in columns if column != "path"]) if columns else ["*"]
+        sql = (f"SELECT {', '.join(selected)} FROM files WHERE {' AND '.join(conditions)} "
+               f"ORDER BY timestamp, path")
+        with self._lock:
+            cursor = self._conn.execute(sql, parameters)
+            names = [description[0] for description in cursor.description]
+            rows = [dict(zip(names, values)) for values in cursor.fetchall()]
+        for row in rows:
+            row["path"] = os.path.normpath(os.path.join(self.base_dir, row["path"]))
+        return rows
+
+    def paths(self, **filters) -> List[str]:
+        """Absolute paths of the log files matching the filters of query()"""
+        return [row["path"] for row in self.query(columns=["path"], **filters)]
+
+    def models(self, path: str) -> List[Tuple[int, str, str]]:
+        """(player_id, llm_id, role) of the players of an indexed file"""
+        with self._lock:
+            return self._conn.execute("SELECT player_id, llm_id, role FROM players WHERE path = ? "
+                                      "ORDER BY player_id", (self._relative(path),)).fetchall()
+
+    def statistics(self) -> Dict[str, Any]:
+        """Indexed files per status, mode and language"""
+        with self._lock:
+            return {
+                "files": self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+                "by_status": dict(self._conn.execute("SELECT status, COUNT(*) FROM files GROUP BY status")),
+                "by_mode": dict(self._conn.execute(
+                    "SELECT mode, COUNT(*) FROM files WHERE status = 'ok' GROUP BY mode")),
+                "by_language": dict(self._conn.execute(
+                    "SELECT language, COUNT(*) FROM files WHERE status = 'ok' GROUP BY language")),
+                "models": self._conn.execute("SELECT COUNT(DISTINCT llm_id) FROM players").fetchone()[0]
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self.base_dir)
+
+    @staticmethod
+    def _describe(file_path: str, content: bytes) -> Tuple[Dict[str, Any], List[Tuple[int, str, str]]]:
+        """Catalog row and players of a log file"""
+        # Only indexing needs these, so queries also work when the module is imported as
+        # icml_exp.log_catalog (KG builder), where columnar_logs is not a top-level module
+        from columnar_logs import infer_game_mode, infer_language
+
+        row = {"status": "invalid", "game_id": None, "timestamp": None, "category": None, "language": None,
+               "mode": None, "concept_a": None, "concept_b": None, "winner_role": None, "statement_count": None}
+        try:
+            data = json.loads(content)
+        except ValueError:
+            return row, []
+        record = data.get("game_record") if isinstance(data, dict) else None
+        if not isinstance(record, dict):
+            return row, []
+
+        concepts = record.get("concept_pair") or {}
+        process = record.get("game_process") or {}
+        row.update(
+            status="ok",
+            game_id=record.get("game_id"),
+            timestamp=record.get("timestamp"),
+            category=record.get("topic_category"),
+            language=infer_language(file_path),
+            mode=infer_game_mode(record),
+            concept_a=concepts.get("concept_a"),
+            concept_b=concepts.get("concept_b"),
+            winner_role=(record.get("game_summary") or {}).get("winner_role"),
+            statement_count=len(process.get("statements", []))
+        )
+        players = [(p.get("player_id"), p.get("llm_id"), p.get("role")) for p in record.get("players", [])]
+        return row, players
+
+
+def is_catalog_query(spec: str) -> bool:
+    """
+    Whether a data path is a catalog query: a catalog file, optionally followed by a query string
+
+    e.g. "logs/catalog.sqlite?model=gpt-4o&mode=audience&after=2025-05-10"
+    """
+    base = spec.split("?", 1)[0]
+    return base.endswith(CATALOG_SUFFIXES) and os.path.isfile(base)
+
+
+def parse_catalog_query(spec: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Catalog path and query() filters of a catalog query
+
+    Keys are those of LogCatalog.query(); "model" may be repeated (model=a&model=b).
+    """
+    base, _, query = spec.partition("?")
+    filters = {}
+    for key, values in parse_qs(query, strict_parsing=bool(query)).items():
+        if key not in QUERY_KEYS:
+            raise ValueError(f"Unknown catalog query key {key!r}; expected one of {', '.join(QUERY_KEYS)}")
+        if QUERY_KEYS[key]:
+            filters[key] = values
+        elif len(values) > 1:
+            raise ValueError(f"Catalog query key {key!r} can only be given once")
+        else:
+            filters[key] = values[0]
+    return base, filters
+
+
+def catalog_query_paths(spec: str) -> List[str]:
+    """Paths of the log files selected by a catalog query, in timestamp order"""
+    path, filters = parse_catalog_query(spec)
+    catalog = LogCatalog(path)
+    try:
+        return catalog.paths(**filters)
+    finally:
+        catalog.close()
+
+
+def catalog_game_records(spec: str) -> List[Dict[str, Any]]:
+    """Game records of the log files selected by a catalog query, in timestamp order"""
+    records = []
+    for path in catalog_query_paths(spec):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Failed to read file {path}: {e}")
+            continue
+        if "game_record" in data:
+            records.append(data["game_record"])
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite catalog of the game logs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    update_parser = subparsers.add_parser("update", help="Index new and modified log files")
+    update_parser.add_argument("log_dir", help="Log tree to index")
+    update_parser.add_argument("--catalog", default="logs/catalog.sqlite", help="Catalog file")
+
+    query_parser = subparsers.add_parser("query", help="List the log files matching filters")
+    query_parser.add_argument("--catalog", default="logs/catalog.sqlite", help="Catalog file")
+    query_parser.add_argument("--model", nargs="+", help="Models that must all have played")
+    query_parser.add_argument("--mode", choices=["standard", "audience"])
+    query_parser.add_argument("--language")
+    query_parser.add_argument("--category")
+    query_parser.add_argument("--winner", choices=["civilian", "undercover"])
+    query_parser.add_argument("--concept", help="Either word of the concept pair")
+    query_parser.add_argument("--after", help="Timestamp lower bound, inclusive (e.g. 2025-05-10)")
+    query_parser.add_argument("--before", help="Timestamp upper bound, exclusive")
+    query_parser.add_argument("--count", action="store_true", help="Print only the number of matches")
+    args = parser.parse_args()
+
+    catalog = LogCatalog(args.catalog)
+    try:
+        if args.command == "update":
+            summary = catalog.update(args.log_dir)
+            print(json.dumps(summary))
+            print(json.dumps(catalog.statistics(), ensure_ascii=False))
+        else:
+            rows = catalog.query(model=args.model, mode=args.mode, language=args.language, category=args.category,
+                                 winner=args.winner, concept=args.concept, after=args.after, before=args.before,
+                                 columns=["game_id", "timestamp", "mode", "language", "category"])
+            if args.count:
+                print(len(rows))
+            else:
+                for row in rows:
+                    print(f"{row['timestamp']}  {row['mode']:<9} {row['language'] or '-':<3} "
+                          f"{row['category'] or '-':<24} {row['path']}")
+    finally:
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main()
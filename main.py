@@ -8,6 +8,7 @@ from undercover.agents.judge_agent import LLMJudge
 from undercover_audience.agents.audience_agent import LLMAudience
 from undercover_audience.agents.player_agent import LLMPlayerAU
 from undercover_audience.agents.judge_agent import LLMJudgeAU
+from undercover.agents.cassette import use_cassette
 
 def run_game(players, judges, game_settings, game_mode="standard", audience_llm=None):
     """
@@ -47,7 +48,9 @@ def run_game(players, judges, game_settings, game_mode="standard", audience_llm=
         "civilian_count": game_settings["civilian_count"],
         "undercover_count": game_settings["undercover_count"],
         "max_statement_rounds": game_settings["max_statement_rounds"],
-        "statements_per_voting": game_settings["statements_per_voting"]
+        "statements_per_voting": game_settings["statements_per_voting"],
+        "judge_timeout": game_settings.get("judge_timeout"),
+        "seed": game_settings.get("seed")
     }
     
     if game_mode == "audience":
@@ -63,8 +66,14 @@ def run_game(players, judges, game_settings, game_mode="standard", audience_llm=
         # Standard game mode
         game = UndercoverGame(**game_params)
     
-    # Run game
-    game.run_game()
+    # Run game (optionally recording or replaying its LLM calls through a cassette)
+    if game_settings.get("cassette_path"):
+        with use_cassette(game_settings["cassette_path"],
+                          mode=game_settings.get("cassette_mode", "replay"),
+                          latency=game_settings.get("cassette_latency")):
+            game.run_game()
+    else:
+        game.run_game()
     
     # Save game record
     timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -187,6 +196,10 @@ if __name__ == "__main__":
             - max_statement_rounds: Maximum number of statement rounds allowed
             - statements_per_voting: Number of statement rounds before each voting
             - language: Game language (en, zh, fr, ru, es, jp, ar, de, it, pt)
+            - seed (optional): Seed for roles, speaking order and vote tie-breaks
+            - cassette_path / cassette_mode / cassette_latency (optional): Record ("record") or
+              replay ("replay") every LLM call of the game; replay latency is None, a fixed
+              number of seconds, "recorded" or "sampled"
             
             Game Mode Options:
             - "standard": Players vote to eliminate each other
@@ -1,20 +1,50 @@
+import asyncio
+import contextlib
 import json
 import os
+import sys
 import datetime
 import time
 import traceback
 import threading
 import concurrent.futures
+import functools
+import multiprocessing
+import argparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any, Optional
 # from undercover.game import UndercoverGame
 from undercover.game import UndercoverGame
 from undercover_audience.game import UndercoverAudienceGame
+from undercover.async_game import AsyncUndercoverGame
+from undercover_audience.async_game import AsyncUndercoverAudienceGame
 from undercover.agents.player_agent import LLMPlayer
 from undercover.agents.judge_agent import LLMJudge
 from undercover_audience.agents.audience_agent import LLMAudience
 from undercover_audience.agents.player_agent import LLMPlayerAU
 from undercover_audience.agents.judge_agent import LLMJudgeAU
+from undercover.agents.utils import configure_response_cache, configure_rate_limits, configure_prompt_cache
+from undercover.agents.usage import UsageLog, use_usage_log
+from undercover.agents.cassette import use_cassette
+from undercover.agents.response_cache import use_cache_occurrences
+from undercover.agents.retry import use_retry_budget
+from undercover.agents.llm_client import configure_async_concurrency
+from undercover.compat import to_thread
+from batch_manifest import BatchManifest
+from columnar_logs import ColumnarLogSink
+from batch_schedule import DurationHistory, longest_first
+
+
+def _flushes_log_sink(runner_method):
+    """Write the games buffered for the columnar log when a runner returns or fails"""
+    @functools.wraps(runner_method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return runner_method(self, *args, **kwargs)
+        finally:
+            if self.log_sink is not None:
+                self.log_sink.flush()
+    return wrapper
 
 
 class BatchGameRunner:
@@ -25,6 +55,131 @@ class BatchGameRunner:
         self.failed_games = []
         self.start_time = None
         self.results_lock = threading.Lock()
+        self.rate_limiter = None
+        self.usage = UsageLog()
+        self.manifest = None
+        self.manifest_hash = None
+        self.skipped_games = 0
+        self.log_sink = None
+        self.usage_calls = False
+
+    def configure_call_layer(self, batch_config: Dict[str, Any]):
+        """
+        Apply the call-layer and logging options of a batch configuration
+
+        Supported keys in batch_config:
+            - response_cache: dict of configure_response_cache arguments
+              (path, ttl, max_entries, replay_only), or None to disable caching
+            - rate_limits: dict of configure_rate_limits arguments
+              (limits, default, base_backoff, max_backoff), or None to disable
+            - prompt_cache: How the static system prompts are tagged for provider-side prompt
+              caching: None, "cache_control" or "prompt_cache_key" (see configure_prompt_cache)
+            - columnar_log_path: Columnar log store (see columnar_logs.py) each finished game is
+              also appended to, besides its JSON log, or None; needs pyarrow
+            - usage_calls: Also list every API call (tokens and latency) in the "llm_usage" of
+              each game record, not only the totals per model (default False)
+        """
+        cache_config = batch_config.get("response_cache")
+        if cache_config:
+            cache = configure_response_cache(**cache_config)
+            print(f"Response cache enabled: {cache.path} ({len(cache)} cached responses)")
+
+        rate_config = batch_config.get("rate_limits")
+        self.rate_limiter = configure_rate_limits(**rate_config) if rate_config else None
+        if self.rate_limiter is not None:
+            print(f"Rate limits enabled for {len(self.rate_limiter.limits)} models")
+
+        configure_prompt_cache(batch_config.get("prompt_cache"))
+        self.usage_calls = batch_config.get("usage_calls", False)
+
+        columnar_log_path = batch_config.get("columnar_log_path")
+        if columnar_log_path and (self.log_sink is None or self.log_sink.root != columnar_log_path):
+            self.log_sink = ColumnarLogSink(columnar_log_path)
+            print(f"Columnar game log enabled: {columnar_log_path}")
+
+        # Token usage of the API calls of this batch, reported in its summary
+        self.usage = UsageLog()
+
+    def open_manifest(self, players, judges, base_game_settings, word_pairs, batch_config):
+        """
+        Open the batch manifest, if the batch configuration names one, and register its games
+
+        Supported keys in batch_config:
+            - manifest_path: SQLite file recording which games are pending, running, done or failed;
+              a restarted batch skips finished games and runners sharing the file split the work
+            - manifest_lease: Seconds after which a running game is considered abandoned (default 6 hours)
+        """
+        if not batch_config.get("manifest_path"):
+            self.manifest = None
+            return
+
+        self.manifest = BatchManifest(batch_config["manifest_path"],
+                                      lease_seconds=batch_config.get("manifest_lease", 6 * 3600))
+        self.manifest_hash = BatchManifest.config_hash(players, judges, base_game_settings, batch_config)
+        new_games = self.manifest.register(word_pairs, batch_config.get("rounds_per_pair", 1), self.manifest_hash)
+        counts = self.manifest.counts(self.manifest_hash)
+        print(f"Batch manifest {self.manifest.path}: {new_games} new games, {counts['done']} done, "
+              f"{counts['running']} running, {counts['failed']} failed, {counts['pending']} pending")
+
+    def _claim_game(self, word_pair, round_idx) -> bool:
+        """Take a game from the manifest; False if it is done or being played by another runner"""
+        if self.manifest is None:
+            return True
+        if self.manifest.claim(word_pair, round_idx, self.manifest_hash):
+            return True
+        with self.results_lock:
+            self.skipped_games += 1
+        return False
+
+    def _finish_game(self, word_pair, round_idx, game_record=None, error=None):
+        """Record the outcome of a claimed game in the manifest"""
+        if self.manifest is None:
+            return
+        if game_record is not None:
+            self.manifest.complete(word_pair, round_idx, self.manifest_hash,
+                                   game_id=game_record["game_record"]["game_id"])
+        else:
+            self.manifest.fail(word_pair, round_idx, self.manifest_hash, error)
+
+    def _prepare_game_settings(self, players, judges, base_game_settings, word_pair, round_idx, game_number,
+                               batch_config):
+        """
+        Build the settings of one game of a batch
+
+        Cassette and checkpoint file names include the batch's config hash, so a batch with
+        other players, judges or settings never replays or resumes another batch's games.
+
+        Optional keys in batch_config:
+            - retry_budget: Retries one game may spend across all of its LLM calls (default unlimited)
+            - seed: Base seed; game N is seeded with seed + N so record and replay runs match
+            - cassette_dir: Directory with one cassette per game
+            - cassette_mode: "record" or "replay"
+            - cassette_latency: Replay latency (None, seconds, "recorded" or "sampled")
+            - checkpoint_dir: Directory with one checkpoint per game in progress; a game whose
+              checkpoint exists (e.g. after a crash) is resumed instead of replayed
+        """
+        game_settings = base_game_settings.copy()
+        game_settings["pair"] = [word_pair[0], word_pair[1]]
+
+        if batch_config.get("retry_budget") is not None:
+            game_settings["retry_budget"] = batch_config["retry_budget"]
+
+        if batch_config.get("seed") is not None:
+            game_settings["seed"] = batch_config["seed"] + game_number
+
+        if batch_config.get("cassette_dir") or batch_config.get("checkpoint_dir"):
+            config_hash = BatchManifest.config_hash(players, judges, base_game_settings, batch_config)
+            file_stem = f"{word_pair[0]}_{word_pair[1]}_{round_idx}_{config_hash}"
+
+        if batch_config.get("cassette_dir"):
+            game_settings["cassette_path"] = os.path.join(batch_config["cassette_dir"], f"{file_stem}.json.gz")
+            game_settings["cassette_mode"] = batch_config.get("cassette_mode", "replay")
+            game_settings["cassette_latency"] = batch_config.get("cassette_latency")
+
+        if batch_config.get("checkpoint_dir"):
+            game_settings["checkpoint_path"] = os.path.join(batch_config["checkpoint_dir"], f"{file_stem}.json")
+
+        return game_settings
 
     def run_single_game(self, players, judges, game_settings, game_mode="standard", audience_llm=None):
         """
@@ -37,6 +192,57 @@ class BatchGameRunner:
             game_mode: "standard" for player voting, "audience" for audience decision
             audience_llm: LLM configuration for audience mode [model, provider]
         """
+        game = self._build_game(players, judges, game_settings, game_mode, audience_llm)
+
+        # Run game (optionally recording or replaying its LLM calls through a cassette)
+        with use_retry_budget(game_settings.get("retry_budget")), self._game_cassette(game_settings), \
+                use_cache_occurrences(), use_usage_log() as usage:
+            game.run_game()
+        self._record_usage(game, usage)
+
+        # Save game record
+        self._save_game_record(game, game_settings, game_mode, threading.current_thread().ident)
+
+        return game.get_game_record()
+
+    async def run_single_game_async(self, players, judges, game_settings, game_mode="standard",
+                                    audience_llm=None, game_tag=None):
+        """
+        Async version of run_single_game, running an AsyncUndercoverGame / AsyncUndercoverAudienceGame
+
+        Parameters:
+            game_tag: Suffix of the log file name (the thread id in run_single_game)
+        """
+        game = self._build_game(players, judges, game_settings, game_mode, audience_llm, use_async=True)
+
+        # Each task runs in its own context, so every game gets its own cassette, retry budget
+        # and response cache occurrence counters
+        with use_retry_budget(game_settings.get("retry_budget")), self._game_cassette(game_settings), \
+                use_cache_occurrences(), use_usage_log() as usage:
+            await game.run_game()
+        self._record_usage(game, usage)
+
+        # Save game record
+        self._save_game_record(game, game_settings, game_mode, game_tag)
+
+        return game.get_game_record()
+
+    def _record_usage(self, game, usage: UsageLog):
+        """Store the token usage of a game's API calls in its record and in the batch totals"""
+        game.game_record["llm_usage"] = usage.to_record(include_calls=self.usage_calls)
+        self.usage.merge(usage)
+
+    def _game_cassette(self, game_settings):
+        """Cassette context of a game, or a no-op context when it does not use one"""
+        if not game_settings.get("cassette_path"):
+            return contextlib.nullcontext()
+        return use_cassette(game_settings["cassette_path"],
+                            mode=game_settings.get("cassette_mode", "replay"),
+                            latency=game_settings.get("cassette_latency"))
+
+    def _build_game(self, players, judges, game_settings, game_mode="standard", audience_llm=None,
+                    use_async=False):
+        """Create the judges, players (and audience) of a game and the game itself"""
         judge_list = []
         player_list = []
 
@@ -64,125 +270,82 @@ class BatchGameRunner:
             "civilian_count": game_settings["civilian_count"],
             "undercover_count": game_settings["undercover_count"],
             "max_statement_rounds": game_settings["max_statement_rounds"],
-            "statements_per_voting": game_settings["statements_per_voting"]
+            "statements_per_voting": game_settings["statements_per_voting"],
+            "judge_timeout": game_settings.get("judge_timeout"),
+            "seed": game_settings.get("seed"),
+            "checkpoint_path": game_settings.get("checkpoint_path"),
+            "pipeline_statements": game_settings.get("pipeline_statements", False),
+            "prompt_budget": game_settings.get("prompt_budget"),
+            "judge_mode": game_settings.get("judge_mode", "statement")
         }
+        if game_mode != "audience":
+            # Only standard games have player votes
+            game_params["vote_workers"] = game_settings.get("vote_workers")
 
         if game_mode == "audience":
 
             if audience_llm is None:
                 audience_llm = ["claude-3-7-sonnet-20250219", ""]
             audience = LLMAudience("audience-1", audience_llm[0], game_settings["language"])
-            game = UndercoverAudienceGame(
+            GameClass = AsyncUndercoverAudienceGame if use_async else UndercoverAudienceGame
+            game = GameClass(
                 **game_params,
                 audience=audience
             )
         else:
+            GameClass = AsyncUndercoverGame if use_async else UndercoverGame
+            game = GameClass(**game_params)
 
-            game = UndercoverGame(**game_params)
-
-        # Run game
-        game.run_game()
-
-        # Save game record
+        # Resume a game that was interrupted part-way through
+        if game_settings.get("checkpoint_path"):
+            snapshot = GameClass.load_checkpoint(game_settings["checkpoint_path"])
+            if snapshot is not None:
+                try:
+                    game.restore(snapshot)
+                except ValueError as e:
+                    # Left by a game with another line-up; the new game overwrites it
+                    print(f"    Discarding checkpoint {game_settings['checkpoint_path']}: {e}")
+                else:
+                    print(f"    Resuming {game_settings['pair'][0]} vs {game_settings['pair'][1]} "
+                          f"from statement round {game.current_statement_round} ({len(game.statements)} statements)")
+
+        return game
+
+    def _save_game_record(self, game, game_settings, game_mode, game_tag):
+        """Save a finished game under logs/<log_folder_path>_<mode>/<language>/<topic>/"""
         timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
-        thread_id = threading.current_thread().ident
         logs_dir = os.path.join(os.path.dirname(__file__), "logs")
         if not os.path.exists(logs_dir):
-            os.makedirs(logs_dir)
+            os.makedirs(logs_dir, exist_ok=True)
 
 
         tag_dir = os.path.join(logs_dir, f"{game_settings['log_folder_path']}_{game_mode}")
         if not os.path.exists(tag_dir):
-            os.makedirs(tag_dir)
+            os.makedirs(tag_dir, exist_ok=True)
 
         language_dir = os.path.join(tag_dir, game_settings["language"])
         if not os.path.exists(language_dir):
-            os.makedirs(language_dir)
+            os.makedirs(language_dir, exist_ok=True)
 
         topic_dir = os.path.join(language_dir, game_settings["topic_category"])
         if not os.path.exists(topic_dir):
-            os.makedirs(topic_dir)
+            os.makedirs(topic_dir, exist_ok=True)
 
 
-        filename = f"{game_settings['pair'][0]}_{game_settings['pair'][1]}_{timestamp}_{thread_id}.json"
+        filename = f"{game_settings['pair'][0]}_{game_settings['pair'][1]}_{timestamp}_{game_tag}.json"
         file_path = os.path.join(topic_dir, filename)
 
         # Save game record
         game.save_game_record(file_path)
+        if self.log_sink is not None:
+            self.log_sink.append(game.get_game_record()["game_record"], source_path=file_path,
+                                 language=game_settings["language"], game_mode=game_mode)
 
-        return game.get_game_record()
-
-    def run_single_word_pair(self, word_pair, pair_idx, players, judges, base_game_settings, batch_config):
-        """Run all rounds for a single word pair"""
-        rounds_per_pair = batch_config.get("rounds_per_pair", 1)
-        game_mode = batch_config.get("game_mode", "standard")
-        audience_llm = batch_config.get("audience_llm", None)
-        max_retries = batch_config.get("max_retries", 2)
-
-        pair_results = []
-        pair_failures = []
-        thread_name = threading.current_thread().name
-
-        print(f"\n[Thread-{thread_name}] Started processing word pair {pair_idx + 1}: {word_pair[0]} vs {word_pair[1]}")
-
-        for round_idx in range(rounds_per_pair):
-            game_number = pair_idx * rounds_per_pair + round_idx + 1
-
-            # Prepare game settings
-            game_settings = base_game_settings.copy()
-            game_settings["pair"] = [word_pair[0], word_pair[1]]
-
-            # Try to run the game
-            success = False
-            for retry in range(max_retries + 1):
-                try:
-                    if retry > 0:
-                        print(
-                            f"    [Thread-{thread_name}] Word pair {pair_idx + 1} round {round_idx + 1} retry attempt {retry}...")
-                        time.sleep(2)
-
-                    game_record = self.run_single_game(
-                        players, judges, game_settings,
-                        game_mode=game_mode, audience_llm=audience_llm
-                    )
-                    success = True
-                    result_info = {
-                        "game_number": game_number,
-                        "pair_index": pair_idx,
-                        "round_index": round_idx,
-                        "word_pair": word_pair,
-                        "game_record": game_record,
-                        "thread_name": thread_name,
-                        "timestamp": datetime.datetime.now().isoformat()
-                    }
-                    pair_results.append(result_info)
-
-                    print(f"    [Thread-{thread_name}] ✓ Word pair {pair_idx + 1} round {round_idx + 1} completed")
-
-                    break
-
-                except Exception as e:
-                    error_info = {
-                        "game_number": game_number,
-                        "pair_index": pair_idx,
-                        "round_index": round_idx,
-                        "word_pair": word_pair,
-                        "error": str(e),
-                        "traceback": traceback.format_exc(),
-                        "retry_attempt": retry,
-                        "thread_name": thread_name,
-                        "timestamp": datetime.datetime.now().isoformat()
-                    }
-
-                    if retry == max_retries:
-                        pair_failures.append(error_info)
-                        print(
-                            f"    [Thread-{thread_name}] ✗ Word pair {pair_idx + 1} round {round_idx + 1} final failure: {str(e)}")
-
-        print(
-            f"[Thread-{thread_name}] Word pair {pair_idx + 1} all rounds completed, {len(pair_results)} successful, {len(pair_failures)} failed")
-        return pair_results, pair_failures
+        # The game is complete, so its checkpoint is no longer needed
+        if game_settings.get("checkpoint_path") and os.path.exists(game_settings["checkpoint_path"]):
+            os.remove(game_settings["checkpoint_path"])
 
+    @_flushes_log_sink
     def run_batch_games_parallel(self,
                                  players: List,
                                  judges: List,
@@ -192,72 +355,396 @@ class BatchGameRunner:
         """
         Run batch games in parallel
 
+        Games (not word pairs) are the unit of work: all of them go to one thread pool, so a
+        worker starts the next game as soon as it is free and the rounds of one word pair run
+        side by side. Games are started longest predicted duration first.
+
         New parameters in batch_config:
             - max_workers: Maximum concurrent threads (default 3)
-            - chunk_size: Number of word pairs per batch (default all)
+            - duration_history: JSON file with the durations of past games per word pair, used to
+              predict game durations and updated by this run (default None = batch order)
+            - chunk_size: No longer used; games are scheduled without chunk barriers
         """
         self.start_time = time.time()
+        self.configure_call_layer(batch_config)
+        self.open_manifest(players, judges, base_game_settings, word_pairs, batch_config)
 
         max_workers = batch_config.get("max_workers", 3)  # Default 3 concurrent threads
-        chunk_size = batch_config.get("chunk_size", len(word_pairs))  # Batch size
         rounds_per_pair = batch_config.get("rounds_per_pair", 1)
+        history = DurationHistory(batch_config.get("duration_history"))
 
         total_games = len(word_pairs) * rounds_per_pair
         completed_games = 0
+        finished_games = 0
+
+        games = longest_first(word_pairs, rounds_per_pair, history)
+        print(f"\n📋 Scheduling {total_games} games on {max_workers} workers "
+              f"(predicted work {sum(history.predict(game[2]) for game in games) / 60:.1f} min)")
+
+        # The pool's queue is FIFO, so submitting in this order starts the longest games first
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="GameWorker") as executor:
+            future_to_game = {
+                executor.submit(
+                    self._run_scheduled_game,
+                    word_pair,
+                    pair_idx,
+                    round_idx,
+                    players,
+                    judges,
+                    base_game_settings,
+                    batch_config,
+                    history
+                ): (pair_idx, round_idx, word_pair)
+                for pair_idx, round_idx, word_pair in games
+            }
+
+            for future in as_completed(future_to_game):
+                pair_idx, round_idx, word_pair = future_to_game[future]
+                finished_games += 1
+                try:
+                    result_info, error_info = future.result()
 
-        # Process word pairs in chunks
-        for chunk_start in range(0, len(word_pairs), chunk_size):
-            chunk_end = min(chunk_start + chunk_size, len(word_pairs))
-            chunk_pairs = word_pairs[chunk_start:chunk_end]
-
-            print(f"\n📋 Processing word pair batch: {chunk_start + 1}-{chunk_end} ({len(chunk_pairs)} pairs)")
-
-
-            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="GameWorker") as executor:
-                future_to_pair = {
-                    executor.submit(
-                        self.run_single_word_pair,
-                        word_pair,
-                        chunk_start + i,
-                        players,
-                        judges,
-                        base_game_settings,
-                        batch_config
-                    ): (chunk_start + i, word_pair)
-                    for i, word_pair in enumerate(chunk_pairs)
-                }
+                    with self.results_lock:
+                        if result_info is not None:
+                            self.game_results.append(result_info)
+                            completed_games += 1
+                        elif error_info is not None:
+                            self.failed_games.append(error_info)
 
+                    print(f"Word pair {pair_idx + 1} ({word_pair[0]} vs {word_pair[1]}) round {round_idx + 1} "
+                          f"processing completed ({finished_games}/{total_games})")
 
-                chunk_completed = 0
-                for future in as_completed(future_to_pair):
-                    pair_idx, word_pair = future_to_pair[future]
-                    try:
-                        pair_results, pair_failures = future.result()
+                except Exception as e:
+                    print(f"Word pair {pair_idx + 1} round {round_idx + 1} processing error: {str(e)}")
+                    with self.results_lock:
+                        error_info = {
+                            "pair_index": pair_idx,
+                            "round_index": round_idx,
+                            "word_pair": word_pair,
+                            "error": f"Thread execution failed: {str(e)}",
+                            "timestamp": datetime.datetime.now().isoformat()
+                        }
+                        self.failed_games.append(error_info)
 
-                        with self.results_lock:
-                            self.game_results.extend(pair_results)
-                            self.failed_games.extend(pair_failures)
-                            completed_games += len(pair_results)
+        history.save()
+        return self._generate_batch_summary(completed_games, total_games)
 
-                        chunk_completed += 1
-                        print(
-                            f"Word pair {pair_idx + 1} ({word_pair[0]} vs {word_pair[1]}) processing completed ({chunk_completed}/{len(chunk_pairs)})")
+    def _run_scheduled_game(self, word_pair, pair_idx, round_idx, players, judges, base_game_settings,
+                            batch_config, history):
+        """
+        Claim, play and time one game of run_batch_games_parallel
 
-                    except Exception as e:
-                        print(f"Word pair {pair_idx + 1} processing error: {str(e)}")
-                        with self.results_lock:
-                            error_info = {
-                                "pair_index": pair_idx,
-                                "word_pair": word_pair,
-                                "error": f"Thread execution failed: {str(e)}",
-                                "timestamp": datetime.datetime.now().isoformat()
-                            }
-                            self.failed_games.append(error_info)
+        Returns:
+            Tuple: (result_info, None) on success, (None, error_info) after the final failure,
+                   (None, None) when the manifest says the game is done or running elsewhere
+        """
+        if not self._claim_game(word_pair, round_idx):
+            print(f"    Word pair {pair_idx + 1} round {round_idx + 1} already done or running elsewhere, skipped")
+            return None, None
+
+        start = time.time()
+        result_info, error_info = self._run_game_with_retries(word_pair, pair_idx, round_idx, players, judges,
+                                                              base_game_settings, batch_config)
+        if result_info is not None:
+            history.record(word_pair, time.time() - start)
+            self._finish_game(word_pair, round_idx, game_record=result_info["game_record"])
+        else:
+            self._finish_game(word_pair, round_idx, error=error_info["error"])
+        return result_info, error_info
+
+    @_flushes_log_sink
+    def run_batch_games_async(self,
+                              players: List,
+                              judges: List,
+                              base_game_settings: Dict[str, Any],
+                              word_pairs: List,
+                              batch_config: Dict[str, Any]):
+        """
+        Run batch games concurrently on one asyncio event loop
+
+        Every game is a coroutine, so a single process can keep hundreds of games in flight
+        without one OS thread per game. Game records are identical to the threaded runners.
+        As in run_batch_games_parallel, games are started longest predicted duration first.
+
+        New parameters in batch_config:
+            - max_concurrent_games: Maximum games in progress at once (default 100)
+            - max_concurrent_requests: Maximum LLM requests in flight across all games (default unlimited)
+            - duration_history: As in run_batch_games_parallel
+        """
+        return asyncio.run(self._run_batch_games_async(players, judges, base_game_settings,
+                                                       word_pairs, batch_config))
 
-            print(f"Batch {chunk_start + 1}-{chunk_end} processing completed")
+    async def _run_batch_games_async(self, players, judges, base_game_settings, word_pairs, batch_config):
+        self.start_time = time.time()
+        self.configure_call_layer(batch_config)
+        self.open_manifest(players, judges, base_game_settings, word_pairs, batch_config)
+        configure_async_concurrency(batch_config.get("max_concurrent_requests"))
+
+        rounds_per_pair = batch_config.get("rounds_per_pair", 1)
+        game_semaphore = asyncio.Semaphore(batch_config.get("max_concurrent_games", 100))
+        history = DurationHistory(batch_config.get("duration_history"))
+
+        total_games = len(word_pairs) * rounds_per_pair
+
+        async def run_game_slot(word_pair, pair_idx, round_idx):
+            async with game_semaphore:
+                start = time.time()
+                result_info, error_info = await self._run_game_with_retries_async(
+                    word_pair, pair_idx, round_idx, players, judges, base_game_settings, batch_config
+                )
+                if result_info is not None:
+                    history.record(word_pair, time.time() - start)
+                return result_info, error_info
+
+        games = longest_first(word_pairs, rounds_per_pair, history)
+        print(f"\nRunning {total_games} games on one event loop "
+              f"(predicted work {sum(history.predict(game[2]) for game in games) / 60:.1f} min)")
+
+        # Tasks wait on the semaphore in creation order, so the longest games start first
+        outcomes = await asyncio.gather(*[
+            run_game_slot(word_pair, pair_idx, round_idx)
+            for pair_idx, round_idx, word_pair in games
+        ])
+        history.save()
+
+        completed_games = 0
+        for result_info, error_info in outcomes:
+            if result_info is not None:
+                self.game_results.append(result_info)
+                completed_games += 1
+            elif error_info is not None:
+                self.failed_games.append(error_info)
 
         return self._generate_batch_summary(completed_games, total_games)
 
+    async def _run_game_with_retries_async(self, word_pair, pair_idx, round_idx, players, judges,
+                                           base_game_settings, batch_config):
+        """
+        Run one game of an async batch with the batch retry policy
+
+        Returns:
+            Tuple: (result_info, None) on success, (None, error_info) after the final failure,
+                   (None, None) when the manifest says the game is done or running elsewhere
+        """
+        rounds_per_pair = batch_config.get("rounds_per_pair", 1)
+        game_mode = batch_config.get("game_mode", "standard")
+        audience_llm = batch_config.get("audience_llm", None)
+        max_retries = batch_config.get("max_retries", 2)
+
+        game_number = pair_idx * rounds_per_pair + round_idx + 1
+        game_settings = self._prepare_game_settings(players, judges, base_game_settings, word_pair,
+                                                    round_idx, game_number, batch_config)
+
+        if not await to_thread(self._claim_game, word_pair, round_idx):
+            print(f"    Word pair {pair_idx + 1} round {round_idx + 1} already done or running elsewhere, skipped")
+            return None, None
+
+        for retry in range(max_retries + 1):
+            try:
+                if retry > 0:
+                    print(f"    Game {game_number} retry attempt {retry}...")
+                    await asyncio.sleep(2)
+
+                game_record = await self.run_single_game_async(
+                    players, judges, game_settings,
+                    game_mode=game_mode, audience_llm=audience_llm, game_tag=f"a{game_number}"
+                )
+                await to_thread(self._finish_game, word_pair, round_idx, game_record=game_record)
+                print(f"    ✓ Word pair {pair_idx + 1} round {round_idx + 1} completed")
+                return {
+                    "game_number": game_number,
+                    "pair_index": pair_idx,
+                    "round_index": round_idx,
+                    "word_pair": word_pair,
+                    "game_record": game_record,
+                    "timestamp": datetime.datetime.now().isoformat()
+                }, None
+
+            except Exception as e:
+                error_info = {
+                    "game_number": game_number,
+                    "pair_index": pair_idx,
+                    "round_index": round_idx,
+                    "word_pair": word_pair,
+                    "error": str(e),
+                    "traceback": traceback.format_exc(),
+                    "retry_attempt": retry,
+                    "timestamp": datetime.datetime.now().isoformat()
+                }
+
+        await to_thread(self._finish_game, word_pair, round_idx, error=error_info["error"])
+        print(f"    ✗ Word pair {pair_idx + 1} round {round_idx + 1} final failure: {error_info['error']}")
+        return None, error_info
+
+    def _run_game_with_retries(self, word_pair, pair_idx, round_idx, players, judges,
+                               base_game_settings, batch_config):
+        """
+        Run one game with the batch retry policy
+
+        Returns:
+            Tuple: (result_info, None) on success, (None, error_info) after the final failure
+        """
+        rounds_per_pair = batch_config.get("rounds_per_pair", 1)
+        game_mode = batch_config.get("game_mode", "standard")
+        audience_llm = batch_config.get("audience_llm", None)
+        max_retries = batch_config.get("max_retries", 2)
+        thread_name = threading.current_thread().name
+
+        game_number = pair_idx * rounds_per_pair + round_idx + 1
+        game_settings = self._prepare_game_settings(players, judges, base_game_settings, word_pair,
+                                                    round_idx, game_number, batch_config)
+
+        for retry in range(max_retries + 1):
+            try:
+                if retry > 0:
+                    print(f"    [Thread-{thread_name}] Game {game_number} retry attempt {retry}...")
+                    time.sleep(2)
+
+                game_record = self.run_single_game(
+                    players, judges, game_settings,
+                    game_mode=game_mode, audience_llm=audience_llm
+                )
+                print(f"    [Thread-{thread_name}] ✓ Word pair {pair_idx + 1} round {round_idx + 1} completed")
+                return {
+                    "game_number": game_number,
+                    "pair_index": pair_idx,
+                    "round_index": round_idx,
+                    "word_pair": word_pair,
+                    "game_record": game_record,
+                    "thread_name": thread_name,
+                    "timestamp": datetime.datetime.now().isoformat()
+                }, None
+
+            except Exception as e:
+                error_info = {
+                    "game_number": game_number,
+                    "pair_index": pair_idx,
+                    "round_index": round_idx,
+                    "word_pair": word_pair,
+                    "error": str(e),
+                    "traceback": traceback.format_exc(),
+                    "retry_attempt": retry,
+                    "thread_name": thread_name,
+                    "timestamp": datetime.datetime.now().isoformat()
+                }
+
+        print(f"    [Thread-{thread_name}] ✗ Word pair {pair_idx + 1} round {round_idx + 1} "
+              f"final failure: {error_info['error']}")
+        return None, error_info
+
+    def enqueue_batch(self,
+                      players: List,
+                      judges: List,
+                      base_game_settings: Dict[str, Any],
+                      word_pairs: List,
+                      batch_config: Dict[str, Any]) -> str:
+        """
+        Coordinator side of a distributed batch: put every game of the batch on the manifest queue
+
+        The games are played by run_worker() processes, on this host or on any host that can
+        open the manifest and write to the log tree. Games that are already done stay done.
+
+        Returns:
+            str: Config hash identifying the batch in the manifest
+        """
+        if not batch_config.get("manifest_path"):
+            raise ValueError("A distributed batch needs batch_config['manifest_path']")
+
+        self.open_manifest(players, judges, base_game_settings, word_pairs, batch_config)
+        self.manifest.add_batch(self.manifest_hash, {
+            "players": players,
+            "judges": judges,
+            "base_game_settings": base_game_settings,
+            "batch_config": batch_config
+        })
+        return self.manifest_hash
+
+    def wait_for_batch(self, config_hash: str, max_attempts: int = 3, poll_interval: float = 30) -> Dict[str, int]:
+        """
+        Block until the workers have finished (or given up on) every game of an enqueued batch
+
+        Returns:
+            Dict: Number of games in each state
+        """
+        while True:
+            counts = self.manifest.counts(config_hash)
+            print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] {counts['done']} done, "
+                  f"{counts['running']} running, {counts['failed']} failed, {counts['pending']} pending")
+            if self.manifest.outstanding(config_hash, max_attempts) == 0:
+                return counts
+            time.sleep(poll_interval)
+
+    @_flushes_log_sink
+    def run_worker(self, manifest_path: str, max_workers: int = 1, config_hash: Optional[str] = None,
+                   max_attempts: int = 3, poll_interval: Optional[float] = None):
+        """
+        Worker side of a distributed batch: play games taken from the manifest queue
+
+        Game records are written to the log tree as each game finishes, exactly as in the
+        other runners. The call layer (cache, rate limits) is configured from the first
+        batch the worker plays.
+
+        Parameters:
+            manifest_path: Manifest shared with the coordinator
+            max_workers: Games played at once by this process (one thread each)
+            config_hash: Only play games of this batch (None = any enqueued batch)
+            max_attempts: Claims after which a failed or abandoned game is given up
+            poll_interval: Seconds to wait for new games when the queue is empty
+                           (None = stop as soon as the queue is empty)
+        """
+        self.start_time = time.time()
+        self.manifest = BatchManifest(manifest_path)
+        specs = {}
+        specs_lock = threading.Lock()
+        print(f"Worker {self.manifest.owner} pulling games from {manifest_path} with {max_workers} threads")
+
+        def batch_spec(spec_hash):
+            with specs_lock:
+                if spec_hash not in specs:
+                    specs[spec_hash] = self.manifest.batch_spec(spec_hash)
+                    if len(specs) == 1:
+                        self.configure_call_layer(specs[spec_hash]["batch_config"])
+                return specs[spec_hash]
+
+        def work():
+            completed = 0
+            while True:
+                game = self.manifest.claim_next(config_hash, max_attempts)
+                if game is None:
+                    if poll_interval is None:
+                        return completed
+                    time.sleep(poll_interval)
+                    continue
+
+                spec = batch_spec(game["config_hash"])
+                result_info, error_info = self._run_game_with_retries(
+                    game["word_pair"], game["pair_index"], game["round_index"],
+                    spec["players"], spec["judges"], spec["base_game_settings"], spec["batch_config"]
+                )
+                with self.results_lock:
+                    if result_info is not None:
+                        self.game_results.append(result_info)
+                        completed += 1
+                    else:
+                        self.failed_games.append(error_info)
+
+                if result_info is not None:
+                    # A polling worker may never return, so its games reach the columnar log as they finish
+                    if self.log_sink is not None:
+                        self.log_sink.flush()
+                    self.manifest.complete(game["word_pair"], game["round_index"], game["config_hash"],
+                                           game_id=result_info["game_record"]["game_record"]["game_id"])
+                else:
+                    self.manifest.fail(game["word_pair"], game["round_index"], game["config_hash"],
+                                       error_info["error"])
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="QueueWorker") as executor:
+            completed_games = sum(executor.map(lambda _: work(), range(max_workers)))
+
+        self.manifest_hash = config_hash
+        return self._generate_batch_summary(completed_games, completed_games + len(self.failed_games))
+
+    @_flushes_log_sink
     def run_batch_games(self,
                         players: List,
                         judges: List,
@@ -268,6 +755,8 @@ class BatchGameRunner:
         Original serial batch game execution (kept for backward compatibility)
         """
         self.start_time = time.time()
+        self.configure_call_layer(batch_config)
+        self.open_manifest(players, judges, base_game_settings, word_pairs, batch_config)
 
         rounds_per_pair = batch_config.get("rounds_per_pair", 1)
         game_mode = batch_config.get("game_mode", "standard")
@@ -289,8 +778,12 @@ class BatchGameRunner:
                     f"  Running round {round_idx + 1}/{rounds_per_pair} (Total progress: {game_number}/{total_games})")
 
                 # Prepare game settings
-                game_settings = base_game_settings.copy()
-                game_settings["pair"] = [word_pair[0], word_pair[1]]
+                game_settings = self._prepare_game_settings(players, judges, base_game_settings, word_pair,
+                                                            round_idx, game_number, batch_config)
+
+                if not self._claim_game(word_pair, round_idx):
+                    print(f"    Game {game_number} already done or running elsewhere, skipped")
+                    continue
 
                 # Try to run the game with retry mechanism
                 success = False
@@ -318,6 +811,7 @@ class BatchGameRunner:
                             "timestamp": datetime.datetime.now().isoformat()
                         }
                         self.game_results.append(result_info)
+                        self._finish_game(word_pair, round_idx, game_record=game_record)
 
                         self.print_game_summary(game_record, game_mode, game_number, total_games)
                         completed_games += 1
@@ -340,6 +834,7 @@ class BatchGameRunner:
 
                         if retry == max_retries:
                             self.failed_games.append(error_info)
+                            self._finish_game(word_pair, round_idx, error=str(e))
                             if not continue_on_error:
                                 print(f"\nGame {game_number} failed, stopping batch execution11111111111")
                                 return self._generate_batch_summary(completed_games, total_games)
@@ -368,6 +863,12 @@ class BatchGameRunner:
             "games_per_minute": (completed_games / duration * 60) if duration > 0 else 0,
             "failed_game_details": self.failed_games
         }
+        if self.rate_limiter is not None:
+            summary["rate_limits"] = self.rate_limiter.metrics()
+        summary["llm_usage"] = self.usage.totals()
+        if self.manifest is not None:
+            summary["skipped_games"] = self.skipped_games
+            summary["manifest"] = self.manifest.counts(self.manifest_hash)
 
         self._print_batch_summary(summary)
         return summary
@@ -384,6 +885,21 @@ class BatchGameRunner:
         print(f"\n{'=' * 50}")
         print(f"🏁 Batch game execution completed")
 
+        if "manifest" in summary:
+            manifest = summary["manifest"]
+            print(f"  Skipped {summary['skipped_games']} games already done or running elsewhere; manifest: "
+                  f"{manifest['done']} done, {manifest['running']} running, "
+                  f"{manifest['failed']} failed, {manifest['pending']} pending")
+
+        for model, metrics in summary.get("rate_limits", {}).items():
+            print(f"  {model}: {metrics['requests']} requests, max queue {metrics['max_queued']}, "
+                  f"{metrics['throttled']} throttled, {metrics['server_errors']} server errors, "
+                  f"waited {metrics['wait_seconds']:.1f}s")
+
+        for model, usage in summary.get("llm_usage", {}).items():
+            print(f"  {model}: {usage['calls']} API calls, {usage['prompt_tokens']} prompt tokens, "
+                  f"{usage['cached_tokens']} served from the prompt cache ({usage['cache_hit_rate']:.0%})")
+
         if summary['failed_games'] > 0:
             print(f"\nFailed games:")
             for failed in summary['failed_game_details']:
@@ -435,6 +951,45 @@ class BatchGameRunner:
         print(f"Batch results saved to: {output_file}")
 
 
+def _worker_process(manifest_path, max_workers, config_hash, max_attempts, poll_interval):
+    BatchGameRunner().run_worker(manifest_path, max_workers=max_workers, config_hash=config_hash,
+                                 max_attempts=max_attempts, poll_interval=poll_interval)
+
+
+def run_worker_processes(manifest_path: str, processes: int = 1, max_workers: int = 1,
+                         config_hash: Optional[str] = None, max_attempts: int = 3,
+                         poll_interval: Optional[float] = None):
+    """
+    Start several queue workers as separate processes, so that JSON parsing, prompt formatting
+    and record serialization are not serialized on one GIL, and wait for them to finish
+    """
+    workers = [
+        multiprocessing.Process(target=_worker_process, name=f"BatchWorker-{i + 1}",
+                                args=(manifest_path, max_workers, config_hash, max_attempts, poll_interval))
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def worker_main(argv=None):
+    """Command line entry point of a queue worker: python main_batch.py worker <manifest_path>"""
+    parser = argparse.ArgumentParser(description="Play games from a CK-Arena batch manifest")
+    parser.add_argument("manifest_path", help="SQLite manifest written by the coordinator")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes to start")
+    parser.add_argument("--threads", type=int, default=1, help="Games played at once by each process")
+    parser.add_argument("--batch", default=None, help="Only play games of this config hash")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Claims before a game is given up")
+    parser.add_argument("--poll", type=float, default=None,
+                        help="Keep waiting for new games, polling every POLL seconds")
+    args = parser.parse_args(argv)
+
+    run_worker_processes(args.manifest_path, processes=args.processes, max_workers=args.threads,
+                         config_hash=args.batch, max_attempts=args.max_attempts, poll_interval=args.poll)
+
+
 def main():
     """Main function"""
 
@@ -459,7 +1014,11 @@ def main():
         "undercover_count": 2,
         "max_statement_rounds": 5,
         "statements_per_voting": 1,
-        "language": "en"
+        "language": "en",
+        "pipeline_statements": False,  # next player speaks while the judges score the previous statement
+        "vote_workers": None,  # votes collected at once in standard mode (None = all voters)
+        "judge_mode": "statement",  # "round": each judge scores a whole statement round in one call
+        "prompt_budget": None  # history token budget, e.g. {"max_tokens": 1500, "keep_rounds": 2, "strategy": "summary"}
     }
 
     # Parallel batch configuration
@@ -468,10 +1027,36 @@ def main():
         "game_mode": "standard",  # Game mode
         "audience_llm": ["gpt-4-0125-preview", ""],
         "delay_between_games": 0,  # No delay needed for parallel execution
-        "max_retries": 2,  # Maximum 2 retries
+        "max_retries": 1,  # Whole-game retries; transient call failures are retried per call
+        "retry_budget": 20,  # Call-level retries one game may spend before it fails
         "continue_on_error": True,  # Continue on error
         "max_workers": 3,  # 
-        "chunk_size": 6  # 
+        "duration_history": "logs_log/game_durations.json",  # past game durations; longest predicted games start first
+        # run_batch_games_async only: games in progress and LLM requests in flight at once
+        "max_concurrent_games": 100,
+        "max_concurrent_requests": 64,
+        # Opt-in on-disk LLM response cache; set "replay_only": True to replay a recorded run offline
+        "response_cache": None,  # e.g. {"path": "cache/responses.sqlite", "ttl": None, "max_entries": 200000, "replay_only": False}
+        # Shared per-model quotas; 429 / 5xx answers start an adaptive backoff before the agent retries
+        "rate_limits": None,  # e.g. {"limits": {"gpt-4o": {"rpm": 500, "tpm": 30000}}, "default": {"rpm": 60}}
+        # Tag the static system prompts for provider-side prompt caching; cached tokens are logged per model
+        "prompt_cache": None,  # None, "cache_control" (Anthropic-style endpoints) or "prompt_cache_key" (OpenAI)
+        "usage_calls": False,  # True also lists every API call in each game record's "llm_usage"
+        # Also append each finished game to a Parquet store read by rating.py, rating_sweep.py, t-SNE and the KG builder
+        "columnar_log_path": None,  # e.g. "logs_columnar/iclr" (needs pyarrow)
+        # Offline benchmarking: record each game's LLM calls once, then replay them with a fixed seed
+        "seed": None,  # e.g. 1234
+        "cassette_dir": None,  # e.g. "cassettes/iclr"
+        "cassette_mode": "record",  # "record" or "replay"
+        "cassette_latency": None,  # replay delay: None, seconds (e.g. 0.5), "recorded" or "sampled"
+        # Snapshot each game after every statement and vote; a restarted batch resumes unfinished games
+        "checkpoint_dir": None,  # e.g. "checkpoints/iclr"
+        # Durable record of finished games: a restarted batch skips them, several runners can share it
+        "manifest_path": None,  # e.g. "manifests/iclr.sqlite"
+        # Distributed mode (needs manifest_path): only enqueue the games here and let
+        # `python main_batch.py worker <manifest_path>` processes on any host play them
+        "distributed": False,
+        "local_worker_processes": 0  # worker processes to start on this host as well
     }
 
     # Load word pairs
@@ -491,6 +1076,23 @@ def main():
 
     print(f"Loaded {len(word_pairs)} word pairs")
 
+    if batch_config.get("distributed"):
+        config_hash = runner.enqueue_batch(players, judges, base_game_settings, word_pairs, batch_config)
+        print(f"Enqueued batch {config_hash}; start workers with: "
+              f"python main_batch.py worker {batch_config['manifest_path']}")
+        local_workers = None
+        if batch_config.get("local_worker_processes"):
+            local_workers = multiprocessing.Process(
+                target=run_worker_processes,
+                args=(batch_config["manifest_path"], batch_config["local_worker_processes"],
+                      batch_config.get("max_workers", 1), config_hash)
+            )
+            local_workers.start()
+        runner.wait_for_batch(config_hash)
+        if local_workers is not None:
+            local_workers.join()
+        return
+
     # Run parallel batch games
     try:
         print("Running games in parallel mode...")
@@ -517,4 +1119,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "worker":
+        worker_main(sys.argv[2:])
+    else:
+        main()
\ No newline at end of file
@@ -6,6 +6,9 @@ from typing import Dict, List, Tuple, Any
 import argparse
 from datetime import datetime
 
+from columnar_logs import is_columnar_store, load_rating_records
+from log_catalog import catalog_game_records, is_catalog_query
+
 
 def load_json_files(directory_path: str) -> List[Dict]:
     """
@@ -19,6 +22,14 @@ def load_json_files(directory_path: str) -> List[Dict]:
     2. If directory contains JSON files directly, traverse in filename order
     """
 
+    # A columnar log store (see columnar_logs.py) is read without parsing any JSON
+    if is_columnar_store(directory_path):
+        return load_rating_records(directory_path)
+
+    # A catalog query (see log_catalog.py) opens only the log files it selects
+    if is_catalog_query(directory_path):
+        return catalog_game_records(directory_path)
+
     # Check if directory exists
     if not os.path.exists(directory_path):
         print(f"Error: Directory {directory_path} does not exist")
@@ -153,6 +164,18 @@ def load_json_files_with_pattern_info(directory_path: str) -> Tuple[List[Dict],
         'subdir_details': {}
     }
 
+    if is_columnar_store(directory_path):
+        loaded_games = load_rating_records(directory_path)
+        pattern_info['traversal_type'] = 'columnar'
+        pattern_info['total_files'] = len(loaded_games)
+        return loaded_games, pattern_info
+
+    if is_catalog_query(directory_path):
+        loaded_games = catalog_game_records(directory_path)
+        pattern_info['traversal_type'] = 'catalog'
+        pattern_info['total_files'] = len(loaded_games)
+        return loaded_games, pattern_info
+
     # Check directory structure
     root_json_files = []
     subdirs_with_json = {}
@@ -535,6 +558,39 @@ class NonZeroSumEloRatingSystem:
         self.history.append(game_record)
         return game_record
 
+
+# Per-model sums accumulated while rating, from which the leaderboard is derived
+STAT_NAMES = (
+    "games", "wins", "civilian_games", "civilian_wins", "undercover_games", "undercover_wins",
+    "sum_survival_rate", "sum_voting_accuracy", "sum_performance_score", "sum_expected_score",
+    "sum_rating_change"
+)
+
+
+def summarize_model(llm_id: str, rating: float, games_played: int, k_factor: float,
+                    stats: Dict[str, float]) -> Dict[str, Any]:
+    """Leaderboard row of a model from its per-model sums (see STAT_NAMES)"""
+    games = stats["games"]
+    return {
+        "llm_id": llm_id,
+        "rating": round(rating, 2),
+        "games_played": games_played,
+        "k_factor": k_factor,
+        "win_rate": round(stats["wins"] / games, 3) if games else 0,
+        "civilian_win_rate": round(stats["civilian_wins"] / stats["civilian_games"], 3)
+        if stats["civilian_games"] else 0,
+        "undercover_win_rate": round(stats["undercover_wins"] / stats["undercover_games"], 3)
+        if stats["undercover_games"] else 0,
+        "civilian_games": int(stats["civilian_games"]),
+        "undercover_games": int(stats["undercover_games"]),
+        "avg_survival_rate": round(stats["sum_survival_rate"] / games, 3) if games else 0,
+        "avg_voting_accuracy": round(stats["sum_voting_accuracy"] / games, 3) if games else 0,
+        "avg_performance_score": round(stats["sum_performance_score"] / games, 3) if games else 0,
+        "avg_expected_score": round(stats["sum_expected_score"] / games, 3) if games else 0,
+        "avg_rating_change": round(stats["sum_rating_change"] / games, 3) if games else 0
+    }
+
+
 def main(data_path: str, output_path: str = None, import_previous: str = None, use_alternative_expected: bool = False):
 
 
@@ -0,0 +1,253 @@
+# rating_arrays.py
+
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from rating import STAT_NAMES, PlayerPerformance, summarize_model
+
+# Parameters of the non-zero-sum Elo system, as in NonZeroSumEloRatingSystem
+DEFAULT_ELO_PARAMETERS = {
+    "initial_rating": 1000,
+    "role_balance_bonus": 120,
+    "k_max": 60.0,
+    "k_min": 5.0,
+    "tau": 2.5,
+    "win_weight": 0.75,
+    "survival_weight": 0.15,
+    "voting_weight": 0.10,
+    "use_alternative_expected": False
+}
+
+
+class EncodedGames:
+    """
+    A game corpus encoded once into flat NumPy arrays
+
+    Models are mapped to integer ids, and every game is a row of players padded to the
+    largest game: model id (-1 for padding), role, win flag, survival rate and voting
+    accuracy. The per-player metrics are computed with PlayerPerformance, so they are
+    the values NonZeroSumEloRatingSystem uses. The arrays are plain NumPy, so a corpus
+    can be shared with worker processes cheaply.
+    """
+
+    def __init__(self, game_records: List[Dict]):
+        """
+        Encode game records the way rating.main() selects them
+
+        Games are sorted by timestamp and a game_id is kept once (its first game that
+        can be rated); games whose players cannot be parsed are skipped.
+
+        Parameters:
+            game_records: Game records (the "game_record" of the log files)
+        """
+        self.models: List[str] = []
+        model_ids: Dict[str, int] = {}
+        self.game_ids: List[str] = []
+        self.timestamps: List[str] = []
+        rows = []
+
+        for game_data in sorted(game_records, key=lambda x: x["timestamp"]):
+            if game_data["game_id"] in self.game_ids:
+                continue
+            try:
+                performances = [PlayerPerformance(player_data, game_data) for player_data in game_data["players"]]
+            except Exception as e:
+                print(f"log fail {game_data.get('game_id', 'unknown')}: {e}")
+                continue
+            for perf in performances:
+                if perf.llm_id not in model_ids:
+                    model_ids[perf.llm_id] = len(self.models)
+                    self.models.append(perf.llm_id)
+            rows.append([(model_ids[p.llm_id], p.role == "civilian", p.role == "undercover", bool(p.is_winner),
+                          p.survival_rate, p.voting_accuracy) for p in performances])
+            self.game_ids.append(game_data["game_id"])
+            self.timestamps.append(game_data["timestamp"])
+
+        shape = (len(rows), max((len(row) for row in rows), default=0))
+        self.model_ids = np.full(shape, -1, dtype=np.int64)
+        self.civilian = np.zeros(shape, dtype=bool)
+        self.undercover = np.zeros(shape, dtype=bool)
+        self.winner = np.zeros(shape, dtype=bool)
+        self.survival_rate = np.zeros(shape, dtype=np.float64)
+        self.voting_accuracy = np.zeros(shape, dtype=np.float64)
+        for g, row in enumerate(rows):
+            for p, (model_id, civilian, undercover, winner, survival_rate, voting_accuracy) in enumerate(row):
+                self.model_ids[g, p] = model_id
+                self.civilian[g, p] = civilian
+                self.undercover[g, p] = undercover
+                self.winner[g, p] = winner
+                self.survival_rate[g, p] = survival_rate
+                self.voting_accuracy[g, p] = voting_accuracy
+        self.mask = self.model_ids >= 0
+
+    @property
+    def num_games(self) -> int:
+        return self.model_ids.shape[0]
+
+    @property
+    def num_models(self) -> int:
+        return len(self.models)
+
+
+class ArrayEloRatingSystem:
+    """
+    Array-backed NonZeroSumEloRatingSystem, rating several configurations at once
+
+    Each configuration (role balance bonus, K-factor schedule, performance weights,
+    expected-score method, game order) is a row of a ratings matrix, and each game step
+    updates every configuration with vectorized operations. Players of a game are still
+    updated one after the other, as in update_ratings_non_zero_sum(), since a player's
+    expected score depends on the ratings of the players updated before it; ratings
+    match NonZeroSumEloRatingSystem to floating-point rounding.
+    """
+
+    def __init__(self, games: EncodedGames, configs: Optional[Sequence[Dict[str, Any]]] = None):
+        """
+        Parameters:
+            games: Encoded game corpus
+            configs: Parameter sets (keys of DEFAULT_ELO_PARAMETERS; missing keys take the
+                     default). None = one configuration with the defaults.
+        """
+        self.games = games
+        self.configs = [dict(DEFAULT_ELO_PARAMETERS, **config) for config in (configs or [{}])]
+
+        def column(name, dtype=np.float64):
+            return np.array([config[name] for config in self.configs], dtype=dtype)
+
+        self.role_balance_bonus = column("role_balance_bonus")
+        self.k_max = column("k_max")
+        self.k_min = column("k_min")
+        self.tau = column("tau")
+        self.win_weight = column("win_weight")
+        self.survival_weight = column("survival_weight")
+        self.voting_weight = column("voting_weight")
+        self.alternative = column("use_alternative_expected", bool)
+
+        shape = (len(self.configs), games.num_models)
+        self.ratings = np.repeat(column("initial_rating")[:, None], games.num_models, axis=1)
+        self.game_counts = np.zeros(shape, dtype=np.int64)
+        self.stats = {name: np.zeros(shape, dtype=np.float64) for name in STAT_NAMES}
+
+    def k_factor(self, game_counts: np.ndarray) -> np.ndarray:
+        """K(g) = K_min + (K_max - K_min) * exp(- (games // 12) / tau), per configuration"""
+        g = np.maximum(game_counts, 0) // 12
+        return self.k_min + (self.k_max - self.k_min) * np.exp(-g / self.tau)
+
+    def run(self, order: Optional[np.ndarray] = None) -> "ArrayEloRatingSystem":
+        """
+        Rate games in order
+
+        Parameters:
+            order: Game indices to rate, one row per configuration (or a single row shared
+                   by all configurations); indices may repeat, e.g. for bootstrap resamples.
+                   None = every game, in timestamp order.
+        """
+        if order is None:
+            order = np.arange(self.games.num_games)
+        order = np.atleast_2d(order)
+        order = np.broadcast_to(order, (len(self.configs), order.shape[1]))
+        for step in range(order.shape[1]):
+            self._rate_step(order[:, step])
+        self._accumulate_outcomes(order)
+        return self
+
+    def _rate_step(self, game_index: np.ndarray):
+        """Rate one game per configuration (each configuration may rate a different game)"""
+        games = self.games
+        configs = np.arange(len(self.configs))
+        model_ids = games.model_ids[game_index]
+        mask = games.mask[game_index]
+        civilian = games.civilian[game_index]
+        safe_ids = np.where(mask, model_ids, 0)
+
+        # Adjusted ratings of the players, kept current as players are updated
+        adjusted = self.ratings[configs[:, None], safe_ids] + np.where(civilian, self.role_balance_bonus[:, None], 0.0)
+        same_model = (model_ids[:, :, None] == model_ids[:, None, :]) & mask[:, None, :]
+        actual = (games.winner[game_index] * self.win_weight[:, None]
+                  + games.survival_rate[game_index] * self.survival_weight[:, None]
+                  + games.voting_accuracy[game_index] * self.voting_weight[:, None])
+
+        use_role = not self.alternative.all()
+        use_team = self.alternative.any()
+        if use_role:
+            opponents = mask[:, None, :] & ~same_model
+            opponent_counts = opponents.sum(axis=2)
+            base_expected = np.where(civilian, 0.65, 0.35) * 0.7
+        if use_team:
+            civilian_team = mask & civilian
+            undercover_team = mask & games.undercover[game_index]
+            civilian_count = civilian_team.sum(axis=1)
+            undercover_count = undercover_team.sum(axis=1)
+            both_teams = (civilian_count > 0) & (undercover_count > 0)
+
+        for p in range(model_ids.shape[1]):
+            active = mask[:, p]
+            if not active.any():
+                continue
+            player = safe_ids[:, p]
+
+            if use_role:
+                # Pairwise Elo expectation against every other model of the game
+                pairwise = np.where(opponents[:, p], 1 / (1 + 10 ** ((adjusted - adjusted[:, p:p + 1]) / 400)), 0.0)
+                count = opponent_counts[:, p]
+                elo_expected = np.where(count > 0, pairwise.sum(axis=1) / np.maximum(count, 1), 0.5)
+                expected = base_expected[:, p] + elo_expected * 0.3
+            if use_team:
+                # Team-average Elo expectation
+                civilian_avg = np.where(civilian_team, adjusted, 0.0).sum(axis=1) / np.maximum(civilian_count, 1)
+                undercover_avg = np.where(undercover_team, adjusted, 0.0).sum(axis=1) / np.maximum(undercover_count, 1)
+                civilian_expected = 1 / (1 + 10 ** ((undercover_avg - civilian_avg) / 400))
+                team_expected = np.where(civilian[:, p], civilian_expected, 1 - civilian_expected)
+                team_expected = np.where(both_teams, team_expected, 0.5)
+                expected = np.where(self.alternative, team_expected, expected) if use_role else team_expected
+
+            k_factor = self.k_factor(self.game_counts[configs, player])
+            change = np.where(active, k_factor * (actual[:, p] - expected), 0.0)
+
+            # One model per configuration, so plain fancy-index updates do not collide
+            self.ratings[configs, player] += change
+            self.game_counts[configs, player] += active
+            self.stats["sum_expected_score"][configs, player] += np.where(active, expected, 0.0)
+            self.stats["sum_rating_change"][configs, player] += change
+            adjusted += change[:, None] * same_model[:, p]
+
+    def _accumulate_outcomes(self, order: np.ndarray):
+        """Add the rating-independent per-model sums of the rated games"""
+        games = self.games
+        model_ids = games.model_ids[order]
+        mask = games.mask[order]
+        configs = np.broadcast_to(np.arange(len(self.configs))[:, None, None], model_ids.shape)[mask]
+        players = model_ids[mask]
+        winner = games.winner[order][mask].astype(np.float64)
+        civilian = games.civilian[order][mask]
+        undercover = games.undercover[order][mask]
+        survival_rate = games.survival_rate[order][mask]
+        voting_accuracy = games.voting_accuracy[order][mask]
+        actual = (winner * self.win_weight[configs] + survival_rate * self.survival_weight[configs]
+                  + voting_accuracy * self.voting_weight[configs])
+
+        for name, values in (("games", 1.0), ("wins", winner),
+                             ("civilian_games", civilian), ("civilian_wins", civilian * winner),
+                             ("undercover_games", undercover), ("undercover_wins", undercover * winner),
+                             ("sum_survival_rate", survival_rate), ("sum_voting_accuracy", voting_accuracy),
+                             ("sum_performance_score", actual)):
+            np.add.at(self.stats[name], (configs, players), values)
+
+    def leaderboard(self, config_index: int = 0) -> List[Dict[str, Any]]:
+        """Leaderboard of one configuration, with the fields of rating.main()'s final_ratings, best first"""
+        rows = []
+        config = self.configs[config_index]
+        for model_id, llm_id in enumerate(self.games.models):
+            stats = {name: float(self.stats[name][config_index, model_id]) for name in STAT_NAMES}
+            if not stats["games"]:
+                continue
+            games_played = int(self.game_counts[config_index, model_id])
+            # Scalar math, so the column is identical to NonZeroSumEloRatingSystem.get_k_factor()
+            k_factor = config["k_min"] + (config["k_max"] - config["k_min"]) * math.exp(
+                - float(games_played // 12) / config["tau"])
+            rows.append(summarize_model(llm_id, float(self.ratings[config_index, model_id]), games_played,
+                                        float(k_factor), stats))
+        rows.sort(key=lambda x: x["rating"], reverse=True)
+        return rows
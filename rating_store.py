@@ -0,0 +1,349 @@
+# rating_store.py
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from log_catalog import catalog_query_paths, is_catalog_query
+from rating import STAT_NAMES, NonZeroSumEloRatingSystem, summarize_model
+
+
+class RatingStore:
+    """
+    Incremental Elo leaderboard persisted in SQLite
+
+    The store keeps the current rating and game count of every model, per-model
+    aggregates (wins per role, sums of the performance metrics), the game_ids already
+    rated and an index of the log files seen (mtime, size and content hash). An update
+    stats the log tree, opens only new or modified files and rates only the games it
+    has not rated yet, in timestamp order (then path order), so its cost grows with the
+    number of new games rather than with the size of the log tree. Unlike
+    rating.load_json_files, the whole tree is searched, at any depth.
+
+    Ratings match a full rating.main() run as long as new games are not older than
+    the games already rated; older games are still rated (after the newer ones) and
+    reported as out of order, and rebuild() replays everything in timestamp order.
+    """
+
+    def __init__(self, path: str, role_balance_bonus: float = 115, use_alternative_expected: bool = False,
+                 initial_rating: int = 1000):
+        """
+        Open (or create) a rating store
+
+        Parameters:
+            path: SQLite database file
+            role_balance_bonus: Civilian rating bonus of the Elo system
+            use_alternative_expected: Use the team-average expected score
+            initial_rating: Rating of a model in its first game
+
+        A store is tied to the settings it was created with: opening it with different
+        ones raises ValueError, since its ratings would mix both.
+        """
+        self.path = path
+        self.settings = {
+            "role_balance_bonus": role_balance_bonus,
+            "use_alternative_expected": use_alternative_expected,
+            "initial_rating": initial_rating
+        }
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " sha256 TEXT NOT NULL,"
+            " game_id TEXT,"
+            " status TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            " game_id TEXT PRIMARY KEY,"
+            " timestamp TEXT NOT NULL,"
+            " path TEXT,"
+            " total_rating_change REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_games_timestamp ON games (timestamp)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS models ("
+            " llm_id TEXT PRIMARY KEY,"
+            " rating REAL NOT NULL,"
+            " games_played INTEGER NOT NULL,"
+            + ",".join(f" {column} REAL NOT NULL DEFAULT 0" for column in STAT_NAMES) + ")"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'settings'").fetchone()
+        if row is None:
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('settings', ?)", (json.dumps(self.settings),))
+        elif json.loads(row[0]) != self.settings:
+            raise ValueError(f"Rating store {path} was built with settings {row[0]}, not {json.dumps(self.settings)}; "
+                             f"use another store or rebuild it")
+
+    def scan(self, data_path: str) -> Tuple[List[Tuple[str, int, int]], int]:
+        """
+        Find the JSON files of a log tree (or of a catalog query, see log_catalog.py) that are
+        new or modified since the last update
+
+        Only file metadata is read here; unchanged files (same mtime and size) are not opened.
+
+        Returns:
+            (list of (path, mtime_ns, size) to read, number of unchanged files)
+        """
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in
+                 self._conn.execute("SELECT path, mtime_ns, size FROM files")}
+        changed, unchanged = [], 0
+        for path in _json_files(data_path):
+            stat = os.stat(path)
+            if known.get(path) == (stat.st_mtime_ns, stat.st_size):
+                unchanged += 1
+            else:
+                changed.append((path, stat.st_mtime_ns, stat.st_size))
+        return changed, unchanged
+
+    def update(self, data_path: str) -> Dict[str, Any]:
+        """
+        Rate the games of a log tree that are not in the store yet
+
+        Returns:
+            Dict: Summary of the update (files read, games rated, out-of-order games, time)
+        """
+        start = time.perf_counter()
+        changed, unchanged = self.scan(data_path)
+
+        hashes = {path: sha256 for path, sha256 in self._conn.execute("SELECT path, sha256 FROM files")}
+        rated = {game_id for (game_id,) in self._conn.execute("SELECT game_id FROM games")}
+        file_rows, candidates, touched = [], [], 0
+
+        for path, mtime_ns, size in changed:
+            with open(path, "rb") as f:
+                content = f.read()
+            sha256 = hashlib.sha256(content).hexdigest()
+            if hashes.get(path) == sha256:
+                # Touched but not modified
+                touched += 1
+                self._conn.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?", (mtime_ns, size, path))
+                continue
+
+            try:
+                game_data = json.loads(content.decode("utf-8")).get("game_record")
+            except Exception as e:
+                print(f"Failed to read file {path}: {e}")
+                game_data = None
+
+            if game_data is None:
+                file_rows.append([path, mtime_ns, size, sha256, None, "skipped"])
+            else:
+                row = [path, mtime_ns, size, sha256, game_data["game_id"], "duplicate"]
+                file_rows.append(row)
+                candidates.append((game_data, row))
+
+        # Like rating.main(): games in timestamp order, the first game of each game_id wins
+        candidates.sort(key=lambda item: (item[0]["timestamp"], item[1][0]))
+        latest = self._conn.execute("SELECT MAX(timestamp) FROM games").fetchone()[0]
+
+        elo_system = self._load_system()
+        aggregates = {}
+        game_rows, failed, out_of_order = [], 0, 0
+        for game_data, row in candidates:
+            if game_data["game_id"] in rated:
+                continue
+            try:
+                game_record = elo_system.process_game(game_data, self.settings["use_alternative_expected"])
+            except Exception as e:
+                print(f"log fail {game_data.get('game_id', 'unknown')}: {e}")
+                row[5] = "failed"
+                failed += 1
+                continue
+            elo_system.history.clear()
+            rated.add(game_data["game_id"])
+            row[5] = "rated"
+            if latest is not None and game_data["timestamp"] < latest:
+                out_of_order += 1
+            game_rows.append((game_data["game_id"], game_data["timestamp"], row[0],
+                              game_record["system_info"]["total_rating_change"]))
+            for player_record in game_record["players"]:
+                self._accumulate(aggregates, player_record)
+
+        self._write(elo_system, aggregates, game_rows, [tuple(row) for row in file_rows])
+
+        return {
+            "files_scanned": len(changed) + unchanged,
+            "files_read": len(changed) - touched,
+            "games_rated": len(game_rows),
+            "games_failed": failed,
+            "out_of_order_games": out_of_order,
+            "seconds": time.perf_counter() - start
+        }
+
+    def rebuild(self, data_path: str) -> Dict[str, Any]:
+        """Forget every rating and rate the whole log tree again, in timestamp order"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        for table in ("files", "games", "models"):
+            self._conn.execute(f"DELETE FROM {table}")
+        self._conn.execute("COMMIT")
+        return self.update(data_path)
+
+    def leaderboard(self) -> List[Dict[str, Any]]:
+        """Current leaderboard, with the fields of rating.main()'s final_ratings, best first"""
+        elo_system = NonZeroSumEloRatingSystem(self.settings["initial_rating"], self.settings["role_balance_bonus"])
+        columns = ", ".join(STAT_NAMES)
+        rows = []
+        for row in self._conn.execute(f"SELECT llm_id, rating, games_played, {columns} FROM models"):
+            llm_id, rating, games_played = row[:3]
+            stats = dict(zip(STAT_NAMES, row[3:]))
+            rows.append(summarize_model(llm_id, rating, games_played, elo_system.get_k_factor(games_played), stats))
+        rows.sort(key=lambda x: x["rating"], reverse=True)
+        return rows
+
+    def statistics(self) -> Dict[str, Any]:
+        """Totals over every rated game"""
+        games, total, largest, smallest = self._conn.execute(
+            "SELECT COUNT(*), SUM(total_rating_change), MAX(total_rating_change), MIN(total_rating_change) FROM games"
+        ).fetchone()
+        return {
+            "total_games": games,
+            "total_players": self._conn.execute("SELECT COUNT(*) FROM models").fetchone()[0],
+            "role_balance_bonus": self.settings["role_balance_bonus"],
+            "system_type": "non_zero_sum_elo",
+            "use_alternative_expected": self.settings["use_alternative_expected"],
+            "non_zero_sum_analysis": {
+                "avg_total_rating_change_per_game": total / games if games else 0,
+                "max_total_rating_change": largest if games else 0,
+                "min_total_rating_change": smallest if games else 0
+            }
+        }
+
+    def close(self):
+        self._conn.close()
+
+    def _load_system(self) -> NonZeroSumEloRatingSystem:
+        """Elo system holding the stored ratings and game counts"""
+        elo_system = NonZeroSumEloRatingSystem(self.settings["initial_rating"], self.settings["role_balance_bonus"])
+        for llm_id, rating, games_played in self._conn.execute("SELECT llm_id, rating, games_played FROM models"):
+            elo_system.ratings[llm_id] = rating
+            elo_system.game_counts[llm_id] = games_played
+        return elo_system
+
+    @staticmethod
+    def _accumulate(aggregates: Dict[str, Dict[str, float]], player_record: Dict[str, Any]):
+        """Add one player record of a rated game to the per-model sums"""
+        stats = aggregates.setdefault(player_record["llm_id"], dict.fromkeys(STAT_NAMES, 0))
+        role = player_record["role"]
+        won = 1 if player_record["is_winner"] else 0
+        stats["games"] += 1
+        stats["wins"] += won
+        if role in ("civilian", "undercover"):
+            stats[f"{role}_games"] += 1
+            stats[f"{role}_wins"] += won
+        stats["sum_survival_rate"] += player_record["survival_rate"]
+        stats["sum_voting_accuracy"] += player_record["voting_accuracy"]
+        stats["sum_performance_score"] += player_record["performance_score"]
+        stats["sum_expected_score"] += player_record["expected_score"]
+        stats["sum_rating_change"] += player_record["rating_change"]
+
+    def _write(self, elo_system: NonZeroSumEloRatingSystem, aggregates: Dict[str, Dict[str, float]],
+               game_rows: List[tuple], file_rows: List[tuple]):
+        """Persist the result of an update in one transaction"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany("INSERT OR REPLACE INTO files (path, mtime_ns, size, sha256, game_id, status)"
+                                   " VALUES (?, ?, ?, ?, ?, ?)", file_rows)
+            self._conn.executemany("INSERT INTO games (game_id, timestamp, path, total_rating_change)"
+                                   " VALUES (?, ?, ?, ?)", game_rows)
+            for llm_id, stats in aggregates.items():
+                self._conn.execute("INSERT OR IGNORE INTO models (llm_id, rating, games_played) VALUES (?, 0, 0)",
+                                   (llm_id,))
+                self._conn.execute(
+                    "UPDATE models SET rating = ?, games_played = ?, "
+                    + ", ".join(f"{column} = {column} + ?" for column in STAT_NAMES)
+                    + " WHERE llm_id = ?",
+                    (elo_system.ratings[llm_id], elo_system.game_counts[llm_id],
+                     *(stats[column] for column in STAT_NAMES), llm_id)
+                )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+
+def _json_files(data_path: str) -> List[str]:
+    """JSON files of a log tree, at any depth, in path order, or the files selected by a catalog query"""
+    if is_catalog_query(data_path):
+        return catalog_query_paths(data_path)
+    paths = []
+    for root, dirs, files in os.walk(data_path):
+        dirs.sort()
+        paths.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(".json"))
+    return paths
+
+
+def print_leaderboard(rows: List[Dict[str, Any]]):
+    """Print a leaderboard in the format of rating.main()"""
+    for rank, data in enumerate(rows, 1):
+        print(f"{rank:<5}{data['llm_id']:<25}{data['rating']:<8.2f}"
+              f"{data['games_played']:<6}{data['win_rate']:<6.3f}"
+              f"{data['civilian_win_rate']:<8.3f}{data['undercover_win_rate']:<8.3f}"
+              f"{data['avg_expected_score']:<8.3f}{data['avg_performance_score']:<8.3f}"
+              f"{data['avg_rating_change']:<9.3f}{data['k_factor']:<6.1f}")
+
+
+def main(data_path: Optional[str], store_path: str, output_path: str = "", rebuild: bool = False,
+         role_balance_bonus: float = 115, use_alternative_expected: bool = False):
+    """
+    Update the persisted leaderboard with the new games of a log tree and print it
+
+    Parameters:
+        data_path: Log tree to rate (None = only print the stored leaderboard)
+        store_path: SQLite rating store
+        output_path: JSON file for the leaderboard ("" = print only)
+        rebuild: Rate the whole log tree again from scratch
+        role_balance_bonus: Civilian rating bonus of the Elo system
+        use_alternative_expected: Use the team-average expected score
+    """
+    store = RatingStore(store_path, role_balance_bonus, use_alternative_expected)
+    if data_path:
+        summary = store.rebuild(data_path) if rebuild else store.update(data_path)
+        print(f"Scanned {summary['files_scanned']} files, read {summary['files_read']}, "
+              f"rated {summary['games_rated']} new games in {summary['seconds'] * 1000:.1f} ms")
+        if summary["out_of_order_games"]:
+            print(f"Warning: {summary['out_of_order_games']} new games are older than games already rated; "
+                  f"use --rebuild to rate every game in timestamp order")
+
+    final_ratings = store.leaderboard()
+    print_leaderboard(final_ratings)
+
+    if output_path:
+        directory = os.path.dirname(os.path.abspath(output_path))
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump({"final_ratings": final_ratings, "statistics": store.statistics()}, f, ensure_ascii=False,
+                      indent=2)
+        print(f"Leaderboard saved to {output_path}")
+
+    store.close()
+    return final_ratings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally update the Elo leaderboard from new game logs")
+    parser.add_argument("data_path", nargs="?", default=None, help="Log tree to rate (omit to only print)")
+    parser.add_argument("--store", default="ratings/ratings.sqlite", help="SQLite rating store")
+    parser.add_argument("--output", default="", help="JSON file for the leaderboard")
+    parser.add_argument("--rebuild", action="store_true", help="Rate every game again from scratch")
+    parser.add_argument("--role-balance-bonus", type=float, default=115, help="Civilian rating bonus")
+    parser.add_argument("--alternative-expected", action="store_true",
+                        help="Use the team-average expected score")
+    args = parser.parse_args()
+
+    main(args.data_path, args.store, args.output, args.rebuild, args.role_balance_bonus, args.alternative_expected)
@@ -0,0 +1,255 @@
+# rating_sweep.py
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from columnar_logs import is_columnar_store, load_rating_records
+from log_catalog import catalog_game_records, is_catalog_query
+from rating_arrays import ArrayEloRatingSystem, EncodedGames
+
+_corpus: Optional[EncodedGames] = None
+
+
+def load_game_records(data_path: str) -> List[Dict]:
+    """
+    Game records of every JSON file of a log tree, at any depth, in path order
+
+    data_path can also be a columnar log store or a catalog query (see log_catalog.py).
+    """
+    if is_columnar_store(data_path):
+        return load_rating_records(data_path)
+    if is_catalog_query(data_path):
+        return catalog_game_records(data_path)
+    records = []
+    for root, dirs, files in os.walk(data_path):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"Failed to read file {path}: {e}")
+                continue
+            if "game_record" in data:
+                records.append(data["game_record"])
+    return records
+
+
+def parameter_grid(role_balance_bonus: List[float], k_max: List[float], k_min: List[float], tau: List[float],
+                   weights: List[Tuple[float, float, float]], expected: List[str]) -> List[Dict[str, Any]]:
+    """Every combination of the given parameter values, as ArrayEloRatingSystem configurations"""
+    return [
+        {
+            "role_balance_bonus": bonus,
+            "k_max": kmax,
+            "k_min": kmin,
+            "tau": t,
+            "win_weight": w[0],
+            "survival_weight": w[1],
+            "voting_weight": w[2],
+            "use_alternative_expected": method == "team"
+        }
+        for bonus, kmax, kmin, t, w, method in itertools.product(role_balance_bonus, k_max, k_min, tau, weights,
+                                                                 expected)
+    ]
+
+
+def _init_worker(corpus: EncodedGames):
+    """Keep the corpus in the worker, so it is sent once per process rather than once per task"""
+    global _corpus
+    _corpus = corpus
+
+
+def _rate_chunk(configs: List[Dict[str, Any]], orders: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Final ratings and game counts of a chunk of (configuration, game order) runs"""
+    engine = ArrayEloRatingSystem(_corpus, configs).run(orders)
+    return engine.ratings, engine.game_counts
+
+
+def run_sweep(corpus: EncodedGames, configs: List[Dict[str, Any]], bootstrap: int = 0, permutations: int = 0,
+              processes: int = 1, chunk_size: int = 64, seed: int = 0) -> List[Dict[str, np.ndarray]]:
+    """
+    Rate the corpus under every configuration, in timestamp order and under resampled orders
+
+    For each configuration there is one run in timestamp order, `bootstrap` runs on games
+    resampled with replacement (rated in timestamp order) and `permutations` runs on the
+    games in a random order. Runs are grouped in chunks that one ArrayEloRatingSystem
+    rates together, and chunks are spread over a process pool that receives the
+    corpus once per process.
+
+    Returns:
+        One dict per configuration with "base" (ratings in timestamp order, per model),
+        "bootstrap" and "permutation" (ratings per run and model, NaN for a model without
+        games in that run)
+    """
+    rng = np.random.default_rng(seed)
+    num_games = corpus.num_games
+    runs = []  # (config index, kind, order)
+    for index in range(len(configs)):
+        runs.append((index, "base", np.arange(num_games)))
+        for _ in range(bootstrap):
+            runs.append((index, "bootstrap", np.sort(rng.integers(0, num_games, num_games))))
+        for _ in range(permutations):
+            runs.append((index, "permutation", rng.permutation(num_games)))
+
+    chunks = [runs[start:start + chunk_size] for start in range(0, len(runs), chunk_size)]
+    tasks = [([configs[index] for index, _, _ in chunk], np.stack([order for _, _, order in chunk]))
+             for chunk in chunks]
+
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(corpus,)) as pool:
+            outputs = list(pool.map(_rate_chunk, *zip(*tasks)))
+    else:
+        _init_worker(corpus)
+        outputs = [_rate_chunk(chunk_configs, orders) for chunk_configs, orders in tasks]
+
+    results = [{"base": None, "bootstrap": [], "permutation": []} for _ in configs]
+    for chunk, (ratings, game_counts) in zip(chunks, outputs):
+        for row, (index, kind, _) in enumerate(chunk):
+            values = np.where(game_counts[row] > 0, ratings[row], np.nan)
+            if kind == "base":
+                results[index]["base"] = values
+            else:
+                results[index][kind].append(values)
+    for result in results:
+        for kind in ("bootstrap", "permutation"):
+            result[kind] = np.array(result[kind]).reshape(-1, corpus.num_models)
+    return results
+
+
+def rank_matrix(ratings: np.ndarray) -> np.ndarray:
+    """Rank (1 = best) of each model in each run; models without games get rank 0"""
+    ranks = np.zeros(ratings.shape, dtype=np.int64)
+    for run, values in enumerate(ratings):
+        present = np.flatnonzero(~np.isnan(values))
+        ranks[run, present[np.argsort(-values[present], kind="stable")]] = np.arange(1, len(present) + 1)
+    return ranks
+
+
+def summarize(corpus: EncodedGames, result: Dict[str, np.ndarray], confidence: float = 0.95) -> List[Dict[str, Any]]:
+    """
+    Leaderboard of one configuration with confidence intervals
+
+    Rating columns are percentile intervals over the bootstrap runs (game sampling) and
+    the permutation runs (game order); the rank distribution is the share of resampled
+    runs (bootstrap and permutation) in which a model had each rank.
+    """
+    low, high = 100 * (1 - confidence) / 2, 100 * (1 + confidence) / 2
+    resampled = np.concatenate([result["bootstrap"], result["permutation"]])
+    ranks = rank_matrix(resampled)
+    rows = []
+    for model_id, llm_id in enumerate(corpus.models):
+        base = result["base"][model_id]
+        if np.isnan(base):
+            continue
+        row = {"llm_id": llm_id, "rating": round(float(base), 2)}
+        for kind in ("bootstrap", "permutation"):
+            values = result[kind][:, model_id]
+            values = values[~np.isnan(values)]
+            if len(values):
+                row[f"{kind}_mean"] = round(float(values.mean()), 2)
+                row[f"{kind}_ci_low"] = round(float(np.percentile(values, low)), 2)
+                row[f"{kind}_ci_high"] = round(float(np.percentile(values, high)), 2)
+        model_ranks = ranks[:, model_id]
+        model_ranks = model_ranks[model_ranks > 0]
+        if len(model_ranks):
+            counts = np.bincount(model_ranks)
+            row["median_rank"] = float(np.median(model_ranks))
+            row["rank_distribution"] = {str(rank): round(float(count / len(model_ranks)), 4)
+                                        for rank, count in enumerate(counts) if count}
+        rows.append(row)
+    rows.sort(key=lambda x: x["rating"], reverse=True)
+    return rows
+
+
+def print_summary(rows: List[Dict[str, Any]]):
+    """Print a leaderboard with its intervals"""
+    print(f"{'Rank':<5}{'Model':<32}{'Rating':>8}  {'Bootstrap CI':>18}  {'Order CI':>18}  {'Median rank':>11}")
+    for rank, row in enumerate(rows, 1):
+        bootstrap = (f"[{row['bootstrap_ci_low']:.1f}, {row['bootstrap_ci_high']:.1f}]"
+                     if "bootstrap_ci_low" in row else "-")
+        order = (f"[{row['permutation_ci_low']:.1f}, {row['permutation_ci_high']:.1f}]"
+                 if "permutation_ci_low" in row else "-")
+        print(f"{rank:<5}{row['llm_id']:<32}{row['rating']:>8.2f}  {bootstrap:>18}  {order:>18}  "
+              f"{row.get('median_rank', float('nan')):>11.1f}")
+
+
+def main(data_path: str, configs: List[Dict[str, Any]], bootstrap: int, permutations: int, processes: int,
+         chunk_size: int, seed: int, confidence: float, output_path: str):
+    """
+    Sweep rating parameters and resample games, then print leaderboards with confidence intervals
+
+    Parameters:
+        data_path: Log tree to rate
+        configs: Rating configurations (see parameter_grid)
+        bootstrap: Bootstrap resamples per configuration
+        permutations: Random game orders per configuration
+        processes: Worker processes
+        chunk_size: Runs rated together by one vectorized engine
+        seed: Seed of the resampling
+        confidence: Confidence level of the intervals
+        output_path: JSON file for the results ("" = print only)
+    """
+    start = time.perf_counter()
+    corpus = EncodedGames(load_game_records(data_path))
+    print(f"Encoded {corpus.num_games} games of {corpus.num_models} models in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    results = run_sweep(corpus, configs, bootstrap, permutations, processes, chunk_size, seed)
+    runs = len(configs) * (1 + bootstrap + permutations)
+    print(f"Rated {runs} runs in {time.perf_counter() - start:.2f}s with {processes} processes")
+
+    summaries = []
+    for config, result in zip(configs, results):
+        rows = summarize(corpus, result, confidence)
+        summaries.append({"config": config, "leaderboard": rows})
+        print(f"\n{json.dumps(config)}")
+        print_summary(rows)
+
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "games": corpus.num_games,
+                "bootstrap": bootstrap,
+                "permutations": permutations,
+                "confidence": confidence,
+                "seed": seed,
+                "results": summaries
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\nResults saved to {output_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rating parameter sweeps and bootstrap confidence intervals")
+    parser.add_argument("data_path", help="Log tree to rate")
+    parser.add_argument("--bootstrap", type=int, default=200, help="Bootstrap resamples per configuration")
+    parser.add_argument("--permutations", type=int, default=100, help="Random game orders per configuration")
+    parser.add_argument("--role-balance-bonus", type=float, nargs="+", default=[115])
+    parser.add_argument("--k-max", type=float, nargs="+", default=[60.0])
+    parser.add_argument("--k-min", type=float, nargs="+", default=[5.0])
+    parser.add_argument("--tau", type=float, nargs="+", default=[2.5])
+    parser.add_argument("--weights", nargs="+", default=["0.75,0.15,0.10"],
+                        help="Performance weights win,survival,voting")
+    parser.add_argument("--expected", nargs="+", choices=["role", "team"], default=["role"],
+                        help="Expected-score method: role-based or team-average (alternative)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Runs rated together by one engine")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--output", default="", help="JSON file for the results")
+    args = parser.parse_args()
+
+    weights = [tuple(float(w) for w in value.split(",")) for value in args.weights]
+    grid = parameter_grid(args.role_balance_bonus, args.k_max, args.k_min, args.tau, weights, args.expected)
+    main(args.data_path, grid, args.bootstrap, args.permutations, args.processes, args.chunk_size, args.seed,
+         args.confidence, args.output)
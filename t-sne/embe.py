@@ -1,10 +1,17 @@
 import os
+import sys
 import json
 import requests
 import numpy as np
 import time
 from typing import List, Dict, Any
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from columnar_logs import is_columnar_store, load_statement_records
+from log_catalog import catalog_query_paths, is_catalog_query
+from undercover.agents.embeddings import CachedEmbedding, EmbeddingCache
+from undercover.agents.offline_embedding import LocalEncoderEmbedding, load_or_fit
+
 class EmbeddingGenerator:
     """Base class for embedding generators."""
     
@@ -18,6 +25,7 @@ class OpenAIEmbedding(EmbeddingGenerator):
     def __init__(self, api_key: str, model: str = "text-embedding-3-small"):
         self.api_key = api_key
         self.model = model
+        self.cache_name = f"openai:{model}"
         self.base_url = "https://api.openai.com/v1/embeddings"
     
     def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
@@ -63,6 +71,7 @@ class AnthropicEmbedding(EmbeddingGenerator):
     def __init__(self, api_key: str, model: str = "claude-3-sonnet-20240229"):
         self.api_key = api_key
         self.model = model
+        self.cache_name = f"anthropic:{model}"
         self.base_url = "https://api.anthropic.com/v1/embeddings"
     
     def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
@@ -113,15 +122,19 @@ class DummyEmbedding(EmbeddingGenerator):
         return [list(np.random.rand(self.dimensions).astype(float)) for _ in texts]
 
 def process_json_files(directory_path: str) -> List[Dict[str, Any]]:
-    """Process all JSON files in the directory and extract statements with metadata."""
+    """Extract statements with metadata from a directory of JSON logs, a columnar log store or a catalog query."""
+    if is_columnar_store(directory_path):
+        return load_statement_records(directory_path)
+
     all_statements = []
     
-    # List all JSON files in the directory
-    json_files = [f for f in os.listdir(directory_path) if f.endswith('.json')]
+    # List all JSON files in the directory, or those selected by a catalog query (see log_catalog.py)
+    if is_catalog_query(directory_path):
+        json_files = catalog_query_paths(directory_path)
+    else:
+        json_files = [os.path.join(directory_path, f) for f in os.listdir(directory_path) if f.endswith('.json')]
     
-    for file_name in json_files:
-        file_path = os.path.join(directory_path, file_name)
-        
+    for file_path in json_files:
         with open(file_path, 'r') as file:
             data = json.load(file)
         
@@ -166,6 +179,8 @@ def main():
         json.dump(statements, file, indent=2)
     print(f"Extracted statements saved to {statements_output_path}")
     
+    texts = [item['statement'] for item in statements]
+    
     # TODO: Choose and configure your embedding provider
     # Uncomment one of the following:
     
@@ -177,13 +192,18 @@ def main():
     # api_key = os.environ.get("ANTHROPIC_API_KEY", "")
     # embedding_generator = AnthropicEmbedding(api_key=api_key)
     
+    # Offline, with a sentence-transformers model stored on disk:
+    # embedding_generator = LocalEncoderEmbedding("models/all-MiniLM-L6-v2")
+    
     # For testing:
-    embedding_generator = DummyEmbedding()
+    # embedding_generator = DummyEmbedding()
     
-    # Generate embeddings
+    # Offline, on the CPU: hashed TF-IDF + SVD, fitted on these statements the first time
+    embedding_generator = load_or_fit("models/hashing_tfidf.npz", texts)
+    
+    # Generate embeddings, caching them on disk so a rerun only embeds new statements
     print("Generating embeddings...")
-    texts = [item['statement'] for item in statements]
-    embeddings = embedding_generator.generate_embeddings(texts)
+    embeddings = CachedEmbedding(embedding_generator, EmbeddingCache("embeddings.sqlite")).generate_embeddings(texts)
     
     # Add embeddings to statements
     for i, item in enumerate(statements):
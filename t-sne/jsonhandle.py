@@ -1,21 +1,31 @@
 import os
+import sys
 import json
 import numpy as np
 from sklearn.manifold import TSNE
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from columnar_logs import is_columnar_store, load_statement_records
+from log_catalog import catalog_query_paths, is_catalog_query
+
 def process_json_files(directory_path):
     """
     Process all JSON files in the given directory, extracting statements, LLM IDs, and concepts.
+    The directory can also be a columnar log store (see columnar_logs.py) or a catalog query.
     """
+    if is_columnar_store(directory_path):
+        return load_statement_records(directory_path)
+
     all_statements = []
     
-    # List all JSON files in the directory
-    json_files = [f for f in os.listdir(directory_path) if f.endswith('.json')]
+    # List all JSON files in the directory, or those selected by a catalog query (see log_catalog.py)
+    if is_catalog_query(directory_path):
+        json_files = catalog_query_paths(directory_path)
+    else:
+        json_files = [os.path.join(directory_path, f) for f in os.listdir(directory_path) if f.endswith('.json')]
     
-    for file_name in json_files:
-        file_path = os.path.join(directory_path, file_name)
-        
+    for file_path in json_files:
         with open(file_path, 'r') as file:
             data = json.load(file)
         
@@ -0,0 +1,95 @@
+import argparse
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+from undercover.agents.local_judge import ReasonablenessClassifier, load_examples
+
+
+def train(train_path: str, model_path: str, epochs: int, learning_rate: float, l2: float) -> ReasonablenessClassifier:
+    """Train the local reasonableness judge and save it"""
+    examples = load_examples(train_path)
+    start = time.perf_counter()
+    model = ReasonablenessClassifier().fit(examples, epochs=epochs, learning_rate=learning_rate, l2=l2)
+    print(f"Trained on {len(examples)} examples in {time.perf_counter() - start:.2f}s "
+          f"({len(model.weights)} active features)")
+    model.save(model_path)
+    print(f"Model saved to {model_path}")
+    return model
+
+
+def evaluate(model: ReasonablenessClassifier, examples: List[Tuple[str, str, int]],
+             repeats: int = 20) -> Dict[str, Any]:
+    """
+    Accuracy of the judge on labeled examples, and its throughput
+
+    "Unreasonable" (label 0) is the class that eliminates a player, so its precision
+    and recall are reported separately. Throughput is measured over `repeats` passes.
+    """
+    predictions = [1 if model.is_reasonable(word, sentence) else 0 for word, sentence, _ in examples]
+    labels = [label for _, _, label in examples]
+
+    caught = sum(1 for p, l in zip(predictions, labels) if p == 0 and l == 0)
+    rejected = sum(1 for p in predictions if p == 0)
+    unreasonable = sum(1 for l in labels if l == 0)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for word, sentence, _ in examples:
+            model.predict_proba(word, sentence)
+    seconds = time.perf_counter() - start
+    judged = repeats * len(examples)
+
+    return {
+        "examples": len(examples),
+        "accuracy": sum(1 for p, l in zip(predictions, labels) if p == l) / len(examples),
+        "majority_baseline_accuracy": max(unreasonable, len(examples) - unreasonable) / len(examples),
+        "unreasonable_precision": caught / rejected if rejected else 0.0,
+        "unreasonable_recall": caught / unreasonable if unreasonable else 0.0,
+        "statements_per_second": judged / seconds if seconds > 0 else float("inf"),
+        "microseconds_per_statement": seconds / judged * 1e6
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and evaluate the local reasonableness judge")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = subparsers.add_parser("train", help="Train on a JSONL file and save the model")
+    train_parser.add_argument("--train", default="data/train.jsonl", help="Training examples")
+    train_parser.add_argument("--model", default="models/reasonableness.json", help="Model file to write")
+    train_parser.add_argument("--test", default="data/test.jsonl", help="Examples to evaluate on after training")
+    train_parser.add_argument("--epochs", type=int, default=20)
+    train_parser.add_argument("--learning-rate", type=float, default=0.3)
+    train_parser.add_argument("--l2", type=float, default=1e-4)
+
+    eval_parser = subparsers.add_parser("eval", help="Evaluate a saved model")
+    eval_parser.add_argument("--model", default="models/reasonableness.json", help="Model file")
+    eval_parser.add_argument("--test", default="data/test.jsonl", help="Labeled examples")
+    eval_parser.add_argument("--output", default="", help="JSON file for the results")
+
+    args = parser.parse_args()
+
+    if args.command == "train":
+        model = train(args.train, args.model, args.epochs, args.learning_rate, args.l2)
+        output = ""
+    else:
+        model = ReasonablenessClassifier.load(args.model)
+        output = args.output
+
+    results = evaluate(model, load_examples(args.test))
+    print(f"Accuracy on {results['examples']} examples: {results['accuracy']:.1%} "
+          f"(majority class: {results['majority_baseline_accuracy']:.1%})")
+    print(f"Unreasonable statements: precision {results['unreasonable_precision']:.1%}, "
+          f"recall {results['unreasonable_recall']:.1%}")
+    print(f"Throughput: {results['statements_per_second']:,.0f} statements/s "
+          f"({results['microseconds_per_statement']:.1f} µs per statement)")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# cassette.py
+
+import contextlib
+import contextvars
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+_active_cassette: contextvars.ContextVar = contextvars.ContextVar("active_cassette", default=None)
+
+
+class CassetteMissError(RuntimeError):
+    """Raised when a replayed game makes a request that was not recorded"""
+    pass
+
+
+class Cassette:
+    """
+    Record/replay transport for the LLM requests of one game
+
+    In "record" mode every request/response pair that goes through call_api is stored
+    together with its latency. In "replay" mode the responses are served from the file
+    with a synthetic latency and no network call is made, which makes a game run fully
+    offline and deterministic (together with a seeded UndercoverGame).
+
+    Requests are matched by a content hash of (model, messages, temperature, max_tokens).
+    Identical requests are replayed in the order they were recorded. Prompts themselves
+    are not stored, which keeps cassettes small; a ".gz" path is gzip-compressed.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency: Union[None, float, str] = None,
+                 seed: Optional[int] = None):
+        """
+        Parameters:
+            path: Cassette file (.json or .json.gz)
+            mode: "record" or "replay"
+            latency: Synthetic latency used in replay mode:
+                     None (no delay), a number of seconds (fixed delay),
+                     "recorded" (each response's own recorded latency) or
+                     "sampled" (random draw from all recorded latencies)
+            seed: Seed for "sampled" latency
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if latency is not None and not isinstance(latency, (int, float)) and latency not in ("recorded", "sampled"):
+            raise ValueError(f"Unknown cassette latency: {latency}")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.interactions: List[Dict] = []
+
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._queues: Dict[str, Deque[Dict]] = defaultdict(deque)
+
+        if mode == "replay":
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def make_key(request: Dict) -> str:
+        """Content hash of a chat.completions request"""
+        payload = json.dumps(
+            [request["model"], request["messages"], request["temperature"], request["max_tokens"]],
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def record(self, request: Dict, response: str, latency: float):
+        """Store one request/response pair"""
+        with self._lock:
+            self.interactions.append({
+                "key": self.make_key(request),
+                "model": request["model"],
+                "response": response,
+                "latency": round(latency, 4),
+            })
+
+    def replay(self, request: Dict) -> Tuple[str, float]:
+        """
+        Serve the next recorded response for a request
+
+        Returns:
+            Tuple[str, float]: Recorded response and the synthetic delay (seconds) to apply
+
+        Raises:
+            CassetteMissError: If the request was not recorded (or all its recordings were used)
+        """
+        key = self.make_key(request)
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise CassetteMissError(f"Request {key[:12]} for model {request['model']} is not in cassette {self.path}")
+            interaction = queue.popleft()
+
+            if self.latency is None:
+                delay = 0.0
+            elif self.latency == "recorded":
+                delay = interaction["latency"]
+            elif self.latency == "sampled":
+                delay = self._rng.choice(self.interactions)["latency"]
+            else:
+                delay = float(self.latency)
+
+        return interaction["response"], delay
+
+    def save(self):
+        """Write the recorded interactions to the cassette file"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        data = json.dumps({"version": 1, "interactions": self.interactions}, ensure_ascii=False, separators=(",", ":"))
+        opener = gzip.open if self.path.endswith(".gz") else open
+        with opener(self.path, "wt", encoding="utf-8") as f:
+            f.write(data)
+
+    def _load(self):
+        opener = gzip.open if self.path.endswith(".gz") else open
+        with opener(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.interactions = data["interactions"]
+        for interaction in self.interactions:
+            self._queues[interaction["key"]].append(interaction)
+
+
+def active_cassette() -> Optional[Cassette]:
+    """The cassette active in the current context, if any"""
+    return _active_cassette.get()
+
+
+@contextlib.contextmanager
+def use_cassette(path: str, mode: str = "replay", latency: Union[None, float, str] = None,
+                 seed: Optional[int] = None):
+    """
+    Route every call_api / acall_api request in this context through a cassette
+
+    The cassette is bound to the current context (thread or task), so concurrent games in
+    one process each use their own cassette. Recorded cassettes are saved on exit.
+
+    Example usage:
+        with use_cassette("cassettes/game_1.json.gz", mode="record"):
+            game.run_game()
+    """
+    cassette = Cassette(path, mode, latency, seed)
+    token = _active_cassette.set(cassette)
+    try:
+        yield cassette
+    finally:
+        _active_cassette.reset(token)
+        if mode == "record":
+            cassette.save()
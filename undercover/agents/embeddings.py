@@ -0,0 +1,226 @@
+# embeddings.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Persistent content-addressed cache of text embeddings, backed by SQLite
+
+    Entries are keyed on a hash of (embedding model, text), so a statement embedded in
+    one game is never sent to the embedding API again by any later game. Vectors are
+    stored as float32. The cache is safe to share between threads.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters:
+            path: SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT,"
+            " vector BLOB NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Content hash of an embedding request"""
+        return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors of the texts that have one, by text"""
+        keys = {self.make_key(model, text): text for text in texts}
+        found = {}
+        with self._lock:
+            items = list(keys)
+            # Stay under SQLite's limit on query parameters
+            for start in range(0, len(items), 500):
+                chunk = items[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, vector in rows:
+                    found[keys[key]] = np.frombuffer(vector, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, np.ndarray]):
+        """Store the vectors of several texts"""
+        now = time.time()
+        rows = [
+            (self.make_key(model, text), model, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for text, vector in vectors.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, created_at) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RemoteEmbedding:
+    """
+    Embeddings from an OpenAI-compatible embeddings endpoint
+
+    Requests go through the process-wide client of the endpoint (see llm_client.get_client),
+    so batches reuse pooled connections.
+    """
+
+    def __init__(self, api_key: Optional[str], base_url: Optional[str], model: str = "text-embedding-v4",
+                 dimensions: int = 1024, batch_size: int = 10):
+        """
+        Parameters:
+            api_key: API key of the endpoint
+            base_url: Base URL of the endpoint
+            model: Embedding model
+            dimensions: Requested vector size
+            batch_size: Texts per request
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.dimensions = dimensions
+        self.batch_size = batch_size
+        self.cache_name = f"{model}:{dimensions}"
+
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, batch_size texts per request"""
+        # Imported here so the offline embeddings do not need the openai package
+        from undercover.agents.llm_client import get_client
+
+        client = get_client(self.api_key, self.base_url)
+        embeddings = []
+        for start in range(0, len(texts), self.batch_size):
+            completion = client.embeddings.create(
+                model=self.model,
+                input=texts[start:start + self.batch_size],
+                dimensions=self.dimensions,
+                encoding_format="float"
+            )
+            embeddings.extend(data.embedding for data in completion.data)
+        return embeddings
+
+
+class CachedEmbedding:
+    """
+    Wrap an embedding generator with an in-memory cache and an optional on-disk EmbeddingCache
+
+    Only texts found in neither cache are passed to the generator, in one call.
+    """
+
+    def __init__(self, generator, cache: Optional[EmbeddingCache] = None):
+        """
+        Parameters:
+            generator: Object with generate_embeddings(texts) -> List[List[float]] (and
+                       optionally a cache_name identifying its model)
+            cache: Shared on-disk cache (None = in-memory only)
+        """
+        self.generator = generator
+        self.cache = cache
+        self.cache_name = getattr(generator, "cache_name", type(generator).__name__)
+        self._memory: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Vectors of the texts, as a (len(texts), dimensions) float32 matrix"""
+        with self._lock:
+            vectors = {text: self._memory[text] for text in texts if text in self._memory}
+
+        missing = [text for text in dict.fromkeys(texts) if text not in vectors]
+        if missing and self.cache is not None:
+            vectors.update(self.cache.get_many(self.cache_name, missing))
+            missing = [text for text in missing if text not in vectors]
+
+        if missing:
+            generated = {
+                text: np.asarray(vector, dtype=np.float32)
+                for text, vector in zip(missing, self.generator.generate_embeddings(missing))
+            }
+            if len(generated) != len(missing):
+                raise ValueError(f"Expected {len(missing)} embeddings, got {len(generated)}")
+            if self.cache is not None:
+                self.cache.put_many(self.cache_name, generated)
+            vectors.update(generated)
+
+        with self._lock:
+            self._memory.update(vectors)
+        return np.vstack([vectors[text] for text in texts])
+
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Same interface as the wrapped generator"""
+        return self.embed(texts).tolist() if texts else []
+
+
+class NoveltyIndex:
+    """
+    Incremental index of the statements of one game, for novelty checks
+
+    Each statement is embedded once and kept, normalized, as a row of a matrix, so the
+    similarity of a new statement to the whole history is one matrix-vector product
+    instead of re-embedding every past statement. Added statements are embedded lazily,
+    together with the next query, so a check costs at most one embedding request and a
+    failed request leaves them queued for the next check.
+    """
+
+    def __init__(self, embedding: CachedEmbedding):
+        self.embedding = embedding
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+        self._pending: List[str] = []
+
+    def __len__(self) -> int:
+        return self._size + len(self._pending)
+
+    def add(self, text: str):
+        """Append a statement to the index"""
+        self._pending.append(text)
+
+    def max_similarity(self, text: str) -> float:
+        """Highest cosine similarity between a statement and the indexed statements (0 when empty)"""
+        if len(self) == 0:
+            return 0.0
+        vectors = self._normalized(self._pending + [text])
+        for vector in vectors[:-1]:
+            self._append(vector)
+        self._pending = []
+        return float(np.max(self._matrix[:self._size] @ vectors[-1]))
+
+    def _append(self, vector: np.ndarray):
+        if self._size == self._matrix.shape[0]:
+            # Grow geometrically so appends stay amortized O(1)
+            grown = np.zeros((max(8, 2 * self._size), vector.shape[0]), dtype=np.float32)
+            if self._size:
+                grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        self._matrix[self._size] = vector
+        self._size += 1
+
+    def _normalized(self, texts: List[str]) -> np.ndarray:
+        vectors = self.embedding.embed(texts)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
@@ -1,18 +1,69 @@
 import random
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from undercover.judge import Judge
-from undercover.agents.utils import call_api, llm_set
+from undercover.agents.utils import call_api, acall_api, llm_set
+from undercover.agents.retry import RetryPolicy
 from undercover.agents.json_validator import safe_parse_json
 
+JUDGE_METRICS = ("novelty", "relevance", "reasonableness")
+
+
+def parse_round_scores(ret: str, statements: List[Dict[str, Any]]) -> List[Optional[Tuple[float, float, float]]]:
+    """
+    Scores of each statement in a round-batch judge response
+
+    Entries are matched to the statements by player_id, or by position when an entry has
+    no usable ID. A statement without a complete entry (all three scores between 0 and 1)
+    gets None.
+
+    Parameters:
+        ret: The judge's response
+        statements: The statements of the round, as passed to evaluate_round
+
+    Returns:
+        List of (novelty, relevance, reasonableness) tuples or None, in statement order
+    """
+    scores: List[Optional[Tuple[float, float, float]]] = [None] * len(statements)
+    ret_json, error = safe_parse_json(ret)
+    if error:
+        print(f"JSON parsing error: {error}")
+    entries = ret_json.get("evaluations") if isinstance(ret_json, dict) else ret_json
+    if not isinstance(entries, list):
+        return scores
+
+    positions = {item["player_id"]: index for index, item in enumerate(statements)}
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        player_id = str(entry.get("player_id", "")).lower().replace("player_", "").strip()
+        index = positions.get(int(player_id)) if player_id.isdigit() else None
+        if index is None:
+            index = position if position < len(statements) else None
+        if index is None or scores[index] is not None:
+            continue
+
+        try:
+            values = tuple(entry[metric]["score"] for metric in JUDGE_METRICS)
+        except (KeyError, TypeError):
+            continue
+        if all(isinstance(v, (int, float)) and not isinstance(v, bool) and 0 <= v <= 1 for v in values):
+            scores[index] = values
+    return scores
+
 class LLMJudge(Judge):
     """
     LLM-based implementation of game judge
     Uses an LLM to evaluate player statements and calculate metrics
     """
+    # Attempts per LLM call, with jittered backoff between them
+    retry_policy = RetryPolicy(max_attempts=5)
+
     def __init__(self, judge_id: str, judge_version: str, language: str):
         super().__init__(judge_id, judge_version, language)
+        # Statements a round-batch response left out, evaluated again one by one
+        self.round_fallbacks = 0
         if language == "zh":
             from undercover.agents.prompts import judge_prompt_zh
             self.prompt = judge_prompt_zh
@@ -37,51 +88,132 @@ class LLMJudge(Judge):
         # Build prompt for evaluation
         # round_history = game_state.get("round_history", {})
 
-        retry_count = 0
-        max_retries = 5
-        while retry_count < max_retries:
-            try:
-                llm_info = {
-                    "model": self.judge_id,
-                    "temperature": llm_set["temperature"],
-                    "max_tokens": llm_set["max_tokens"],
-                    "input_messages": [
-                        {"role": "system", "content": self.prompt.system_judge()},
-                        {"role": "user", "content": self.prompt.user_judge(word1, word2, statement, statement_history)}
-                    ]
-                }
-
-                """
-                Output format:
-
-                {
-                    "novelty": {
-                    "score": (0, 0.2, 0.4, 0.6, 0.8, 1),
-                    "explanation": ""
-                    },
-                    "relevance": {
-                    "score": (0, 0.2, 0.4, 0.6, 0.8, 1),
-                    "explanation": ""
-                    },
-                    "reasonableness": {
-                    "score": (0, 0.2, 0.4, 0.6, 0.8, 1),
-                    "explanation": ""
-                    }
-                }
-                
-                """
-
-                ret = call_api(llm_info)
-                ret_json, error = safe_parse_json(ret)
-                if error:
-                    print(f"JSON parsing error: {error}")
-                novelty_score = ret_json["novelty"]["score"]
-                relevance_score = ret_json["relevance"]["score"]
-                reasonableness_score = ret_json["reasonableness"]["score"]
-
-                return novelty_score, relevance_score, reasonableness_score
-            except Exception as e:
-                retry_count += 1
-                if retry_count == max_retries:
-                    print(f"\nWrong judge response:\n{ret}\n")
-                    raise e
+        ret = None
+
+        def attempt():
+            nonlocal ret
+            ret = call_api(self._judge_request(statement_history, statement, word1, word2))
+            return self._parse_scores(ret)
+
+        try:
+            return self.retry_policy.call(attempt)
+        except Exception:
+            print(f"\nWrong judge response:\n{ret}\n")
+            raise
+
+    async def aevaluate_statement(self, statement_history, statement, word1, word2):
+        """Async version of evaluate_statement, awaiting the LLM call instead of blocking"""
+        ret = None
+
+        async def attempt():
+            nonlocal ret
+            ret = await acall_api(self._judge_request(statement_history, statement, word1, word2))
+            return self._parse_scores(ret)
+
+        try:
+            return await self.retry_policy.acall(attempt)
+        except Exception:
+            print(f"\nWrong judge response:\n{ret}\n")
+            raise
+
+    def evaluate_round(self, statements):
+        """
+        Evaluate every statement of a round in one LLM call
+
+        Statements that the response leaves out or scores incompletely, or all of them when
+        the round call fails, are evaluated again one by one with evaluate_statement.
+        """
+        try:
+            ret = self.retry_policy.call(lambda: call_api(self._round_request(statements)))
+            scores = parse_round_scores(ret, statements)
+        except Exception as e:
+            print(f"Judge {self.judge_id}: round evaluation failed: {str(e)}")
+            scores = [None] * len(statements)
+        for index in self._missing_scores(scores):
+            item = statements[index]
+            scores[index] = self.evaluate_statement(item["history"], item["statement"], item["word1"], item["word2"])
+        return scores
+
+    async def aevaluate_round(self, statements):
+        """Async version of evaluate_round"""
+        try:
+            ret = await self.retry_policy.acall(lambda: acall_api(self._round_request(statements)))
+            scores = parse_round_scores(ret, statements)
+        except Exception as e:
+            print(f"Judge {self.judge_id}: round evaluation failed: {str(e)}")
+            scores = [None] * len(statements)
+        for index in self._missing_scores(scores):
+            item = statements[index]
+            scores[index] = await self.aevaluate_statement(item["history"], item["statement"],
+                                                           item["word1"], item["word2"])
+        return scores
+
+    def _missing_scores(self, scores) -> List[int]:
+        """Positions of the statements a round-batch response (or failed round call) did not score"""
+        missing = [index for index, score in enumerate(scores) if score is None]
+        if missing:
+            self.round_fallbacks += len(missing)
+            print(f"Judge {self.judge_id}: {len(missing)} statements without round scores, evaluating them one by one")
+        return missing
+
+    def _round_request(self, statements) -> Dict[str, Any]:
+        """Build the llm_info for a round-batch evaluation (the history is the one before the round)"""
+        if hasattr(self.prompt, "user_judge_round"):
+            user_judge_round = self.prompt.user_judge_round
+        else:
+            from undercover.agents.prompts import judge_prompt_en
+            user_judge_round = judge_prompt_en.user_judge_round
+        return {
+            "model": self.judge_id,
+            "temperature": llm_set["temperature"],
+            # Room for one evaluation per statement, up to a cap the provider accepts
+            "max_tokens": min(llm_set["max_tokens"] * len(statements), llm_set.get("round_max_tokens", 4096)),
+            "input_messages": [
+                {"role": "system", "content": self.prompt.system_judge()},
+                {"role": "user", "content": user_judge_round(statements, statements[0]["history"])}
+            ]
+        }
+
+    def _judge_request(self, statement_history, statement, word1, word2) -> Dict[str, Any]:
+        """Build the llm_info for a statement evaluation"""
+        llm_info = {
+            "model": self.judge_id,
+            "temperature": llm_set["temperature"],
+            "max_tokens": llm_set["max_tokens"],
+            "input_messages": [
+                {"role": "system", "content": self.prompt.system_judge()},
+                {"role": "user", "content": self.prompt.user_judge(word1, word2, statement, statement_history)}
+            ]
+        }
+
+        """
+        Output format:
+
+        {
+            "novelty": {
+            "score": (0, 0.2, 0.4, 0.6, 0.8, 1),
+            "explanation": ""
+            },
+            "relevance": {
+            "score": (0, 0.2, 0.4, 0.6, 0.8, 1),
+            "explanation": ""
+            },
+            "reasonableness": {
+            "score": (0, 0.2, 0.4, 0.6, 0.8, 1),
+            "explanation": ""
+            }
+        }
+        
+        """
+        return llm_info
+
+    def _parse_scores(self, ret: str):
+        """Parse a judge response into (novelty, relevance, reasonableness) scores"""
+        ret_json, error = safe_parse_json(ret)
+        if error:
+            print(f"JSON parsing error: {error}")
+        novelty_score = ret_json["novelty"]["score"]
+        relevance_score = ret_json["relevance"]["score"]
+        reasonableness_score = ret_json["reasonableness"]["score"]
+
+        return novelty_score, relevance_score, reasonableness_score
@@ -0,0 +1,134 @@
+# llm_client.py
+
+import asyncio
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+from openai import OpenAI, AsyncOpenAI
+
+from undercover.compat import nullcontext
+
+# Settings shared by every client created in this process. The SDK does not retry on its
+# own: failed calls are retried by the agents' RetryPolicy, which charges every retry to the
+# game's RetryBudget
+client_set = {"timeout": 120.0, "max_retries": 0}
+
+_clients: Dict[Tuple[Optional[str], Optional[str]], OpenAI] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[Optional[str], Optional[str]], AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+# Process-wide cap on in-flight async requests, see configure_async_concurrency()
+_async_limit: Optional[int] = None
+_async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def get_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> OpenAI:
+    """
+    Get the process-wide synchronous client for an endpoint.
+
+    One client is created per (api_key, base_url) and reused by every thread, so all
+    statements, votes and judge evaluations share one HTTP connection pool with keep-alive
+    instead of paying a new TLS handshake per call. The client is thread-safe.
+
+    Parameters:
+        api_key: API key (None lets the SDK read OPENAI_API_KEY)
+        base_url: Base URL of an OpenAI-compatible endpoint (None lets the SDK read OPENAI_BASE_URL)
+
+    Returns:
+        OpenAI: Shared client
+    """
+    key = (api_key, base_url)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = OpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    timeout=client_set["timeout"],
+                    max_retries=client_set["max_retries"],
+                )
+                _clients[key] = client
+    return client
+
+
+def get_async_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Get the shared asynchronous client for an endpoint.
+
+    Async connection pools are bound to the event loop that created them, so one client
+    is kept per (event loop, api_key, base_url). Every coroutine on the same loop shares it.
+    Must be called from inside a running event loop.
+
+    Parameters:
+        api_key: API key (None lets the SDK read OPENAI_API_KEY)
+        base_url: Base URL of an OpenAI-compatible endpoint (None lets the SDK read OPENAI_BASE_URL)
+
+    Returns:
+        AsyncOpenAI: Shared client for the running loop
+    """
+    loop = asyncio.get_running_loop()
+    key = (api_key, base_url)
+    with _clients_lock:
+        loop_clients = _async_clients.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=client_set["timeout"],
+                max_retries=client_set["max_retries"],
+            )
+            loop_clients[key] = client
+    return client
+
+
+def configure_async_concurrency(limit: Optional[int] = None):
+    """
+    Cap the number of async LLM requests in flight at once.
+
+    Every acall_api request takes a slot from one semaphore per event loop, so hundreds of
+    concurrent AsyncUndercoverGame instances never open more than `limit` connections.
+
+    Parameters:
+        limit: Maximum concurrent requests per event loop (None = unlimited)
+    """
+    global _async_limit
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be at least 1")
+    with _clients_lock:
+        _async_limit = limit
+        _async_semaphores.clear()
+
+
+def async_request_slot():
+    """
+    Async context manager that holds one request slot of the running event loop.
+
+    Returns a no-op context manager when no limit is configured.
+    """
+    if _async_limit is None:
+        return nullcontext()
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        semaphore = _async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(_async_limit)
+            _async_semaphores[loop] = semaphore
+    return semaphore
+
+
+def close_clients():
+    """
+    Close every shared synchronous client and forget all clients.
+
+    Async clients are dropped together with their event loop; call this after changing
+    client_set or the endpoint configuration so new clients pick it up.
+    """
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        _async_clients.clear()
@@ -0,0 +1,141 @@
+# local_judge.py
+
+import json
+import math
+import os
+import random
+import re
+import zlib
+from typing import Dict, List, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_WORD_RE = re.compile(r"Word:\s*(.*)")
+_SENTENCE_RE = re.compile(r"Sentence:\s*(.*)")
+
+
+def parse_example(row: Dict) -> Tuple[str, str, int]:
+    """
+    (word, sentence, label) of one chat-format reasonableness example, as in data/train.jsonl
+
+    The label is 1 when the sentence reasonably describes the word and 0 otherwise.
+    """
+    messages = row["messages"]
+    user = next(message["content"] for message in messages if message["role"] == "user")
+    answer = next(message["content"] for message in messages if message["role"] == "assistant")
+    word = _WORD_RE.search(user).group(1).strip()
+    sentence = _SENTENCE_RE.search(user).group(1).strip()
+    return word, sentence, 1 if answer.strip().startswith("1") else 0
+
+
+def load_examples(path: str) -> List[Tuple[str, str, int]]:
+    """All examples of a JSONL file"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [parse_example(json.loads(line)) for line in f if line.strip()]
+
+
+class ReasonablenessClassifier:
+    """
+    Local judge of whether a sentence reasonably describes a word
+
+    A logistic regression over hashed binary features: the words and word pairs of the
+    sentence, the judged word, and the cross of the judged word with each sentence word
+    (so it learns what is typically said about a word). Training takes a few seconds on
+    a CPU and a prediction a few microseconds, with no dependency beyond the standard
+    library. The model is stored as a small JSON file.
+    """
+
+    def __init__(self, buckets: int = 2 ** 20, threshold: float = 0.5):
+        """
+        Parameters:
+            buckets: Size of the hashed feature space
+            threshold: Probability of "reasonable" below which a sentence is rejected
+        """
+        self.buckets = buckets
+        self.threshold = threshold
+        self.bias = 0.0
+        self.weights: Dict[int, float] = {}
+
+    def features(self, word: str, sentence: str) -> List[int]:
+        """Hashed feature indices of a (word, sentence) pair"""
+        word = word.strip().lower()
+        tokens = _TOKEN_RE.findall(sentence.lower())
+        names = [f"w:{word}"]
+        names.extend(f"s:{token}" for token in tokens)
+        names.extend(f"b:{a}_{b}" for a, b in zip(["<s>"] + tokens, tokens + ["</s>"]))
+        names.extend(f"x:{word}|{token}" for token in tokens)
+        return list({zlib.crc32(name.encode("utf-8")) % self.buckets for name in names})
+
+    def predict_proba(self, word: str, sentence: str) -> float:
+        """Probability that the sentence reasonably describes the word"""
+        weights = self.weights
+        score = self.bias + sum(weights.get(index, 0.0) for index in self.features(word, sentence))
+        return _sigmoid(score)
+
+    def is_reasonable(self, word: str, sentence: str) -> bool:
+        return self.predict_proba(word, sentence) >= self.threshold
+
+    def fit(self, examples: List[Tuple[str, str, int]], epochs: int = 20, learning_rate: float = 0.3,
+            l2: float = 1e-4, seed: int = 0) -> "ReasonablenessClassifier":
+        """
+        Train on (word, sentence, label) examples with AdaGrad
+
+        The classes are weighted inversely to their frequency, since unreasonable
+        sentences are the rare class the judge exists to catch.
+        """
+        positives = sum(label for _, _, label in examples)
+        negatives = len(examples) - positives
+        class_weight = {
+            1: len(examples) / (2 * positives) if positives else 1.0,
+            0: len(examples) / (2 * negatives) if negatives else 1.0,
+        }
+
+        encoded = [(self.features(word, sentence), label) for word, sentence, label in examples]
+        squared_gradients: Dict[int, float] = {}
+        bias_squared_gradient = 0.0
+        rng = random.Random(seed)
+
+        for _ in range(epochs):
+            rng.shuffle(encoded)
+            for indices, label in encoded:
+                score = self.bias + sum(self.weights.get(index, 0.0) for index in indices)
+                gradient = (_sigmoid(score) - label) * class_weight[label]
+
+                bias_squared_gradient += gradient * gradient
+                self.bias -= learning_rate * gradient / (math.sqrt(bias_squared_gradient) + 1e-12)
+                for index in indices:
+                    weight = self.weights.get(index, 0.0)
+                    step = gradient + l2 * weight
+                    squared_gradients[index] = squared_gradients.get(index, 0.0) + step * step
+                    self.weights[index] = weight - learning_rate * step / (math.sqrt(squared_gradients[index]) + 1e-12)
+        return self
+
+    def save(self, path: str):
+        """Write the model to a JSON file"""
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "buckets": self.buckets,
+                "threshold": self.threshold,
+                "bias": self.bias,
+                "weights": {str(index): round(weight, 6) for index, weight in self.weights.items()
+                            if abs(weight) >= 1e-6}
+            }, f)
+
+    @classmethod
+    def load(cls, path: str) -> "ReasonablenessClassifier":
+        """Read a model written by save()"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        model = cls(data["buckets"], data["threshold"])
+        model.bias = data["bias"]
+        model.weights = {int(index): weight for index, weight in data["weights"].items()}
+        return model
+
+
+def _sigmoid(score: float) -> float:
+    if score >= 0:
+        return 1.0 / (1.0 + math.exp(-score))
+    exp = math.exp(score)
+    return exp / (1.0 + exp)
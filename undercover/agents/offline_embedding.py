@@ -0,0 +1,211 @@
+# offline_embedding.py
+
+import hashlib
+import os
+import re
+import zlib
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class HashingTfidfEmbedding:
+    """
+    Offline sentence embeddings: hashed TF-IDF features reduced with a truncated SVD (LSA)
+
+    Features are the words, word pairs and character trigrams of a text (trigrams also
+    cover languages written without spaces), hashed into a fixed number of buckets. After
+    fit() on a corpus, texts are weighted by IDF and projected onto the top singular
+    vectors of the corpus; before fit(), they are projected with a fixed random Gaussian
+    matrix, which preserves cosine similarities approximately. Runs on a CPU with NumPy
+    only, and embeds texts in batches.
+    """
+
+    def __init__(self, dimensions: int = 256, buckets: int = 2 ** 15, batch_size: int = 256, seed: int = 0):
+        """
+        Parameters:
+            dimensions: Size of the embeddings
+            buckets: Size of the hashed feature space
+            batch_size: Texts projected at once
+            seed: Seed of the random projection and of the SVD
+        """
+        self.dimensions = dimensions
+        self.buckets = buckets
+        self.batch_size = batch_size
+        self.seed = seed
+        self.idf = np.ones(buckets, dtype=np.float32)
+        self.projection = (np.random.default_rng(seed).standard_normal((buckets, dimensions))
+                           / np.sqrt(dimensions)).astype(np.float32)
+        self.fitted = False
+
+    @property
+    def cache_name(self) -> str:
+        """Identifies the model in an EmbeddingCache: a refit changes every vector"""
+        digest = hashlib.sha256(self.idf.tobytes() + self.projection.tobytes()).hexdigest()[:16]
+        return f"hashing-tfidf:{self.buckets}:{self.projection.shape[1]}:{digest}"
+
+    def features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashed feature indices of a text and their sublinear term frequencies"""
+        words = _WORD_RE.findall(text.lower())
+        names = [f"w:{word}" for word in words]
+        names.extend(f"b:{a}_{b}" for a, b in zip(words, words[1:]))
+        for word in words:
+            padded = f" {word} "
+            names.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+
+        counts = {}
+        for name in names:
+            index = zlib.crc32(name.encode("utf-8")) % self.buckets
+            counts[index] = counts.get(index, 0) + 1
+        indices = np.fromiter(counts, dtype=np.int64, count=len(counts))
+        frequencies = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        return indices, frequencies
+
+    def fit(self, texts: List[str], power_iterations: int = 2) -> "HashingTfidfEmbedding":
+        """
+        Learn the IDF weights and the SVD projection from a corpus
+
+        The SVD is a randomized range-finder SVD over the sparse TF-IDF matrix, so the
+        corpus is never held as a dense matrix.
+        """
+        if not texts:
+            raise ValueError("Cannot fit on an empty corpus")
+        encoded = [self.features(text) for text in texts]
+
+        document_frequency = np.zeros(self.buckets, dtype=np.float64)
+        for indices, _ in encoded:
+            document_frequency[indices] += 1
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        rows, cols, values = self._tfidf_matrix(encoded)
+        rank = min(self.dimensions, len(texts), self.buckets)
+        sketch = min(rank + 10, len(texts), self.buckets)
+
+        rng = np.random.default_rng(self.seed)
+        basis = _sparse_dot(rows, cols, values, rng.standard_normal((self.buckets, sketch)), len(texts))
+        for _ in range(power_iterations):
+            basis, _ = np.linalg.qr(basis)
+            basis = _sparse_dot(cols, rows, values, basis, self.buckets)
+            basis, _ = np.linalg.qr(basis)
+            basis = _sparse_dot(rows, cols, values, basis, len(texts))
+        basis, _ = np.linalg.qr(basis)
+
+        # (basis^T X)^T = X^T basis, a buckets x sketch matrix
+        projected = _sparse_dot(cols, rows, values, basis, self.buckets)
+        _, _, components = np.linalg.svd(projected.T, full_matrices=False)
+        self.projection = components[:rank].T.astype(np.float32)
+        self.fitted = True
+        return self
+
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, batch_size texts per projection"""
+        return self.embed(texts).tolist()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embeddings of the texts, as a (len(texts), dimensions) float32 matrix"""
+        embeddings = np.zeros((len(texts), self.projection.shape[1]), dtype=np.float32)
+        for start in range(0, len(texts), self.batch_size):
+            batch = [self.features(text) for text in texts[start:start + self.batch_size]]
+            rows, cols, values = self._tfidf_matrix(batch)
+            embeddings[start:start + len(batch)] = _sparse_dot(rows, cols, values, self.projection, len(batch))
+        return embeddings
+
+    def save(self, path: str):
+        """Write the fitted model to a .npz file"""
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(f, buckets=self.buckets, dimensions=self.dimensions, batch_size=self.batch_size,
+                                seed=self.seed, idf=self.idf, projection=self.projection)
+
+    @classmethod
+    def load(cls, path: str) -> "HashingTfidfEmbedding":
+        """Read a model written by save()"""
+        with np.load(path) as data:
+            model = cls.__new__(cls)
+            model.buckets = int(data["buckets"])
+            model.dimensions = int(data["dimensions"])
+            model.batch_size = int(data["batch_size"])
+            model.seed = int(data["seed"])
+            model.idf = data["idf"]
+            model.projection = data["projection"]
+            model.fitted = True
+        return model
+
+    def _tfidf_matrix(self, encoded: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sparse (rows, cols, values) TF-IDF matrix of encoded texts, with L2-normalized rows"""
+        rows, cols, values = [], [], []
+        for row, (indices, frequencies) in enumerate(encoded):
+            weights = frequencies * self.idf[indices]
+            norm = np.linalg.norm(weights)
+            rows.append(np.full(len(indices), row, dtype=np.int64))
+            cols.append(indices)
+            values.append(weights / norm if norm > 0 else weights)
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return np.concatenate(rows), np.concatenate(cols), np.concatenate(values).astype(np.float32)
+
+
+class LocalEncoderEmbedding:
+    """
+    Embeddings from a sentence-transformers encoder stored on disk
+
+    Needs the optional sentence-transformers package; the model is loaded from a local
+    directory, so no network is used.
+    """
+
+    def __init__(self, model_path: str, batch_size: int = 64, device: Optional[str] = None):
+        """
+        Parameters:
+            model_path: Directory of a sentence-transformers model
+            batch_size: Texts encoded at once
+            device: Torch device (None = the library's default)
+        """
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            raise ImportError("LocalEncoderEmbedding needs the sentence-transformers package")
+        self.model_path = model_path
+        self.batch_size = batch_size
+        self.model = SentenceTransformer(model_path, device=device)
+        self.cache_name = f"local-encoder:{os.path.basename(os.path.normpath(model_path))}"
+
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, batch_size texts per forward pass"""
+        if not texts:
+            return []
+        return self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True).tolist()
+
+
+def load_or_fit(model_path: str, texts: Optional[List[str]] = None, **kwargs) -> HashingTfidfEmbedding:
+    """The model saved at model_path, fitted on texts and saved there first if it does not exist"""
+    if os.path.exists(model_path):
+        return HashingTfidfEmbedding.load(model_path)
+    model = HashingTfidfEmbedding(**kwargs).fit(texts or [])
+    model.save(model_path)
+    return model
+
+
+def _sparse_dot(out_index: np.ndarray, in_index: np.ndarray, values: np.ndarray,
+                dense: np.ndarray, rows: int, chunk: int = 1 << 16) -> np.ndarray:
+    """
+    Product of a sparse matrix, given as (out_index, in_index, values) triplets, with a dense matrix
+
+    Passing (rows, cols) multiplies the matrix itself, and (cols, rows) its transpose.
+    """
+    result = np.zeros((rows, dense.shape[1]), dtype=np.float64)
+    for start in range(0, len(values), chunk):
+        order = np.argsort(out_index[start:start + chunk], kind="stable") + start
+        targets = out_index[order]
+        products = values[order, None] * dense[in_index[order]]
+        # Sum the products of each output row in one pass over contiguous segments
+        boundaries = np.flatnonzero(np.r_[True, targets[1:] != targets[:-1]])
+        result[targets[boundaries]] += np.add.reduceat(products, boundaries, axis=0)
+    return result
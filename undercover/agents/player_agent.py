@@ -3,7 +3,8 @@ import json
 from typing import List, Dict, Any, Optional, Tuple
 
 from undercover.player import Player
-from undercover.agents.utils import call_api, llm_set
+from undercover.agents.utils import call_api, acall_api, llm_set
+from undercover.agents.retry import RetryPolicy
 from undercover.agents.json_validator import safe_parse_json
 
 class LLMPlayer(Player):
@@ -11,6 +12,9 @@ class LLMPlayer(Player):
     LLM-based player implementation
     Uses an LLM to generate statements and voting decisions
     """
+    # Attempts per LLM call, with jittered backoff between them
+    retry_policy = RetryPolicy(max_attempts=3)
+
     def __init__(self, player_id: int, llm_id: str, language: str):
         super().__init__(player_id, llm_id, language)
         if language == "zh":
@@ -35,45 +39,54 @@ class LLMPlayer(Player):
         """
         # Use round history from game state if available
         # statement_history = game_state.get("statement_history", {})
-        retry_count = 0
-        max_retries = 3
-
-        while retry_count < max_retries:
-            try:
-                llm_info = {
-                    "model": self.llm_id,
-                    "temperature": llm_set["temperature"],
-                    "max_tokens": llm_set["max_tokens"],
-                    "input_messages": [
-                        {"role": "system", "content": self.prompt.system_speak_player()},
-                        {"role": "user", "content": self.prompt.user_speak_player(self.player_id, self.assigned_concept, statement_history, self.last_analyze, "")}
-                    ]
-                }
-
-                """
-                ======================= PROMPT =======================
-                User input (4 neccesary): 
-                player_id, assigned_concept, statement_history, last_analyze, *alive_players* (not for speak)
-
-                Output format:
-                {
-                    "identity": "",
-                    "strategy": "",
-                    "statement": ""
-                }
-                =====================================================
-                """
-
-                ret = call_api(llm_info)
-                ret_json, error = safe_parse_json(ret)
-                if error:
-                    print(f"JSON parsing error: {error}")
-                self.last_analyze = ret_json.get('identity', '')
-                return ret_json.get('statement', '')
-            except Exception as e:
-                retry_count += 1
-                if retry_count == max_retries:
-                    raise e
+        def attempt():
+            ret = call_api(self._statement_request(statement_history))
+            return self._parse_statement(ret)
+
+        return self.retry_policy.call(attempt)
+
+    async def agenerate_statement(self, statement_history) -> str:
+        """Async version of generate_statement, awaiting the LLM call instead of blocking"""
+        async def attempt():
+            ret = await acall_api(self._statement_request(statement_history))
+            return self._parse_statement(ret)
+
+        return await self.retry_policy.acall(attempt)
+
+    def _statement_request(self, statement_history) -> Dict[str, Any]:
+        """Build the llm_info for a statement"""
+        llm_info = {
+            "model": self.llm_id,
+            "temperature": llm_set["temperature"],
+            "max_tokens": llm_set["max_tokens"],
+            "input_messages": [
+                {"role": "system", "content": self.prompt.system_speak_player()},
+                {"role": "user", "content": self.prompt.user_speak_player(self.player_id, self.assigned_concept, statement_history, self.last_analyze, "")}
+            ]
+        }
+
+        """
+        ======================= PROMPT =======================
+        User input (4 neccesary): 
+        player_id, assigned_concept, statement_history, last_analyze, *alive_players* (not for speak)
+
+        Output format:
+        {
+            "identity": "",
+            "strategy": "",
+            "statement": ""
+        }
+        =====================================================
+        """
+        return llm_info
+
+    def _parse_statement(self, ret: str) -> str:
+        """Parse a statement response and remember the identity analysis"""
+        ret_json, error = safe_parse_json(ret)
+        if error:
+            print(f"JSON parsing error: {error}")
+        self.last_analyze = ret_json.get('identity', '')
+        return ret_json.get('statement', '')
     
     def vote(self, statement_history, active_players: List['Player']) -> Tuple[int, str]:
         """
@@ -92,53 +105,59 @@ class LLMPlayer(Player):
         # Build prompt with history context
         # prompt = _build_voting_prompt(game_state, active_players, statement_history)
 
-        retry_count = 0
-        max_retries = 3
-
-        while retry_count < max_retries:
-            try:
-                llm_info = {
-                    "model": self.llm_id,
-                    "temperature": llm_set["temperature"],
-                    "max_tokens": llm_set["max_tokens"],
-                    "input_messages": [
-                        {"role": "system", "content": self.prompt.system_vote_player()},
-                        {"role": "user", "content": self.prompt.user_vote_player(self.player_id, self.assigned_concept, statement_history, self.last_analyze, active_players)}
-                    ]
-                }
-
-                """
-                ======================= PROMPT =======================
-                User input (5 neccesary): 
-                player_id, assigned_concept, statement_history, last_analyze, alive_players
-
-                Output format:
-                {
-                    "identity": "",
-                    "strategy": "",
-                    "vote": ""
-                }
-                =====================================================
-                """
-
-
-                ret = call_api(llm_info)
-                ret_json, error = safe_parse_json(ret)
-                if error:
-                    print(f"JSON parsing error: {error}")
-                vot = ret_json.get('vote', '')
-                
-                vot = str(vot)
-                if vot.startswith("Player_") or vot.startswith("player_"):
-                    vot = vot.replace("Player_", "").replace("player_", "")
-                try:
-                    vot = int(vot)
-                except ValueError:
-                    pass
-                return vot
-            except Exception as e:
-                retry_count += 1
-                if retry_count == max_retries:
-                    raise e
+        def attempt():
+            ret = call_api(self._vote_request(statement_history, active_players))
+            return self._parse_vote(ret)
+
+        return self.retry_policy.call(attempt)
+
+    async def avote(self, statement_history, active_players: List['Player']) -> Tuple[int, str]:
+        """Async version of vote, awaiting the LLM call instead of blocking"""
+        async def attempt():
+            ret = await acall_api(self._vote_request(statement_history, active_players))
+            return self._parse_vote(ret)
 
+        return await self.retry_policy.acall(attempt)
 
+    def _vote_request(self, statement_history, active_players: List['Player']) -> Dict[str, Any]:
+        """Build the llm_info for a vote"""
+        llm_info = {
+            "model": self.llm_id,
+            "temperature": llm_set["temperature"],
+            "max_tokens": llm_set["max_tokens"],
+            "input_messages": [
+                {"role": "system", "content": self.prompt.system_vote_player()},
+                {"role": "user", "content": self.prompt.user_vote_player(self.player_id, self.assigned_concept, statement_history, self.last_analyze, active_players)}
+            ]
+        }
+
+        """
+        ======================= PROMPT =======================
+        User input (5 neccesary): 
+        player_id, assigned_concept, statement_history, last_analyze, alive_players
+
+        Output format:
+        {
+            "identity": "",
+            "strategy": "",
+            "vote": ""
+        }
+        =====================================================
+        """
+        return llm_info
+
+    def _parse_vote(self, ret: str):
+        """Parse a vote response into a player ID (the raw value if it is not a number)"""
+        ret_json, error = safe_parse_json(ret)
+        if error:
+            print(f"JSON parsing error: {error}")
+        vot = ret_json.get('vote', '')
+        
+        vot = str(vot)
+        if vot.startswith("Player_") or vot.startswith("player_"):
+            vot = vot.replace("Player_", "").replace("player_", "")
+        try:
+            vot = int(vot)
+        except ValueError:
+            pass
+        return vot
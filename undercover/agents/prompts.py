@@ -297,11 +297,42 @@ class judge_prompt_en:
         # Player information:
         Player's word: "{word1}"
         The other word in this game: "{word2}"
+
+        # Historical statements:
+        {history}
+
         Player's statement: "{statement}"
 
+        """
+        return p
+
+    def user_judge_round(statements, history):
+        statement_lines = "\n        ".join(
+            f'{index}. Player_{item["player_id"]} (player\'s word: "{item["word1"]}", the other word in this game: "{item["word2"]}"): "{item["statement"]}"'
+            for index, item in enumerate(statements, 1)
+        )
+        p = f"""
+        Please evaluate every player's statement of this round, in the order they were made.
+        Judge the novelty of each statement against the historical statements and the statements of this round made before it.
+
         # Historical statements:
         {history}
 
+        # Statements of this round:
+        {statement_lines}
+
+        # Output format:
+        Instead of a single evaluation, respond with one JSON object whose "evaluations" list has one entry per statement, in the same order:
+        {{
+        "evaluations": [
+            {{
+            "player_id": (the player's number),
+            "novelty": {{"score": (0, 0.2, 0.4, 0.6, 0.8, 1), "explanation": ""}},
+            "relevance": {{"score": (0, 0.2, 0.4, 0.6, 0.8, 1), "explanation": ""}},
+            "reasonableness": {{"score": (0, 0.2, 0.4, 0.6, 0.8, 1), "explanation": ""}}
+            }}
+        ]
+        }}
         """
         return p
     
@@ -605,13 +636,44 @@ class judge_prompt_zh:
         # 玩家信息：
         玩家的词语：“{word1}”
         本局游戏的另一个词语：“{word2}”
-        玩家发言：“{statement}”
 
         # 历史发言：
         {history}
 
+        玩家发言：“{statement}”
+
         """
         return p 
+
+    def user_judge_round(statements, history):
+        statement_lines = "\n        ".join(
+            f'{index}. Player_{item["player_id"]}（玩家的词语：“{item["word1"]}”，本局游戏的另一个词语：“{item["word2"]}”）：“{item["statement"]}”'
+            for index, item in enumerate(statements, 1)
+        )
+        p = f"""
+        请按发言顺序，对本轮每一位玩家的发言分别做出评价。
+        评价每条发言的新颖性时，请与历史发言以及本轮在它之前的发言进行比较。
+
+        # 历史发言：
+        {history}
+
+        # 本轮发言：
+        {statement_lines}
+
+        # 输出格式：
+        不要只输出一个评价，请输出一个JSON对象，其中"evaluations"列表按相同顺序为每条发言给出一项：
+        {{
+        "evaluations": [
+            {{
+            "player_id": （玩家编号）,
+            "novelty": {{"score": (0, 0.2, 0.4, 0.6, 0.8, 1), "explanation": ""}},
+            "relevance": {{"score": (0, 0.2, 0.4, 0.6, 0.8, 1), "explanation": ""}},
+            "reasonableness": {{"score": (0, 0.2, 0.4, 0.6, 0.8, 1), "explanation": ""}}
+            }}
+        ]
+        }}
+        """
+        return p
     
 
 
@@ -906,11 +968,12 @@ class judge_prompt_fr:
         # Informations sur le joueur :
         Mot du joueur : "{word1}"
         L'autre mot dans ce jeu : "{word2}"
-        Déclaration du joueur : "{statement}"
 
         # Déclarations historiques :
         {history}
 
+        Déclaration du joueur : "{statement}"
+
         """
         return p
     
@@ -1202,11 +1265,12 @@ class judge_prompt_ru:
         # Информация об игроке:
         Слово игрока: "{word1}"
         Другое слово в этой игре: "{word2}"
-        Высказывание игрока: "{statement}"
 
         # Исторические высказывания:
         {history}
 
+        Высказывание игрока: "{statement}"
+
         """
         return p
     
@@ -1510,11 +1574,12 @@ class judge_prompt_jp:
         # プレイヤー情報：
         プレイヤーの単語：「{word1}」
         このゲームのもう一つの単語：「{word2}」
-        プレイヤーの発言：「{statement}」
 
         # 過去の発言：
         {history}
 
+        プレイヤーの発言：「{statement}」
+
         """
         return p
     
@@ -1817,11 +1882,12 @@ class judge_prompt_ar:
         # معلومات اللاعب:
         كلمة اللاعب: "{word1}"
         الكلمة الأخرى في هذه اللعبة: "{word2}"
-        تصريح اللاعب: "{statement}"
 
         # التصريحات السابقة:
         {history}
 
+        تصريح اللاعب: "{statement}"
+
         """
         return p
     
@@ -2126,11 +2192,12 @@ class judge_prompt_es:
         # Información del jugador:
         Palabra del jugador: "{word1}"
         La otra palabra en este juego: "{word2}"
-        Declaración del jugador: "{statement}"
 
         # Declaraciones históricas:
         {history}
 
+        Declaración del jugador: "{statement}"
+
         """
         return p
     
@@ -2434,11 +2501,12 @@ class judge_prompt_de:
         # Spielerinformationen:
         Wort des Spielers: "{word1}"
         Das andere Wort in diesem Spiel: "{word2}"
-        Aussage des Spielers: "{statement}"
 
         # Historische Aussagen:
         {history}
 
+        Aussage des Spielers: "{statement}"
+
         """
         return p
     
@@ -2740,11 +2808,12 @@ class judge_prompt_it:
         # Informazioni sul giocatore:
         Parola del giocatore: "{word1}"
         L'altra parola in questo gioco: "{word2}"
-        Dichiarazione del giocatore: "{statement}"
 
         # Dichiarazioni storiche:
         {history}
 
+        Dichiarazione del giocatore: "{statement}"
+
         """
         return p
     
@@ -3048,10 +3117,11 @@ class judge_prompt_pt:
         # Informações do jogador:
         Palavra do jogador: "{word1}"
         A outra palavra neste jogo: "{word2}"
-        Declaração do jogador: "{statement}"
 
         # Declarações históricas:
         {history}
 
+        Declaração do jogador: "{statement}"
+
         """
         return p
\ No newline at end of file
@@ -0,0 +1,243 @@
+# rate_limiter.py
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate
+
+    Callers reserve what they need up front. The balance may go negative, and each caller
+    waits until its own reservation is covered, so waiting callers are served in arrival
+    order without holding a lock while they sleep.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Parameters:
+            per_minute: Refill rate (requests or tokens per minute)
+            capacity: Largest burst; defaults to ten seconds' worth of the rate
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, per_minute / 6.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take `amount` from the bucket and return the seconds to wait before using it"""
+        self._refill(now)
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def credit(self, amount: float, now: float):
+        """Give back tokens that were reserved but not used"""
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class ModelLimiter:
+    """
+    Request and token budget of one model, shared by every thread and coroutine
+
+    Besides the requests/minute and tokens/minute buckets, the limiter keeps an adaptive
+    backoff: a 429 or 5xx answer blocks new requests to the model for the backoff period
+    (or the server's Retry-After), doubling it on each further failure and halving it
+    on each success.
+    """
+
+    def __init__(self, model: str, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                 base_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.model = model
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self.backoff = 0.0
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.waiting = 0
+        self.max_waiting = 0
+        self.sent = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.wait_seconds = 0.0
+
+    def reserve(self, estimated_tokens: int) -> float:
+        """Reserve one request and its estimated tokens; returns the seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self.blocked_until - now)
+            if self.requests is not None:
+                wait = max(wait, self.requests.reserve(1, now))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.reserve(estimated_tokens, now))
+            if wait > 0:
+                self.waiting += 1
+                self.max_waiting = max(self.max_waiting, self.waiting)
+                self.wait_seconds += wait
+            self.sent += 1
+            return wait
+
+    def done_waiting(self):
+        with self._lock:
+            self.waiting -= 1
+
+    def success(self, estimated_tokens: int, used_tokens: Optional[int]):
+        """Settle the token reservation with the real usage and relax the backoff"""
+        with self._lock:
+            if self.tokens is not None and used_tokens is not None:
+                self.tokens.credit(estimated_tokens - used_tokens, time.monotonic())
+            self.backoff = self.backoff / 2 if self.backoff / 2 >= self.base_backoff else 0.0
+
+    def failure(self, status: int, retry_after: Optional[float] = None):
+        """Back off after a 429 or 5xx answer"""
+        with self._lock:
+            if status == 429:
+                self.throttled += 1
+            else:
+                self.server_errors += 1
+            self.backoff = min(self.max_backoff, max(self.base_backoff, self.backoff * 2))
+            delay = max(self.backoff, retry_after or 0.0)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queued": self.waiting,
+                "max_queued": self.max_waiting,
+                "requests": self.sent,
+                "throttled": self.throttled,
+                "server_errors": self.server_errors,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "backoff_seconds": self.backoff,
+            }
+
+
+class RateLimiter:
+    """
+    Per-model request scheduler for call_api / acall_api
+
+    Each model gets its own ModelLimiter, built from the limits configured for it (or the
+    default limits). A 429 or 5xx answer is recorded and starts the model's backoff, then
+    the error is raised to the caller's RetryPolicy, whose retry waits out that backoff.
+
+    Example usage:
+        limiter = RateLimiter({"gpt-4o": {"rpm": 500, "tpm": 30000}}, default={"rpm": 60})
+        response = limiter.call(request, lambda: client.chat.completions.create(**request))
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None,
+                 default: Optional[Dict[str, float]] = None, base_backoff: float = 1.0, max_backoff: float = 60.0):
+        """
+        Parameters:
+            limits: {model: {"rpm": requests per minute, "tpm": tokens per minute}}
+            default: Limits for models not listed in `limits` (None = only backoff, no quota)
+            base_backoff: First backoff after a failure, in seconds
+            max_backoff: Longest backoff, in seconds
+        """
+        self.limits = limits or {}
+        self.default = default or {}
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._models: Dict[str, ModelLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, model: str) -> ModelLimiter:
+        """The shared limiter of a model"""
+        with self._lock:
+            limiter = self._models.get(model)
+            if limiter is None:
+                config = self.limits.get(model, self.default)
+                limiter = ModelLimiter(model, config.get("rpm"), config.get("tpm"),
+                                       self.base_backoff, self.max_backoff)
+                self._models[model] = limiter
+            return limiter
+
+    def call(self, request: Dict, send: Callable[[], Any]) -> Any:
+        """Send a request through the model's limiter; a 429/5xx answer starts the backoff and is raised"""
+        limiter = self.limiter(request["model"])
+        estimated = estimate_tokens(request)
+        wait = limiter.reserve(estimated)
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            finally:
+                limiter.done_waiting()
+        try:
+            response = send()
+        except Exception as e:
+            self._record_failure(limiter, e)
+            raise
+        limiter.success(estimated, _used_tokens(response))
+        return response
+
+    async def acall(self, request: Dict, send: Callable[[], Awaitable[Any]]) -> Any:
+        """Async version of call"""
+        limiter = self.limiter(request["model"])
+        estimated = estimate_tokens(request)
+        wait = limiter.reserve(estimated)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                limiter.done_waiting()
+        try:
+            response = await send()
+        except Exception as e:
+            self._record_failure(limiter, e)
+            raise
+        limiter.success(estimated, _used_tokens(response))
+        return response
+
+    @staticmethod
+    def _record_failure(limiter: ModelLimiter, error: Exception):
+        """Back the model off after a 429 or 5xx answer"""
+        status = _status_code(error)
+        if status is not None and (status == 429 or status >= 500):
+            limiter.failure(status, _retry_after(error))
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and throttling counters per model"""
+        with self._lock:
+            models = dict(self._models)
+        return {model: limiter.metrics() for model, limiter in models.items()}
+
+
+def estimate_tokens(request: Dict) -> int:
+    """Rough token count of a request (about 4 characters per token) plus its completion budget"""
+    chars = 0
+    for message in request["messages"]:
+        content = message.get("content")
+        chars += len(content) if isinstance(content, str) else len(str(content))
+    return chars // 4 + (request.get("max_tokens") or 0)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    return getattr(error, "status_code", None)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _used_tokens(response) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
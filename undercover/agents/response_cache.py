@@ -0,0 +1,178 @@
+# response_cache.py
+
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+_active_occurrences: contextvars.ContextVar = contextvars.ContextVar("active_cache_occurrences", default=None)
+
+
+class CacheMissError(RuntimeError):
+    """Raised in replay-only mode when a request has no cached response"""
+    pass
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of LLM responses, backed by SQLite
+
+    Entries are keyed on a content hash of (model, messages, temperature, max_tokens).
+    Because games sample at a non-zero temperature, the same prompt asked twice in one
+    game (e.g. an agent retrying after an unparsable answer) is stored as separate
+    occurrences of that key. Occurrences are counted per game inside a
+    use_cache_occurrences() block (per process outside one), and an index is only
+    used up once a response is served or stored, so a failed call does not shift the
+    later ones. A re-run of the same game therefore walks through the same recorded
+    responses in the same order, however its games are scheduled.
+
+    The cache is safe to share between threads.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_entries: Optional[int] = None,
+                 replay_only: bool = False):
+        """
+        Open (or create) a response cache
+
+        Parameters:
+            path: SQLite database file
+            ttl: Seconds after which an entry is treated as missing (None = never expires)
+            max_entries: Maximum number of stored responses; least recently used entries are evicted
+            replay_only: Raise CacheMissError on a miss instead of calling the API
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.replay_only = replay_only
+
+        self.hits = 0
+        self.misses = 0
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT NOT NULL,"
+            " occurrence INTEGER NOT NULL,"
+            " model TEXT,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (key, occurrence))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+
+    @staticmethod
+    def make_key(model: str, messages, temperature: float, max_tokens: int) -> str:
+        """Content hash of the request fields that determine a response"""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _occurrences(self) -> Dict[str, int]:
+        """Occurrence counters of the game running in the current context (or of the process)"""
+        occurrences = _active_occurrences.get()
+        return self._seen if occurrences is None else occurrences
+
+    def next_occurrence(self, key: str) -> int:
+        """Occurrence index for the next request with this key; claimed by get() on a hit or by put()"""
+        with self._lock:
+            return self._occurrences().get(key, 0)
+
+    def _claim(self, key: str, occurrence: int):
+        """Mark an occurrence index as used (caller holds the lock)"""
+        occurrences = self._occurrences()
+        occurrences[key] = max(occurrences.get(key, 0), occurrence + 1)
+
+    def get(self, key: str, occurrence: int = 0) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Returns:
+            str or None: The cached response, or None on a miss (expired entries count as misses)
+
+        Raises:
+            CacheMissError: On a miss in replay-only mode
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ? AND occurrence = ?",
+                (key, occurrence),
+            ).fetchone()
+
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ? AND occurrence = ?", (key, occurrence))
+                row = None
+
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._claim(key, occurrence)
+                self._conn.execute(
+                    "UPDATE responses SET last_used = ? WHERE key = ? AND occurrence = ?",
+                    (now, key, occurrence),
+                )
+
+        if row is None:
+            if self.replay_only:
+                raise CacheMissError(f"No cached response for request {key[:12]} (occurrence {occurrence})")
+            return None
+        return row[0]
+
+    def put(self, key: str, occurrence: int, model: str, response: str):
+        """Store a response, claim its occurrence index and evict least recently used entries beyond max_entries"""
+        now = time.time()
+        with self._lock:
+            self._claim(key, occurrence)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, occurrence, model, response, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, occurrence, model, response, now, now),
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE rowid IN ("
+                    " SELECT rowid FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
+
+
+@contextlib.contextmanager
+def use_cache_occurrences():
+    """
+    Count response cache occurrences separately for the game running in this context
+
+    Example usage:
+        with use_cache_occurrences():
+            game.run_game()
+    """
+    token = _active_occurrences.set({})
+    try:
+        yield
+    finally:
+        _active_occurrences.reset(token)
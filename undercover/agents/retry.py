@@ -0,0 +1,148 @@
+# retry.py
+
+import asyncio
+import contextlib
+import contextvars
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from openai import APIConnectionError
+
+from undercover.agents.cassette import CassetteMissError
+from undercover.agents.response_cache import CacheMissError
+
+# Backoff settings shared by every RetryPolicy that does not set its own
+retry_set = {"base_delay": 0.5, "max_delay": 20.0, "multiplier": 2.0}
+
+_active_budget: contextvars.ContextVar = contextvars.ContextVar("active_retry_budget", default=None)
+
+# HTTP statuses worth asking again: timeout, conflict, rate limit and server errors
+RETRYABLE_STATUS = {408, 409, 429}
+
+
+class RetryBudget:
+    """
+    Number of retries one game may spend across all of its LLM calls
+
+    A flaky endpoint then costs a few extra requests, while a dead one still fails the
+    game quickly instead of stalling every call through its full backoff schedule.
+    The budget is shared by the judge worker threads and tasks of the game.
+    """
+
+    def __init__(self, max_retries: int):
+        self.max_retries = max_retries
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def consume(self) -> bool:
+        """Take one retry from the budget; False when it is used up"""
+        with self._lock:
+            if self.used >= self.max_retries:
+                return False
+            self.used += 1
+            return True
+
+
+def active_retry_budget() -> Optional[RetryBudget]:
+    """The retry budget of the game running in the current context, if any"""
+    return _active_budget.get()
+
+
+@contextlib.contextmanager
+def use_retry_budget(max_retries: Optional[int]):
+    """
+    Give every retry policy in this context a shared budget of max_retries retries
+
+    Example usage:
+        with use_retry_budget(20) as budget:
+            game.run_game()
+        print(budget.used)
+    """
+    budget = RetryBudget(max_retries) if max_retries is not None else None
+    token = _active_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _active_budget.reset(token)
+
+
+class RetryPolicy:
+    """
+    Retry a single LLM call with jittered exponential backoff
+
+    The n-th retry waits a random time between 0 and
+    min(max_delay, base_delay * multiplier ** (n - 1)) ("full jitter"), so calls that
+    failed together do not retry together. Errors that cannot succeed on a second try
+    (client errors, cassette or cache misses) are raised at once, and every retry is
+    charged to the retry budget of the current game, if one is active.
+
+    Example usage:
+        policy = RetryPolicy(max_attempts=3)
+        statement = policy.call(lambda: parse(call_api(llm_info)))
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None, multiplier: Optional[float] = None):
+        """
+        Parameters:
+            max_attempts: Attempts per call, including the first one
+            base_delay: Upper bound of the first backoff, in seconds (default retry_set)
+            max_delay: Upper bound of any backoff, in seconds (default retry_set)
+            multiplier: Growth of the backoff bound per retry (default retry_set)
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self._rng = random.Random()
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Whether a failed attempt is worth repeating"""
+        if isinstance(error, (CassetteMissError, CacheMissError)):
+            return False
+        if isinstance(error, (APIConnectionError, ConnectionError, TimeoutError)):
+            return True
+        status = getattr(error, "status_code", None)
+        if status is not None:
+            return status in RETRYABLE_STATUS or status >= 500
+        # Unparsable or invalid model answers: the next sample may be fine
+        return True
+
+    def delay(self, retry: int) -> float:
+        """Backoff before the given retry (1 = first retry)"""
+        base_delay = self.base_delay if self.base_delay is not None else retry_set["base_delay"]
+        max_delay = self.max_delay if self.max_delay is not None else retry_set["max_delay"]
+        multiplier = self.multiplier if self.multiplier is not None else retry_set["multiplier"]
+        return self._rng.uniform(0, min(max_delay, base_delay * multiplier ** (retry - 1)))
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return False
+        budget = active_retry_budget()
+        return budget is None or budget.consume()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run fn, retrying failed attempts; the last error is raised when retries run out"""
+        attempt = 1
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+            time.sleep(self.delay(attempt))
+            attempt += 1
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async version of call; fn returns a new awaitable for each attempt"""
+        attempt = 1
+        while True:
+            try:
+                return await fn()
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+            await asyncio.sleep(self.delay(attempt))
+            attempt += 1
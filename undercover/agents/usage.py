@@ -0,0 +1,123 @@
+# usage.py
+
+import contextlib
+import contextvars
+import threading
+from typing import Any, Dict, List, Optional
+
+_active_log: contextvars.ContextVar = contextvars.ContextVar("active_usage_log", default=None)
+
+
+def cached_prompt_tokens(usage) -> int:
+    """
+    Prompt tokens a provider served from its prompt cache, as reported in a response's usage
+
+    Reads the OpenAI field (prompt_tokens_details.cached_tokens) and the names used by
+    other OpenAI-compatible providers; 0 when the provider reports none.
+    """
+    if usage is None:
+        return 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    if cached is None:
+        cached = getattr(usage, "prompt_cache_hit_tokens", None)  # DeepSeek
+    if cached is None:
+        cached = getattr(usage, "cache_read_input_tokens", None)  # Anthropic-style usage
+    return cached or 0
+
+
+class UsageLog:
+    """
+    Token usage of every LLM call sent to the API during one game (or one batch)
+
+    Each call is kept with its prompt, cached prompt and completion tokens and its
+    latency, so the effect of provider-side prompt caching can be measured. Calls
+    served from the response cache or a cassette never reach the API and are not logged.
+
+    The log is shared by the judge worker threads and tasks of a game.
+    """
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, model: str, usage, latency: float):
+        """Add one API call"""
+        call = {
+            "model": model,
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "cached_tokens": cached_prompt_tokens(usage),
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+            "latency": round(latency, 3)
+        }
+        with self._lock:
+            self.calls.append(call)
+
+    def merge(self, other: "UsageLog"):
+        """Add the calls of another log (e.g. of a finished game to the log of its batch)"""
+        with other._lock:
+            calls = list(other.calls)
+        with self._lock:
+            self.calls.extend(calls)
+
+    def totals(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Usage per model
+
+        Returns:
+            Dict: {model: {"calls", "prompt_tokens", "cached_tokens", "cache_hit_rate",
+                           "completion_tokens", "calls_with_cache_hit",
+                           "mean_latency_cache_hit", "mean_latency_cache_miss"}}
+        """
+        with self._lock:
+            calls = list(self.calls)
+
+        totals = {}
+        for model in sorted({call["model"] for call in calls}):
+            model_calls = [call for call in calls if call["model"] == model]
+            hits = [call["latency"] for call in model_calls if call["cached_tokens"] > 0]
+            misses = [call["latency"] for call in model_calls if call["cached_tokens"] == 0]
+            prompt_tokens = sum(call["prompt_tokens"] for call in model_calls)
+            cached_tokens = sum(call["cached_tokens"] for call in model_calls)
+            totals[model] = {
+                "calls": len(model_calls),
+                "prompt_tokens": prompt_tokens,
+                "cached_tokens": cached_tokens,
+                "cache_hit_rate": cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+                "completion_tokens": sum(call["completion_tokens"] for call in model_calls),
+                "calls_with_cache_hit": len(hits),
+                "mean_latency_cache_hit": sum(hits) / len(hits) if hits else None,
+                "mean_latency_cache_miss": sum(misses) / len(misses) if misses else None
+            }
+        return totals
+
+    def to_record(self, include_calls: bool = False) -> Dict[str, Any]:
+        """Form stored in a game record: the totals per model, and every call if include_calls is set"""
+        record = {"totals": self.totals()}
+        if include_calls:
+            with self._lock:
+                record["calls"] = list(self.calls)
+        return record
+
+
+def active_usage_log() -> Optional[UsageLog]:
+    """The usage log of the game running in the current context, if any"""
+    return _active_log.get()
+
+
+@contextlib.contextmanager
+def use_usage_log():
+    """
+    Log the token usage of every API call made in this context
+
+    Example usage:
+        with use_usage_log() as usage:
+            game.run_game()
+        print(usage.totals())
+    """
+    log = UsageLog()
+    token = _active_log.set(log)
+    try:
+        yield log
+    finally:
+        _active_log.reset(token)
@@ -1,6 +1,7 @@
 # utils.py
 
 from openai import OpenAI
+import asyncio
 import random
 import itertools
 import time
@@ -10,9 +11,16 @@ from datetime import datetime
 import csv
 from typing import List, Dict, Optional
 import os
+import hashlib
 import requests
 from openai import AzureOpenAI
 
+from undercover.agents.llm_client import get_client, get_async_client, async_request_slot
+from undercover.agents.response_cache import ResponseCache, CacheMissError
+from undercover.agents.cassette import active_cassette, use_cassette, CassetteMissError
+from undercover.agents.rate_limiter import RateLimiter
+from undercover.agents.usage import active_usage_log
+
 llm_set = {"temperature": 0.6, "max_tokens": 1024, "top_p": 1.0, "languadge": "en"}
 
 # Fill in your OpenAI API key here, or set the OPENAI_API_KEY environment variable.
@@ -20,6 +28,85 @@ llm_set = {"temperature": 0.6, "max_tokens": 1024, "top_p": 1.0, "languadge": "e
 OPENAI_API_KEY = None  # e.g. "sk-..."
 OPENAI_BASE_URL = None  # Set a custom base URL if using a proxy or compatible API, e.g. "https://api.example.com/v1"
 
+# Optional on-disk response cache, see configure_response_cache()
+_response_cache: Optional[ResponseCache] = None
+
+# Optional per-model rate limiter, see configure_rate_limits()
+_rate_limiter: Optional[RateLimiter] = None
+
+# How the static prompt prefix is tagged for provider-side caching, see configure_prompt_cache()
+PROMPT_CACHE_MODES = ("cache_control", "prompt_cache_key")
+_prompt_cache_mode: Optional[str] = None
+
+
+def configure_response_cache(path: Optional[str] = None, ttl: Optional[float] = None,
+                             max_entries: Optional[int] = None, replay_only: bool = False):
+    """
+    Enable or disable the persistent response cache used by call_api / acall_api.
+
+    Parameters:
+        path: SQLite file for the cache; None disables caching
+        ttl: Seconds after which a cached response expires (None = never)
+        max_entries: Maximum number of cached responses (least recently used are evicted)
+        replay_only: Fail with CacheMissError instead of calling the API on a cache miss,
+                     so a recorded run can be replayed with zero network calls
+
+    Returns:
+        ResponseCache or None: The active cache
+    """
+    global _response_cache
+    if _response_cache is not None:
+        _response_cache.close()
+    _response_cache = ResponseCache(path, ttl, max_entries, replay_only) if path else None
+    return _response_cache
+
+
+def configure_rate_limits(limits: Optional[Dict[str, Dict[str, float]]] = None,
+                          default: Optional[Dict[str, float]] = None, base_backoff: float = 1.0, max_backoff: float = 60.0,
+                          enabled: bool = True):
+    """
+    Enable or disable the shared per-model rate limiter used by call_api / acall_api.
+
+    While enabled, every request first waits for its model's requests/minute and
+    tokens/minute budget, and a 429 or 5xx answer starts an adaptive backoff that all callers
+    of the model respect (the failed call itself is retried by the caller's RetryPolicy).
+
+    Parameters:
+        limits: {model: {"rpm": ..., "tpm": ...}}
+        default: Limits for models without an entry in `limits`
+        base_backoff: First backoff after a failure, in seconds
+        max_backoff: Longest backoff, in seconds
+        enabled: False disables the limiter
+
+    Returns:
+        RateLimiter or None: The active limiter (its metrics() report queue depth per model)
+    """
+    global _rate_limiter
+    _rate_limiter = RateLimiter(limits, default, base_backoff, max_backoff) if enabled else None
+    return _rate_limiter
+
+
+def configure_prompt_cache(mode: Optional[str] = None):
+    """
+    Choose how requests tag their static prefix for provider-side prompt caching.
+
+    Every prompt of the game starts with its system message(s), which are identical
+    across all calls of a role in every game, followed by the per-game constants and the
+    append-only history. Providers that cache prompt prefixes automatically (OpenAI,
+    DeepSeek...) need no tag; the cached tokens they report are logged either way.
+
+    Parameters:
+        mode: None (send requests unchanged),
+              "cache_control" (mark the system messages with an ephemeral cache_control
+              breakpoint, for Anthropic-style endpoints such as OpenRouter), or
+              "prompt_cache_key" (send a prompt_cache_key derived from the system messages,
+              so OpenAI routes requests with the same prefix to the same cache)
+    """
+    global _prompt_cache_mode
+    if mode is not None and mode not in PROMPT_CACHE_MODES:
+        raise ValueError(f"Unknown prompt cache mode: {mode}")
+    _prompt_cache_mode = mode
+
 
 def call_api(llm_info):
     """
@@ -55,21 +142,177 @@ def call_api(llm_info):
 
     If you do not have an OpenAI key, replace the body of this function with
     your own API call and make sure it returns a plain string.
+
+    All calls share one process-wide client (see llm_client.get_client), so requests
+    reuse pooled keep-alive connections instead of building a new client per call.
+    Inside a use_cassette() block requests are recorded to, or replayed from, the cassette.
+    """
+    request = _build_request(llm_info)
+
+    cassette = active_cassette()
+    if cassette is not None and cassette.replaying:
+        ret, delay = cassette.replay(request)
+        if delay > 0:
+            time.sleep(delay)
+        return ret
+
+    start = time.monotonic()
+    ret = _cached_completion(request)
+    if cassette is not None:
+        cassette.record(request, ret, time.monotonic() - start)
+    return ret
+
+
+async def acall_api(llm_info):
+    """
+    Async version of call_api.
+
+    Takes the same llm_info dict and returns the same string, but awaits the request on
+    the shared async client of the running event loop, so many coroutines can have calls
+    in flight over one connection pool.
+
+    Example usage:
+        response_text = await acall_api(llm_info)
     """
-    client = OpenAI(
-        api_key=OPENAI_API_KEY or os.environ.get("OPENAI_API_KEY"),
-        base_url=OPENAI_BASE_URL,  # ignored when None
-    )
+    request = _build_request(llm_info)
 
-    response = client.chat.completions.create(
-        model=llm_info["model"],
-        messages=llm_info["input_messages"],
-        temperature=llm_info.get("temperature", llm_set["temperature"]),
-        max_tokens=llm_info.get("max_tokens", llm_set["max_tokens"]),
-    )
+    cassette = active_cassette()
+    if cassette is not None and cassette.replaying:
+        ret, delay = cassette.replay(request)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return ret
 
-    ret = response.choices[0].message.content or ""
+    start = time.monotonic()
+    ret = await _acached_completion(request)
+    if cassette is not None:
+        cassette.record(request, ret, time.monotonic() - start)
+    return ret
 
+
+def _cached_completion(request):
+    """Serve a request from the response cache, or send it and cache the answer"""
+    cache = _response_cache
+    if cache is not None:
+        key, occurrence = _cache_slot(cache, request)
+        cached = cache.get(key, occurrence)
+        if cached is not None:
+            return cached
+
+    client = get_client(OPENAI_API_KEY or os.environ.get("OPENAI_API_KEY"), OPENAI_BASE_URL)
+
+    wire_request = _tag_static_prefix(request)
+
+    def send():
+        start = time.monotonic()
+        response = client.chat.completions.create(**wire_request)
+        _log_usage(request, response, time.monotonic() - start)
+        return response
+
+    limiter = _rate_limiter
+    if limiter is None:
+        response = send()
+    else:
+        response = limiter.call(request, send)
+
+    ret = extract_response_text(response.choices[0].message.content or "")
+    if cache is not None:
+        cache.put(key, occurrence, request["model"], ret)
+    return ret
+
+
+async def _acached_completion(request):
+    """Async version of _cached_completion"""
+    cache = _response_cache
+    if cache is not None:
+        key, occurrence = _cache_slot(cache, request)
+        cached = cache.get(key, occurrence)
+        if cached is not None:
+            return cached
+
+    client = get_async_client(OPENAI_API_KEY or os.environ.get("OPENAI_API_KEY"), OPENAI_BASE_URL)
+
+    wire_request = _tag_static_prefix(request)
+
+    async def send():
+        async with async_request_slot():
+            start = time.monotonic()
+            response = await client.chat.completions.create(**wire_request)
+        _log_usage(request, response, time.monotonic() - start)
+        return response
+
+    limiter = _rate_limiter
+    if limiter is None:
+        response = await send()
+    else:
+        response = await limiter.acall(request, send)
+
+    ret = extract_response_text(response.choices[0].message.content or "")
+    if cache is not None:
+        cache.put(key, occurrence, request["model"], ret)
+    return ret
+
+
+def _build_request(llm_info):
+    """Build the chat.completions.create keyword arguments from an llm_info dict"""
+    return {
+        "model": llm_info["model"],
+        "messages": llm_info["input_messages"],
+        "temperature": llm_info.get("temperature", llm_set["temperature"]),
+        "max_tokens": llm_info.get("max_tokens", llm_set["max_tokens"]),
+    }
+
+
+def _tag_static_prefix(request):
+    """
+    The request as sent to the API, with its leading system messages tagged for prompt caching
+
+    Response cache keys, cassettes and the rate limiter keep using the untagged request.
+    """
+    mode = _prompt_cache_mode
+    messages = request["messages"]
+    static = 0
+    while static < len(messages) and messages[static]["role"] == "system":
+        static += 1
+    if mode is None or static == 0:
+        return request
+
+    if mode == "prompt_cache_key":
+        prefix = json.dumps([request["model"], messages[:static]], ensure_ascii=False)
+        return {**request, "extra_body": {"prompt_cache_key": hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:32]}}
+
+    # One breakpoint at the end of the static prefix caches everything before it
+    last = messages[static - 1]
+    content = last["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    content = content[:-1] + [{**content[-1], "cache_control": {"type": "ephemeral"}}]
+    return {**request, "messages": messages[:static - 1] + [{**last, "content": content}] + messages[static:]}
+
+
+def _log_usage(request, response, latency):
+    """Add an API call to the usage log of the current game, if there is one"""
+    log = active_usage_log()
+    if log is not None:
+        log.record(request["model"], getattr(response, "usage", None), latency)
+
+
+def _cache_slot(cache, request):
+    """Cache key and occurrence index for a request"""
+    key = ResponseCache.make_key(request["model"], request["messages"], request["temperature"], request["max_tokens"])
+    return key, cache.next_occurrence(key)
+
+
+def extract_response_text(ret):
+    """
+    Strip a markdown code block wrapper (``` or ```json) from a model response.
+
+    Parameters:
+        ret: Raw text content returned by the model
+
+    Returns:
+        str: The response text without the code block wrapper
+    """
     # Extract JSON if wrapped in markdown code blocks
     if '```json' in ret:
         # Find the start and end of the JSON content
@@ -87,4 +330,3 @@ def call_api(llm_info):
             ret = ret[json_start:json_end].strip()
 
     return ret.strip()
-
@@ -0,0 +1,40 @@
+# compat.py
+
+import asyncio
+import contextvars
+import functools
+
+
+async def to_thread(func, *args, **kwargs):
+    """
+    Run a blocking function in the event loop's default executor
+
+    Same as asyncio.to_thread (Python 3.9+): the function runs in a copy of the caller's
+    context, so context variables (active cassette, usage log etc.) are visible to it.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(None, call)
+
+
+class nullcontext:
+    """
+    Context manager that does nothing, usable with both `with` and `async with`
+
+    contextlib.nullcontext only supports `async with` from Python 3.10.
+    """
+
+    def __init__(self, enter_result=None):
+        self.enter_result = enter_result
+
+    def __enter__(self):
+        return self.enter_result
+
+    def __exit__(self, *exc_info):
+        return False
+
+    async def __aenter__(self):
+        return self.enter_result
+
+    async def __aexit__(self, *exc_info):
+        return False
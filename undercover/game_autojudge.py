@@ -6,6 +6,7 @@ from typing import List, Dict, Any, Optional, Tuple
 from openai import OpenAI
 from undercover.player import Player
 from undercover.judge import Judge
+from undercover.agents.embeddings import CachedEmbedding, EmbeddingCache, NoveltyIndex, RemoteEmbedding
 from time import time
 
 class UndercoverGame:
@@ -19,7 +20,10 @@ class UndercoverGame:
                  civilian_count: int = 3,
                  undercover_count: int = 1,
                  max_statement_rounds: int = 10,
-                 statements_per_voting: int = 1):
+                 statements_per_voting: int = 1,
+                 reasonableness_judge=None,
+                 embedding=None,
+                 embedding_cache_path: Optional[str] = None):
         """
         Initialize the game
         
@@ -32,6 +36,11 @@ class UndercoverGame:
             undercover_count: Number of undercover players
             max_statement_rounds: Maximum number of statement rounds
             statements_per_voting: Number of complete statement rounds before each voting
+            reasonableness_judge: Local judge with is_reasonable(word, sentence), e.g. a
+                                  ReasonablenessClassifier (None = ask the remote model)
+            embedding: Embedding generator of the novelty check, with generate_embeddings(texts)
+                       (None = the remote text-embedding-v4 endpoint)
+            embedding_cache_path: SQLite file caching embeddings across games (None = this game only)
         """
         self.game_id = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
         self.timestamp = datetime.datetime.now().isoformat()
@@ -44,6 +53,13 @@ class UndercoverGame:
         self.undercover_count = undercover_count
         self.max_statement_rounds = max_statement_rounds
         self.statements_per_voting = statements_per_voting  # Now represents complete rounds before voting
+        self.reasonableness_judge = reasonableness_judge
+
+        # Every statement is embedded once, into this game's novelty index
+        if embedding is None:
+            embedding = RemoteEmbedding(api_key="", base_url="")
+        cache = EmbeddingCache(embedding_cache_path) if embedding_cache_path else None
+        self.novelty_index = NoveltyIndex(CachedEmbedding(embedding, cache))
         
         # Game state
         self.current_statement_round = 0
@@ -233,6 +249,7 @@ class UndercoverGame:
             self.statements.append(statement)
             self.game_record["game_process"]["statements"].append(statement)
             self.statement_history += f"Player_{player.player_id}: {statement_content}\n"
+            self.novelty_index.add(statement_content)
             
             # Eliminate player if necessary
             if should_eliminate:
@@ -274,6 +291,10 @@ class UndercoverGame:
         Returns:
             int: 1 if player should be eliminated for unreasonableness, 0 otherwise
         """
+        if self.reasonableness_judge is not None:
+            # In-process classifier, see undercover/agents/local_judge.py
+            return 0 if self.reasonableness_judge.is_reasonable(assigned_concept, statement_content) else 1
+
         def call_bailian_api(
             input_messages: Optional[List[Dict]] = None,
             temperature: float = 0.4,
@@ -345,83 +366,19 @@ class UndercoverGame:
                     assigned_concept: str, another_concept: str) -> int:
         """
         Judge if a statement has sufficient novelty (1 = eliminate, 0 = continue)
-        This function should be implemented by you
-        
+
+        The statement is compared with every earlier statement of the game through the
+        novelty index, which embeds each statement only once.
+
         Returns:
             int: 1 if player should be eliminated for low novelty, 0 otherwise
         """
         try:
-            historical_statements = []
-            if statement_history:
-                lines = statement_history.strip().split('\n')
-                for line in lines:
-                    if line.startswith('Player_') and ':' in line:
-                        
-                        statement = line.split(':', 1)[1].strip()
-                        if statement:
-                            historical_statements.append(statement)
-            
-            
-            if not historical_statements:
-                return 0
-                
-            
-            
-            all_statements = historical_statements + [statement_content]
-            
-            
-            embeddings = []
-            batch_size = 10
-            for i in range(0, len(all_statements), batch_size):
-                batch_texts = all_statements[i:i+batch_size]
-                try:
-                    client = OpenAI(
-                        api_key="",
-                        base_url=""
-                    )
-                    completion = client.embeddings.create(
-                        model="text-embedding-v4",
-                        input=batch_texts,
-                        dimensions=1024,
-                        encoding_format="float"
-                    )
-
-                    for data in completion.data:
-                        embeddings.append(np.array(data.embedding))
-                except Exception as e:
-                    
-                    return 0
-            
-            if len(embeddings) != len(all_statements):
-                return 0
-                
-
-            historical_embeddings = embeddings[:-1]
-            current_embedding = embeddings[-1]
-            
-
-            similarity_threshold = 0.5 
-            for hist_embedding in historical_embeddings:
-                
-                dot_product = np.dot(current_embedding, hist_embedding)
-                norm_current = np.linalg.norm(current_embedding)
-                norm_hist = np.linalg.norm(hist_embedding)
-                
-                if norm_current > 0 and norm_hist > 0:
-                    cosine_similarity = dot_product / (norm_current * norm_hist)
-                    
-                   
-                    if cosine_similarity > similarity_threshold:
-                        return 1  
-                        
-            return 0  
-            
+            similarity_threshold = 0.5
+            return 1 if self.novelty_index.max_similarity(statement_content) > similarity_threshold else 0
         except Exception as e:
             return 0
 
-
-
-
     def _check_win_conditions(self) -> bool:
         """Check if the game should end based on win conditions"""
         active_players = [p for p in self.players if not p.eliminated]
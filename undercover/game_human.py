@@ -1,11 +1,13 @@
 import json
 import datetime
+import os
 import random
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from openai import OpenAI
 from undercover.player import Player
 from undercover.judge import Judge
+from undercover.agents.embeddings import CachedEmbedding, EmbeddingCache, NoveltyIndex, RemoteEmbedding
 from undercover.agents.human_player import HumanPlayer
 from time import time
 
@@ -23,7 +25,9 @@ class UndercoverHumanGame:
                  civilian_count: int = 4,
                  undercover_count: int = 2,
                  max_statement_rounds: int = 10,
-                 statements_per_voting: int = 1):
+                 statements_per_voting: int = 1,
+                 embedding=None,
+                 embedding_cache_path: Optional[str] = None):
         """
         Initialize the game with human player support
 
@@ -36,6 +40,9 @@ class UndercoverHumanGame:
             undercover_count: Number of undercover players
             max_statement_rounds: Maximum number of statement rounds
             statements_per_voting: Number of complete statement rounds before each voting
+            embedding: Embedding generator of the novelty check, with generate_embeddings(texts)
+                       (None = the remote text-embedding-v4 endpoint)
+            embedding_cache_path: SQLite file caching embeddings across games (None = this game only)
         """
         self.game_id = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
         self.timestamp = datetime.datetime.now().isoformat()
@@ -49,6 +56,15 @@ class UndercoverHumanGame:
         self.max_statement_rounds = max_statement_rounds
         self.statements_per_voting = statements_per_voting
 
+        # Every statement is embedded once, into this game's novelty index
+        if embedding is None:
+            embedding = RemoteEmbedding(
+                api_key=os.environ.get("DASHSCOPE_API_KEY"),
+                base_url="https://dashscope.aliyuncs.com/compatible-mode/v1"
+            )
+        cache = EmbeddingCache(embedding_cache_path) if embedding_cache_path else None
+        self.novelty_index = NoveltyIndex(CachedEmbedding(embedding, cache))
+
         # Game state
         self.current_statement_round = 0
         self.current_voting_round = 0
@@ -292,6 +308,7 @@ class UndercoverHumanGame:
             self.statements.append(statement)
             self.game_record["game_process"]["statements"].append(statement)
             self.statement_history += f"Player_{player.player_id}: {statement_content}\n"
+            self.novelty_index.add(statement_content)
 
             # Eliminate player if necessary
             if should_eliminate:
@@ -609,7 +626,7 @@ class UndercoverHumanGame:
             while attempts < MAX_RETRIES:
                 try:
                     client = OpenAI(
-                        api_key="sk-4e354bbbd12a4a02b4c05827a6fe9f59",
+                        api_key=os.environ.get("DASHSCOPE_API_KEY"),
                         base_url="https://dashscope.aliyuncs.com/compatible-mode/v1",
                     )
                     completion = client.chat.completions.create(
@@ -671,89 +688,10 @@ class UndercoverHumanGame:
             int: 1 if player should be eliminated for low novelty, 0 otherwise
         """
         try:
-            # 提取历史陈述（从statement_history中解析）
-            # 假设历史陈述格式为 "Player_X: statement content"
-            historical_statements = []
-            if statement_history:
-                lines = statement_history.strip().split('\n')
-                for line in lines:
-                    if line.startswith('Player_') and ':' in line:
-                        # 提取陈述内容（冒号后的部分）
-                        statement = line.split(':', 1)[1].strip()
-                        if statement and statement not in ["Low novelty", "Low reasonableness"]:
-                            historical_statements.append(statement)
-
-            # Remove debug output for cleaner gameplay
-            # DEBUG: 输出novelty判断信息
-            # print(f"[DEBUG] === NOVELTY EVALUATION ===")
-            # print(f"[DEBUG] Current statement: \"{statement_content}\"")
-            # print(f"[DEBUG] Historical statements found: {len(historical_statements)}")
-            # for i, hist in enumerate(historical_statements):
-            #     print(f"[DEBUG]   {i+1}. \"{hist}\"")
-
-            # 如果没有历史陈述，则认为是新颖的
-            if not historical_statements:
-                return 0
-
-            # 为当前陈述和历史陈述生成嵌入向量
-            # 将当前陈述与所有历史陈述一起处理以保持一致性
-            all_statements = historical_statements + [statement_content]
-
-            # 生成嵌入向量
-            embeddings = []
-            batch_size = 10
-            for i in range(0, len(all_statements), batch_size):
-                batch_texts = all_statements[i:i+batch_size]
-                try:
-                    client = OpenAI(
-                        api_key="sk-4e354bbbd12a4a02b4c05827a6fe9f59",
-                        base_url="https://dashscope.aliyuncs.com/compatible-mode/v1"
-                    )
-                    completion = client.embeddings.create(
-                        model="text-embedding-v4",
-                        input=batch_texts,
-                        dimensions=1024,
-                        encoding_format="float"
-                    )
-
-                    for data in completion.data:
-                        embeddings.append(np.array(data.embedding))
-                except Exception as e:
-                    # 如果API调用失败，回退到简单的文本比较
-                    return 0
-
-            if len(embeddings) != len(all_statements):
-                return 0
-
-            # 分离历史嵌入和当前陈述嵌入
-            historical_embeddings = embeddings[:-1]
-            current_embedding = embeddings[-1]
-
-            # 计算当前陈述与历史陈述的相似度
+            # 当前陈述与本局所有历史陈述的最大余弦相似度（每条陈述只生成一次嵌入向量）
             similarity_threshold = 0.85  # 提高相似度阈值，更宽松的新颖性标准
-            max_similarity = 0.0
-            similarity_count = 0
-
-            for i, hist_embedding in enumerate(historical_embeddings):
-                # 计算余弦相似度
-                dot_product = np.dot(current_embedding, hist_embedding)
-                norm_current = np.linalg.norm(current_embedding)
-                norm_hist = np.linalg.norm(hist_embedding)
-
-                if norm_current > 0 and norm_hist > 0:
-                    cosine_similarity = dot_product / (norm_current * norm_hist)
-                    max_similarity = max(max_similarity, cosine_similarity)
-                    similarity_count += 1
-
-                else:
-                    continue
-
-            # 只有当相似度超过阈值且比较次数足够时，才认为缺乏新颖性
-            # 如果历史陈述少于2个，则更宽松地判断
-            if similarity_count >= 2 and max_similarity > similarity_threshold:
+            if self.novelty_index.max_similarity(statement_content) > similarity_threshold:
                 return 1  # 缺乏新颖性，应该淘汰
-            elif similarity_count == 1 and max_similarity > 0.85:  # 单个历史陈述时，需要更高相似度
-                return 1  # 与单个陈述高度相似，应该淘汰
 
             return 0  # 具有新颖性，继续游戏
 
@@ -0,0 +1,153 @@
+# history.py
+
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+
+# How each kind of event reads in a prompt. Prompts currently show the history in English
+# whatever the game language; add an entry here to render it in another language.
+HISTORY_TEMPLATES = {
+    "en": {
+        "round": "\n\nRound {round_number}:\n\n",
+        "statement": "Player_{player_id}: {content}\n",
+        "elimination": "Player_{player_id} was eliminated due to: {content}\n",
+        "text": "{content}",
+        "omitted": "[{count} earlier rounds omitted]\n",
+    },
+}
+
+
+@dataclass
+class HistoryEvent:
+    """One entry of the statement history"""
+    kind: str  # "round", "statement", "elimination" or "text" (history restored from plain text)
+    round_number: int
+    player_id: Optional[int] = None
+    content: str = ""
+
+
+class StatementHistory:
+    """
+    Append-only statement history of a game
+
+    The history is a list of typed events grouped by statement round. The rendered text
+    of each round is cached per language, and so is the full text until the next event
+    is appended, so prompts embed the history without rebuilding it event by event.
+    render() can also return a window over the latest rounds or a view truncated to a
+    character budget.
+    """
+
+    def __init__(self):
+        self.events: List[HistoryEvent] = []
+        self._rounds: Dict[int, List[HistoryEvent]] = {}  # Round number -> events, in order
+        self._segments: Dict[tuple, str] = {}  # (round number, language) -> rendered round
+        self._rendered: Dict[tuple, str] = {}  # (language, last_rounds, max_chars) -> rendered history
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def append(self, event: HistoryEvent):
+        """Add an event; only the caches of its round are invalidated"""
+        self.events.append(event)
+        self._rounds.setdefault(event.round_number, []).append(event)
+        for key in [key for key in self._segments if key[0] == event.round_number]:
+            del self._segments[key]
+        self._rendered.clear()
+
+    def append_round(self, round_number: int):
+        self.append(HistoryEvent("round", round_number))
+
+    def append_statement(self, round_number: int, player_id: int, content: str):
+        self.append(HistoryEvent("statement", round_number, player_id, content))
+
+    def append_elimination(self, round_number: int, player_id: int, reason: str):
+        self.append(HistoryEvent("elimination", round_number, player_id, reason))
+
+    def rounds(self) -> List[int]:
+        """Round numbers present in the history, in order"""
+        return sorted(self._rounds)
+
+    def render_round(self, round_number: int, language: str = "en") -> str:
+        """One round as it reads in the history"""
+        return self._segment(round_number, language)
+
+    def statements(self, round_number: int) -> List[HistoryEvent]:
+        """The statement events of a round"""
+        return [event for event in self._rounds.get(round_number, []) if event.kind == "statement"]
+
+    def render(self, language: str = "en", last_rounds: Optional[int] = None,
+               max_chars: Optional[int] = None) -> str:
+        """
+        The history as shown in prompts
+
+        Parameters:
+            language: Language of the event templates (falls back to English)
+            last_rounds: Only show the latest rounds (None = all)
+            max_chars: Drop the oldest rounds until the text fits (the latest round is always kept)
+
+        Returns:
+            str: The rendered history, with a note on omitted rounds if any were left out
+        """
+        key = (language, last_rounds, max_chars)
+        if key not in self._rendered:
+            round_numbers = sorted(self._rounds)
+            shown = round_numbers[-last_rounds:] if last_rounds else round_numbers
+            segments = [self._segment(round_number, language) for round_number in shown]
+
+            if max_chars is not None:
+                total = sum(len(segment) for segment in segments)
+                while len(segments) > 1 and total > max_chars:
+                    total -= len(segments.pop(0))
+
+            omitted = len(round_numbers) - len(segments)
+            if omitted:
+                segments.insert(0, self._template(language, "omitted").format(count=omitted))
+            self._rendered[key] = "".join(segments)
+        return self._rendered[key]
+
+    def render_statements(self, round_number: int, language: str = "en") -> str:
+        """Only the statements of one round, one per line"""
+        template = self._template(language, "statement")
+        return "".join(template.format(player_id=event.player_id, content=event.content)
+                       for event in self.statements(round_number))
+
+    def format_statement(self, player_id: int, content: str, language: str = "en") -> str:
+        """A statement as it reads in the history"""
+        return self._template(language, "statement").format(player_id=player_id, content=content)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """JSON-serializable form of the events"""
+        return [asdict(event) for event in self.events]
+
+    @classmethod
+    def from_list(cls, events: List[Dict[str, Any]]) -> "StatementHistory":
+        """Rebuild a history from to_list()"""
+        history = cls()
+        for event in events:
+            history.append(HistoryEvent(**event))
+        return history
+
+    @classmethod
+    def from_text(cls, text: str) -> "StatementHistory":
+        """Wrap an already rendered history (e.g. from an older checkpoint) as a single event"""
+        history = cls()
+        if text:
+            history.append(HistoryEvent("text", 0, content=text))
+        return history
+
+    def _segment(self, round_number: int, language: str) -> str:
+        key = (round_number, language)
+        if key not in self._segments:
+            self._segments[key] = "".join(
+                self._template(language, event.kind).format(
+                    round_number=event.round_number, player_id=event.player_id, content=event.content)
+                for event in self._rounds[round_number]
+            )
+        return self._segments[key]
+
+    @staticmethod
+    def _template(language: str, kind: str) -> str:
+        return HISTORY_TEMPLATES.get(language, HISTORY_TEMPLATES["en"])[kind]
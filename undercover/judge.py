@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+from undercover.compat import to_thread
 
 class Judge(ABC):
     """
@@ -26,6 +27,37 @@ class Judge(ABC):
         """
         pass
     
+    async def aevaluate_statement(self, statement_history, statement, word1, word2):
+        """
+        Async version of evaluate_statement
+        The default runs evaluate_statement in a worker thread; LLM judges override it
+        with a native coroutine
+        """
+        return await to_thread(self.evaluate_statement, statement_history, statement, word1, word2)
+
+    def evaluate_round(self, statements: List[Dict[str, Any]]) -> List[Tuple[float, float, float]]:
+        """
+        Evaluate every statement of a statement round
+
+        The default evaluates the statements one by one; LLM judges override it with a
+        single call for the whole round.
+
+        Parameters:
+            statements: One dict per statement, in speaking order, with "player_id", "statement",
+                        "word1", "word2" and "history" (the statement history the player saw)
+
+        Returns:
+            List of (novelty, relevance, reasonableness) scores, in the same order
+        """
+        return [
+            self.evaluate_statement(item["history"], item["statement"], item["word1"], item["word2"])
+            for item in statements
+        ]
+
+    async def aevaluate_round(self, statements: List[Dict[str, Any]]) -> List[Tuple[float, float, float]]:
+        """Async version of evaluate_round"""
+        return await to_thread(self.evaluate_round, statements)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert judge information to a dictionary for JSON serialization"""
         return {
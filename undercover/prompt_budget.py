@@ -0,0 +1,166 @@
+# prompt_budget.py
+
+import math
+import re
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from undercover.history import StatementHistory
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+_encodings: Dict[str, Any] = {}
+_encodings_lock = threading.Lock()
+
+
+def _encoding(model: Optional[str]):
+    """tiktoken encoding of a model (cl100k_base for models tiktoken does not know)"""
+    key = model or ""
+    with _encodings_lock:
+        if key not in _encodings:
+            try:
+                _encodings[key] = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("cl100k_base")
+            except KeyError:
+                _encodings[key] = tiktoken.get_encoding("cl100k_base")
+        return _encodings[key]
+
+
+def tokenizer_name(model: Optional[str] = None) -> str:
+    """Name of the tokenizer count_tokens() uses"""
+    if TIKTOKEN_AVAILABLE:
+        return f"tiktoken:{_encoding(model).name}"
+    return "estimate:chars/4"
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Count the tokens of a text locally
+
+    Uses tiktoken when it is installed, otherwise estimates 4 characters per token.
+    """
+    if TIKTOKEN_AVAILABLE:
+        return len(_encoding(model).encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def extractive_summary(round_number: int, round_text: str, words_per_statement: int = 12) -> str:
+    """
+    Local summary of one round: the opening words of each statement, and every elimination
+
+    Parameters:
+        round_number: The round
+        round_text: The round as rendered in the history
+        words_per_statement: Words kept from each statement
+    """
+    lines = []
+    for line in round_text.splitlines():
+        line = line.strip()
+        match = re.match(r"(Player_\d+): (.*)", line)
+        if match:
+            words = match.group(2).split()
+            suffix = " ..." if len(words) > words_per_statement else ""
+            lines.append(f"{match.group(1)}: {' '.join(words[:words_per_statement])}{suffix}")
+        elif line and not line.startswith("Round "):
+            lines.append(line)
+    return f"Round {round_number}: " + " | ".join(lines)
+
+
+class HistoryBudget:
+    """
+    Token budget for the statement history embedded in player and judge prompts
+
+    While the rendered history fits in max_tokens it is passed verbatim. Beyond that the
+    last keep_rounds rounds stay verbatim and the older ones are either summarized
+    ("summary", one cached summary per round) or left out ("window"). If the summaries
+    still do not fit, the oldest are dropped; the recent rounds are always kept.
+
+    The view depends only on the events of the history, so a game replays identically.
+    """
+
+    STRATEGIES = ("summary", "window")
+
+    def __init__(self, max_tokens: int, keep_rounds: int = 2, strategy: str = "summary",
+                 model: Optional[str] = None, summarizer: Optional[Callable[[int, str], str]] = None):
+        """
+        Parameters:
+            max_tokens: Tokens the history may take in a prompt
+            keep_rounds: Latest rounds always shown verbatim
+            strategy: "summary" or "window"
+            model: Model whose tokenizer counts the tokens (None = cl100k_base)
+            summarizer: Function (round number, round text) -> summary (default extractive_summary)
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown history budget strategy: {strategy}")
+        if keep_rounds < 1:
+            # The round in progress must stay verbatim: only closed rounds are summarized
+            raise ValueError("keep_rounds must be at least 1")
+        self.max_tokens = max_tokens
+        self.keep_rounds = keep_rounds
+        self.strategy = strategy
+        self.model = model
+        self.summarizer = summarizer or extractive_summary
+        self._summaries: Dict[int, str] = {}  # Round number -> summary (rounds are closed once summarized)
+        self._views: Dict[int, tuple] = {}  # History length -> (view, tokens, truncated)
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional["HistoryBudget"]:
+        """Build a budget from a settings dict (max_tokens, keep_rounds, strategy, model), or None"""
+        if not config:
+            return None
+        return cls(**config)
+
+    def describe(self) -> Dict[str, Any]:
+        """Settings of the budget, as recorded in the game record"""
+        return {
+            "max_history_tokens": self.max_tokens,
+            "keep_rounds": self.keep_rounds,
+            "strategy": self.strategy,
+            "tokenizer": tokenizer_name(self.model)
+        }
+
+    def view(self, history: StatementHistory):
+        """
+        The history to embed in a prompt
+
+        Returns:
+            Tuple: (text, its token count, whether older rounds were summarized or left out)
+        """
+        length = len(history)
+        if length not in self._views:
+            # The previous view can no longer be asked for
+            self._views.clear()
+            self._views[length] = self._build_view(history)
+        return self._views[length]
+
+    def _build_view(self, history: StatementHistory):
+        full = history.render()
+        tokens = count_tokens(full, self.model)
+        if tokens <= self.max_tokens:
+            return full, tokens, False
+
+        round_numbers = history.rounds()
+        recent = history.render(last_rounds=self.keep_rounds) if self.strategy == "window" else \
+            "".join(history.render_round(round_number) for round_number in round_numbers[-self.keep_rounds:])
+        older = round_numbers[:-self.keep_rounds]
+
+        if self.strategy == "window" or not older:
+            return recent, count_tokens(recent, self.model), True
+
+        summaries = [self._summary(history, round_number) for round_number in older]
+        recent_tokens = count_tokens(recent, self.model)
+        while summaries:
+            text = "Summary of earlier rounds:\n" + "\n".join(summaries) + "\n" + recent
+            text_tokens = count_tokens(text, self.model)
+            if text_tokens <= self.max_tokens:
+                return text, text_tokens, True
+            summaries.pop(0)
+        return recent, recent_tokens, True
+
+    def _summary(self, history: StatementHistory, round_number: int) -> str:
+        if round_number not in self._summaries:
+            self._summaries[round_number] = self.summarizer(round_number, history.render_round(round_number))
+        return self._summaries[round_number]
@@ -1,9 +1,9 @@
-import random
 import json
 from typing import List, Dict, Any, Optional, Tuple
 
 from undercover_audience.audience import Audience
-from undercover_audience.agents.utils import call_api, llm_set
+from undercover_audience.agents.utils import call_api, acall_api, llm_set
+from undercover.agents.retry import RetryPolicy
 from undercover_audience.agents.json_validator import safe_parse_json
 
 class LLMAudience(Audience):
@@ -11,6 +11,9 @@ class LLMAudience(Audience):
     LLM-based audience implementation
     Uses an LLM to analyze player statements and choose who to eliminate
     """
+    # Attempts per LLM call, with jittered backoff between them
+    retry_policy = RetryPolicy(max_attempts=3)
+
     def __init__(self, audience_id: str, llm_id: str, language: str):
         super().__init__(audience_id, llm_id, language)
         if language == "zh":
@@ -32,62 +35,76 @@ class LLMAudience(Audience):
             active_players: List of active players
             
         Returns:
-            Tuple[int, str]: ID of player to eliminate and reasoning
+            Tuple[int, str]: ID of player to eliminate (None if no choice could be made) and reasoning
         """
-        retry_count = 0
-        max_retries = 3
+        def attempt():
+            ret = call_api(self._audience_request(statement_history, active_players))
+            return self._parse_choice(ret, active_players)
+
+        try:
+            return self.retry_policy.call(attempt)
+        except Exception as e:
+            # If all retries fail, the game chooses randomly with its seeded rng
+            return None, f"API call failed after {self.retry_policy.max_attempts} attempts: {str(e)}"
 
-        while retry_count < max_retries:
-            try:
-                llm_info = {
-                    "model": self.llm_id,
-                    "temperature": llm_set["temperature"],
-                    "max_tokens": llm_set["max_tokens"],
-                    "input_messages": [
-                        {"role": "system", "content": self.prompt.system_audience()},
-                        {"role": "user", "content": self.prompt.user_audience(statement_history, active_players)}
-                    ]
-                }
+    async def achoose_player_to_eliminate(self, statement_history: str, active_players: List['Player']) -> Tuple[int, str]:
+        """Async version of choose_player_to_eliminate, awaiting the LLM call instead of blocking"""
+        async def attempt():
+            ret = await acall_api(self._audience_request(statement_history, active_players))
+            return self._parse_choice(ret, active_players)
 
-                """
-                ======================= PROMPT =======================
-                User input (3 necessary): 
-                statement_history, last_analyze, active_players
+        try:
+            return await self.retry_policy.acall(attempt)
+        except Exception as e:
+            # If all retries fail, the game chooses randomly with its seeded rng
+            return None, f"API call failed after {self.retry_policy.max_attempts} attempts: {str(e)}"
 
-                Output format:
-                {
-                    "analysis": "",
-                    "eliminate": ""
-                }
-                =====================================================
-                """
+    def _audience_request(self, statement_history: str, active_players: List['Player']) -> Dict[str, Any]:
+        """Build the llm_info for an elimination decision"""
+        llm_info = {
+            "model": self.llm_id,
+            "temperature": llm_set["temperature"],
+            "max_tokens": llm_set["max_tokens"],
+            "input_messages": [
+                {"role": "system", "content": self.prompt.system_audience()},
+                {"role": "user", "content": self.prompt.user_audience(statement_history, active_players)}
+            ]
+        }
 
-                ret = call_api(llm_info)
-                ret_json, error = safe_parse_json(ret)
-                if error:
-                    print(f"JSON parsing error: {error}")
-                    ret_json = {}
-                
-                # Update last analysis for next round
-                reasoning = ret_json.get('analysis', '')
-                eliminate = ret_json.get('eliminate', '')
-                
-                # Parse player ID from response
-                eliminate = str(eliminate)
-                if eliminate.startswith("Player_") or eliminate.startswith("player_"):
-                    eliminate = eliminate.replace("Player_", "").replace("player_", "")
-                try:
-                    eliminate_id = int(eliminate)
-                except ValueError:
-                    # If parsing fails, randomly choose a player
-                    eliminate_id = random.choice([p.player_id for p in active_players])
-                    reasoning = "Failed to parse LLM response, choosing randomly"
-                
-                return eliminate_id, reasoning
-                
-            except Exception as e:
-                retry_count += 1
-                if retry_count == max_retries:
-                    # If all retries fail, choose randomly
-                    random_player = random.choice(active_players)
-                    return random_player.player_id, f"API call failed after {max_retries} attempts: {str(e)}"
\ No newline at end of file
+        """
+        ======================= PROMPT =======================
+        User input (3 necessary): 
+        statement_history, last_analyze, active_players
+
+        Output format:
+        {
+            "analysis": "",
+            "eliminate": ""
+        }
+        =====================================================
+        """
+        return llm_info
+
+    def _parse_choice(self, ret: str, active_players: List['Player']) -> Tuple[int, str]:
+        """Parse an elimination decision into (player ID, reasoning)"""
+        ret_json, error = safe_parse_json(ret)
+        if error:
+            print(f"JSON parsing error: {error}")
+            ret_json = {}
+        
+        # Update last analysis for next round
+        reasoning = ret_json.get('analysis', '')
+        eliminate = ret_json.get('eliminate', '')
+        
+        # Parse player ID from response
+        eliminate = str(eliminate)
+        if eliminate.startswith("Player_") or eliminate.startswith("player_"):
+            eliminate = eliminate.replace("Player_", "").replace("player_", "")
+        try:
+            eliminate_id = int(eliminate)
+        except ValueError:
+            # If parsing fails, the game chooses a player randomly
+            eliminate_id = None
+            reasoning = "Failed to parse LLM response, choosing randomly"
+        
+        return eliminate_id, reasoning
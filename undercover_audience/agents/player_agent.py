@@ -3,7 +3,8 @@ import json
 from typing import List, Dict, Any, Optional, Tuple
 
 from undercover_audience.player import Player
-from undercover_audience.agents.utils import call_api, llm_set
+from undercover_audience.agents.utils import call_api, acall_api, llm_set
+from undercover.agents.retry import RetryPolicy
 from undercover_audience.agents.json_validator import safe_parse_json
 
 class LLMPlayerAU(Player):
@@ -11,6 +12,9 @@ class LLMPlayerAU(Player):
     LLM-based player implementation
     Uses an LLM to generate statements and voting decisions
     """
+    # Attempts per LLM call, with jittered backoff between them
+    retry_policy = RetryPolicy(max_attempts=3)
+
     def __init__(self, player_id: int, llm_id: str, language: str):
         super().__init__(player_id, llm_id, language)
         if language == "zh":
@@ -35,42 +39,51 @@ class LLMPlayerAU(Player):
         """
         # Use round history from game state if available
         # statement_history = game_state.get("statement_history", {})
-        retry_count = 0
-        max_retries = 3
+        def attempt():
+            ret = call_api(self._statement_request(statement_history))
+            return self._parse_statement(ret)
+
+        return self.retry_policy.call(attempt)
+
+    async def agenerate_statement(self, statement_history) -> str:
+        """Async version of generate_statement, awaiting the LLM call instead of blocking"""
+        async def attempt():
+            ret = await acall_api(self._statement_request(statement_history))
+            return self._parse_statement(ret)
 
-        while retry_count < max_retries:
-            try:
-                llm_info = {
-                    "model": self.llm_id,
-                    "temperature": llm_set["temperature"],
-                    "max_tokens": llm_set["max_tokens"],
-                    "input_messages": [
-                        {"role": "system", "content": self.prompt.system_speak_player()},
-                        {"role": "user", "content": self.prompt.user_speak_player(self.player_id, self.assigned_concept,self.another_concept, self.role, statement_history, "")}
-                    ]
-                }
+        return await self.retry_policy.acall(attempt)
 
-                """
-                ======================= PROMPT =======================
-                User input (4 neccesary): 
-                player_id, assigned_concept, statement_history, last_analyze, *alive_players* (not for speak)
+    def _statement_request(self, statement_history) -> Dict[str, Any]:
+        """Build the llm_info for a statement"""
+        llm_info = {
+            "model": self.llm_id,
+            "temperature": llm_set["temperature"],
+            "max_tokens": llm_set["max_tokens"],
+            "input_messages": [
+                {"role": "system", "content": self.prompt.system_speak_player()},
+                {"role": "user", "content": self.prompt.user_speak_player(self.player_id, self.assigned_concept,self.another_concept, self.role, statement_history, "")}
+            ]
+        }
 
-                Output format:
-                {
-                    "identity": "",
-                    "strategy": "",
-                    "statement": ""
-                }
-                =====================================================
-                """
+        """
+        ======================= PROMPT =======================
+        User input (4 neccesary): 
+        player_id, assigned_concept, statement_history, last_analyze, *alive_players* (not for speak)
+
+        Output format:
+        {
+            "identity": "",
+            "strategy": "",
+            "statement": ""
+        }
+        =====================================================
+        """
+        return llm_info
 
-                ret = call_api(llm_info)
-                ret_json, error = safe_parse_json(ret)
-                if error:
-                    print(f"JSON parsing error: {error}")
-                self.last_analyze = ret_json.get('identity', '')
-                return ret_json.get('statement', '')
-            except Exception as e:
-                retry_count += 1
-                if retry_count == max_retries:
-                    raise e
+    def _parse_statement(self, ret: str) -> str:
+        """Parse a statement response and remember the identity analysis"""
+        ret_json, error = safe_parse_json(ret)
+        if error:
+            print(f"JSON parsing error: {error}")
+        self.last_analyze = ret_json.get('identity', '')
+        return ret_json.get('statement', '')
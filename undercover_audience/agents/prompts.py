@@ -259,13 +259,44 @@ class judge_prompt_zh:
         # 玩家信息：
         玩家的词语：“{word1}”
         本局游戏的另一个词语：“{word2}”
-        玩家发言：“{statement}”
 
         # 历史发言：
         {history}
 
+        玩家发言：“{statement}”
+
         """
         return p 
+
+    def user_judge_round(statements, history):
+        statement_lines = "\n        ".join(
+            f'{index}. Player_{item["player_id"]}（玩家的词语：“{item["word1"]}”，本局游戏的另一个词语：“{item["word2"]}”）：“{item["statement"]}”'
+            for index, item in enumerate(statements, 1)
+        )
+        p = f"""
+        请按发言顺序，对本轮每一位玩家的发言分别做出评价。
+        评价每条发言的新颖性时，请与历史发言以及本轮在它之前的发言进行比较。
+
+        # 历史发言：
+        {history}
+
+        # 本轮发言：
+        {statement_lines}
+
+        # 输出格式：
+        不要只输出一个评价，请输出一个JSON对象，其中"evaluations"列表按相同顺序为每条发言给出一项：
+        {{
+        "evaluations": [
+            {{
+            "player_id": （玩家编号）,
+            "novelty": {{"score": (0, 0.2, 0.4, 0.6, 0.8, 1), "explanation": ""}},
+            "relevance": {{"score": (0, 0.2, 0.4, 0.6, 0.8, 1), "explanation": ""}},
+            "reasonableness": {{"score": (0, 0.2, 0.4, 0.6, 0.8, 1), "explanation": ""}}
+            }}
+        ]
+        }}
+        """
+        return p
     
 
 
@@ -518,10 +549,41 @@ class judge_prompt_en:
         # Player Information:
         Player's word: "{word1}"
         The other word in this game: "{word2}"
-        Player's statement: "{statement}"
 
         # Statement History:
         {history}
 
+        Player's statement: "{statement}"
+
+        """
+        return p
+
+    def user_judge_round(statements, history):
+        statement_lines = "\n        ".join(
+            f'{index}. Player_{item["player_id"]} (player\'s word: "{item["word1"]}", the other word in this game: "{item["word2"]}"): "{item["statement"]}"'
+            for index, item in enumerate(statements, 1)
+        )
+        p = f"""
+        Please evaluate every player's statement of this round, in the order they were made.
+        Judge the novelty of each statement against the historical statements and the statements of this round made before it.
+
+        # Historical statements:
+        {history}
+
+        # Statements of this round:
+        {statement_lines}
+
+        # Output format:
+        Instead of a single evaluation, respond with one JSON object whose "evaluations" list has one entry per statement, in the same order:
+        {{
+        "evaluations": [
+            {{
+            "player_id": (the player's number),
+            "novelty": {{"score": (0, 0.2, 0.4, 0.6, 0.8, 1), "explanation": ""}},
+            "relevance": {{"score": (0, 0.2, 0.4, 0.6, 0.8, 1), "explanation": ""}},
+            "reasonableness": {{"score": (0, 0.2, 0.4, 0.6, 0.8, 1), "explanation": ""}}
+            }}
+        ]
+        }}
         """
         return p
\ No newline at end of file
@@ -0,0 +1,259 @@
+import asyncio
+from typing import List, Dict, Any, Optional
+
+from undercover_audience.game import UndercoverAudienceGame
+
+
+class AsyncUndercoverAudienceGame(UndercoverAudienceGame):
+    """
+    Asyncio version of UndercoverAudienceGame
+
+    The rules, the random draws and the game record are exactly those of
+    UndercoverAudienceGame; only the player, judge and audience calls are awaited.
+    Statements are still made one at a time (each player sees the statements before
+    theirs, see pipeline_statements for an exception), while the judges of a statement run concurrently. Many games can therefore share one event
+    loop, with llm_client.configure_async_concurrency() capping the requests in flight.
+
+    Example usage:
+        game = AsyncUndercoverAudienceGame(...)
+        await game.run_game()
+        game.save_game_record("game.json")
+    """
+
+    async def run_game(self):
+        """Run the game logic, or continue it after restore()"""
+        if not self.resumed:
+            self.setup_game()
+            self._save_checkpoint()
+
+        while not self.game_over:
+            # Phase 1: Statement Rounds
+            while self._rounds_since_voting < self.statements_per_voting:
+                # A restored game may be in the middle of a round
+                if self._round_order is None:
+                    self.current_statement_round += 1
+
+                    if self.current_statement_round > self.max_statement_rounds:
+                        self.game_over = True
+                        break
+
+                # Conduct one complete round of statements
+                if not await self._conduct_statement_round():
+                    break  # Game ended during statements
+
+                # Update round history after each round
+                self._update_round_history(self.current_statement_round)
+                self._rounds_since_voting += 1
+
+            # Phase 2: Audience Decision Round
+            if not self.game_over:
+                await self._conduct_audience_decision_round()
+                self._rounds_since_voting = 0
+
+            # Check if game should end
+            if self._check_win_conditions():
+                self.game_over = True
+
+            # Check if we've reached max rounds
+            elif self.current_statement_round >= self.max_statement_rounds:
+                self.game_over = True
+
+            self._save_checkpoint()
+
+        # Game over, update game record
+        self._update_game_record()
+
+    async def _conduct_statement_round(self) -> bool:
+        """
+        Conduct one complete round of statements where all active players make a statement
+
+        Returns:
+            bool: True if the round completed normally, False if the game ended
+        """
+        active_players = self._start_statement_round()
+
+        # Keep track of players eliminated during this round
+        players_eliminated_this_round = self._round_eliminated
+
+        if self.judge_mode == "round":
+            return await self._conduct_round_judged(active_players, players_eliminated_this_round)
+
+        speculative_statement = None
+
+        for index, player in enumerate(active_players):
+            # Skip players eliminated during this round
+            if player in players_eliminated_this_round:
+                continue
+
+            # Player generates a statement (unless it was already generated speculatively)
+            if speculative_statement is not None:
+                statement_content, speculative_statement = speculative_statement, None
+            else:
+                statement_content = await player.agenerate_statement(self._prompt_history())
+
+            # In pipelined mode the next player speaks while the judges score this statement
+            speculation = None
+            if self.pipeline_statements and index + 1 < len(active_players):
+                speculation = self._speculate_next_statement(player, statement_content, active_players[index + 1])
+
+            # Judge evaluates the statement (all judges concurrently)
+            judges_evaluations = await self._evaluate_statement_with_judges(
+                statement_content,
+                player.assigned_concept,
+                self._another_concept(player)
+            )
+
+            # Record the statement and apply any metric elimination
+            recorded = self._record_statement(player, statement_content, judges_evaluations,
+                                              players_eliminated_this_round)
+
+            if speculation is not None:
+                speculative_statement = await self._resolve_speculation(active_players[index + 1], *speculation)
+
+            if not recorded:
+                return False
+
+        self._round_order = None
+        return True
+
+    async def _conduct_round_judged(self, active_players, players_eliminated_this_round) -> bool:
+        """Round-batch judging: every player speaks, then each judge scores the whole round in one call"""
+        round_statements = []
+        for player in active_players:
+            history = self._prompt_history()
+            statement_content = await player.agenerate_statement(history)
+            self.history.append_statement(self.current_statement_round, player.player_id, statement_content)
+            round_statements.append(self._round_statement(player, statement_content, history))
+
+        evaluations = await self._evaluate_round_with_judges(round_statements)
+
+        for player, item, judges_evaluations in zip(active_players, round_statements, evaluations):
+            if not self._record_statement(player, item["statement"], judges_evaluations,
+                                          players_eliminated_this_round, batched=True):
+                # As in statement mode, the game ends here: later statements of the round are not recorded
+                break
+        self._save_checkpoint()
+
+        if self.game_over:
+            return False
+        self._round_order = None
+        return True
+
+    def _speculate_next_statement(self, player, statement_content: str, next_player):
+        """
+        Start the next player's statement as a task, on the history as it will be if this
+        statement is recorded without an elimination
+
+        Returns:
+            Tuple: (history length it assumes, speculative statement task)
+        """
+        history = self._speculative_history(player, statement_content)
+        self._speculation_base[next_player.player_id] = next_player.last_analyze
+        return len(self.history) + 1, asyncio.ensure_future(next_player.agenerate_statement(history))
+
+    async def _resolve_speculation(self, next_player, expected_events: int, task) -> Optional[str]:
+        """
+        Keep a speculative statement if the history it was generated on is the actual one
+
+        Returns:
+            str or None: The statement, or None if it was discarded and must be generated again
+        """
+        # Anything beyond the statement itself (an elimination notice) changes the history
+        if not self.game_over and len(self.history) == expected_events:
+            try:
+                return await task
+            finally:
+                del self._speculation_base[next_player.player_id]
+
+        # Discard it (and any error it raised), and undo the analysis the player kept from it
+        await asyncio.gather(task, return_exceptions=True)
+        next_player.last_analyze = self._speculation_base.pop(next_player.player_id)
+        return None
+
+    async def _evaluate_statement_with_judges(self, statement_content: str, assigned_concept: str,
+                                              another_concept: str) -> List[Dict[str, Any]]:
+        """
+        Evaluate a statement with every judge concurrently
+
+        Parameters:
+            statement_content: The player's statement
+            assigned_concept: The concept assigned to the player
+            another_concept: The other concept in this game
+
+        Returns:
+            List of judge evaluations ({"judge_id", "metrics"}), in the same order as self.judges
+        """
+        if not self.judges:
+            return []
+
+        tasks = [
+            asyncio.ensure_future(judge.aevaluate_statement(
+                self._prompt_history(),
+                statement_content,
+                assigned_concept,
+                another_concept
+            ))
+            for judge in self.judges
+        ]
+
+        try:
+            # All judges start together, so one timeout covers the whole panel
+            done, pending = await asyncio.wait(tasks, timeout=self.judge_timeout)
+            if pending:
+                late = [judge.judge_id for judge, task in zip(self.judges, tasks) if task in pending]
+                raise TimeoutError(
+                    f"Judge {late[0]} did not respond within {self.judge_timeout} seconds"
+                )
+
+            judges_evaluations = []
+            for judge, task in zip(self.judges, tasks):
+                novelty_score, relevance_score, reasonableness_score = task.result()
+
+                # Store judge evaluation with ID
+                judges_evaluations.append(
+                    self._judge_evaluation(judge, novelty_score, relevance_score, reasonableness_score)
+                )
+
+            return judges_evaluations
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _evaluate_round_with_judges(self, round_statements) -> List[List[Dict[str, Any]]]:
+        """
+        Evaluate every statement of a round with every judge concurrently, one call per judge
+
+        Returns:
+            For each statement, its judge evaluations in the same order as self.judges
+        """
+        evaluations = [[] for _ in round_statements]
+        if not self.judges or not round_statements:
+            return evaluations
+
+        tasks = [asyncio.ensure_future(judge.aevaluate_round(round_statements)) for judge in self.judges]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=self.judge_timeout)
+            if pending:
+                late = [judge.judge_id for judge, task in zip(self.judges, tasks) if task in pending]
+                raise TimeoutError(
+                    f"Judge {late[0]} did not respond within {self.judge_timeout} seconds"
+                )
+
+            for judge, task in zip(self.judges, tasks):
+                for statement_evaluations, statement_scores in zip(evaluations, task.result()):
+                    statement_evaluations.append(self._judge_evaluation(judge, *statement_scores))
+            return evaluations
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _conduct_audience_decision_round(self):
+        """Conduct an audience decision round where the audience chooses a player to eliminate"""
+        self.current_voting_round += 1
+        active_players = [p for p in self.players if not p.eliminated]
+
+        current_round_statements = self._current_round_statements()
+
+        eliminated_id = (await self.audience.achoose_player_to_eliminate(current_round_statements, active_players))[0]
+
+        self._finish_audience_decision(active_players, eliminated_id)
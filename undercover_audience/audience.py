@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Tuple
+from undercover.compat import to_thread
 
 class Audience(ABC):
     """
@@ -22,10 +23,19 @@ class Audience(ABC):
             active_players: List of players still in the game
             
         Returns:
-            Tuple[int, str]: ID of the player to eliminate and elimination reason
+            Tuple[int, str]: ID of the player to eliminate and elimination reason; the ID is None
+                             when no choice could be made, and the game then picks a player at random
         """
         pass
     
+    async def achoose_player_to_eliminate(self, statement_history, active_players) -> Tuple[int, str]:
+        """
+        Async version of choose_player_to_eliminate
+        The default runs choose_player_to_eliminate in a worker thread; LLM audiences
+        override it with a native coroutine
+        """
+        return await to_thread(self.choose_player_to_eliminate, statement_history, active_players)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert audience information to a dictionary for JSON serialization"""
         return {
@@ -1,11 +1,19 @@
 import json
+import os
 import datetime
 import random
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait as futures_wait
 from typing import List, Dict, Any, Optional, Tuple
 
 from undercover_audience.player import Player
 from undercover_audience.judge import Judge
 from undercover_audience.audience import Audience
+from undercover.history import StatementHistory
+from undercover.prompt_budget import HistoryBudget
+
+JUDGE_MODES = ("statement", "round")
 
 class UndercoverAudienceGame:
     """Main class for the Undercover game with audience voting"""
@@ -19,7 +27,13 @@ class UndercoverAudienceGame:
                  civilian_count: int = 3,
                  undercover_count: int = 1,
                  max_statement_rounds: int = 10,
-                 statements_per_voting: int = 1):
+                 statements_per_voting: int = 1,
+                 judge_timeout: Optional[float] = None,
+                 seed: Optional[int] = None,
+                 checkpoint_path: Optional[str] = None,
+                 pipeline_statements: bool = False,
+                 prompt_budget: Optional[Dict[str, Any]] = None,
+                 judge_mode: str = "statement"):
         """
         Initialize the game
         
@@ -33,6 +47,14 @@ class UndercoverAudienceGame:
             undercover_count: Number of undercover players
             max_statement_rounds: Maximum number of statement rounds
             statements_per_voting: Number of complete statement rounds before each voting
+            judge_timeout: Seconds to wait for each judge evaluation (None waits indefinitely)
+            seed: Seed for role assignment, speaking order and vote tie-breaks (None = random)
+            checkpoint_path: File to snapshot the game state to after each statement and vote (None = no checkpoints)
+            pipeline_statements: Let the next player speak while the judges score the previous statement
+            prompt_budget: Token budget of the history in player and judge prompts, as HistoryBudget
+                           arguments (max_tokens, keep_rounds, strategy, model); None = full history
+            judge_mode: "statement" (each statement is judged as it is made) or "round" (every player
+                        speaks, then each judge scores the whole round in one call)
         """
         self.game_id = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
         self.timestamp = datetime.datetime.now().isoformat()
@@ -46,6 +68,15 @@ class UndercoverAudienceGame:
         self.undercover_count = undercover_count
         self.max_statement_rounds = max_statement_rounds
         self.statements_per_voting = statements_per_voting
+        self.judge_timeout = judge_timeout
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.checkpoint_path = checkpoint_path
+        self.pipeline_statements = pipeline_statements
+        self.prompt_budget = HistoryBudget.from_config(prompt_budget)
+        if judge_mode not in JUDGE_MODES:
+            raise ValueError(f"Unknown judge mode: {judge_mode}")
+        self.judge_mode = judge_mode
         
         # Game state
         self.current_statement_round = 0
@@ -54,13 +85,29 @@ class UndercoverAudienceGame:
         self.audience_decisions = []  # Replace voting_rounds
         self.game_over = False
         self.winner_role = None
+        self.resumed = False
+
+        # Position inside the current statement round (kept for checkpoints)
+        self._round_order = None  # Player IDs in speaking order, None between rounds
+        self._round_position = 0  # Index of the next speaker in _round_order
+        self._round_eliminated = []  # Players eliminated during the current round
+        self._rounds_since_voting = 0
+        self._speculation_base = {}  # Player ID -> last_analyze before a speculative statement
         
         # Game history by round for LLM context
         self.round_history = {}
-        self.statement_history = ""
+        self.history = StatementHistory()
         
         # Initialize game record
         self.game_record = self._initialize_game_record()
+        if self.prompt_budget is not None:
+            self.game_record["prompt_budget"] = {
+                **self.prompt_budget.describe(),
+                "history_tokens_per_call": [],
+                "truncated_calls": 0
+            }
+        if self.judge_mode == "round":
+            self.game_record["judge_mode"] = self.judge_mode
         
     def _initialize_game_record(self) -> Dict[str, Any]:
         """Initialize the game record"""
@@ -90,7 +137,7 @@ class UndercoverAudienceGame:
             
         # Randomly select civilians and undercovers
         all_indices = list(range(len(self.players)))
-        random.shuffle(all_indices)
+        self.rng.shuffle(all_indices)
         
         civilian_indices = all_indices[:self.civilian_count]
         undercover_indices = all_indices[self.civilian_count:self.civilian_count + self.undercover_count]
@@ -106,17 +153,21 @@ class UndercoverAudienceGame:
             self.game_record["players"].append(player.to_dict())
             
     def run_game(self):
-        """Run the game logic"""
-        self.setup_game()
+        """Run the game logic, or continue it after restore()"""
+        if not self.resumed:
+            self.setup_game()
+            self._save_checkpoint()
         
         while not self.game_over:
             # Phase 1: Statement Rounds
-            for round_number in range(1, self.statements_per_voting + 1):
-                self.current_statement_round += 1
-                
-                if self.current_statement_round > self.max_statement_rounds:
-                    self.game_over = True
-                    break
+            while self._rounds_since_voting < self.statements_per_voting:
+                # A restored game may be in the middle of a round
+                if self._round_order is None:
+                    self.current_statement_round += 1
+                    
+                    if self.current_statement_round > self.max_statement_rounds:
+                        self.game_over = True
+                        break
                 
                 # Conduct one complete round of statements
                 if not self._conduct_statement_round():
@@ -124,20 +175,22 @@ class UndercoverAudienceGame:
                 
                 # Update round history after each round
                 self._update_round_history(self.current_statement_round)
+                self._rounds_since_voting += 1
             
             # Phase 2: Audience Decision Round
             if not self.game_over:
                 self._conduct_audience_decision_round()
+                self._rounds_since_voting = 0
             
             # Check if game should end
             if self._check_win_conditions():
                 self.game_over = True
-                break
                 
             # Check if we've reached max rounds
-            if self.current_statement_round >= self.max_statement_rounds:
+            elif self.current_statement_round >= self.max_statement_rounds:
                 self.game_over = True
-                break
+
+            self._save_checkpoint()
         
         # Game over, update game record
         self._update_game_record()
@@ -149,147 +202,437 @@ class UndercoverAudienceGame:
         Returns:
             bool: True if the round completed normally, False if the game ended
         """
-        active_players = [p for p in self.players if not p.eliminated]
-        random.shuffle(active_players)
-        self.statement_history += f"\n\nRound {self.current_statement_round}:\n\n"
+        active_players = self._start_statement_round()
         
         # Keep track of players eliminated during this round
-        players_eliminated_this_round = []
-        
-        for player in active_players:
-            # Skip players eliminated during this round
-            if player in players_eliminated_this_round:
-                continue
-                
-            # Build current game state for player reference
-            game_state = self._build_game_state()
-            
-            # Player generates a statement
-            statement_content = player.generate_statement(self.statement_history)
-            
-            # Judge evaluates the statement
-            all_judges_metrics = []
-            judges_evaluations = []
-            another_concept = self.civilian_concept if player.assigned_concept == self.undercover_concept else self.undercover_concept
+        players_eliminated_this_round = self._round_eliminated
+
+        if self.judge_mode == "round":
+            return self._conduct_round_judged(active_players, players_eliminated_this_round)
+
+        # In pipelined mode, a worker generates the next statement while the judges score this one
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="StatementWorker") \
+            if self.pipeline_statements else None
+        speculative_statement = None
+
+        try:
+            for index, player in enumerate(active_players):
+                # Skip players eliminated during this round
+                if player in players_eliminated_this_round:
+                    continue
 
-            for judge in self.judges:
-                # Get the three scores from evaluate_statement
-                novelty_score, relevance_score, reasonableness_score = judge.evaluate_statement(
-                    self.statement_history,
-                    statement_content, 
+                # Build current game state for player reference
+                game_state = self._build_game_state()
+
+                # Player generates a statement (unless it was already generated speculatively)
+                if speculative_statement is not None:
+                    statement_content, speculative_statement = speculative_statement, None
+                else:
+                    statement_content = player.generate_statement(self._prompt_history())
+
+                speculation = None
+                if executor is not None and index + 1 < len(active_players):
+                    speculation = self._speculate_next_statement(executor, player, statement_content,
+                                                                 active_players[index + 1])
+
+                # Judge evaluates the statement (all judges in parallel)
+                another_concept = self._another_concept(player)
+                judges_evaluations = self._evaluate_statement_with_judges(
+                    statement_content,
                     player.assigned_concept,
                     another_concept
                 )
-                
-                # Convert to dictionary format for compatibility
-                judge_metrics = {
-                    "novelty_score": novelty_score,
-                    "relevance_score": relevance_score,
-                    "reasonableness_score": reasonableness_score
-                }
-                
-                # Store judge evaluation with ID
-                judge_evaluation = {
-                    "judge_id": judge.judge_id,
-                    "metrics": judge_metrics
-                }
-                
-                all_judges_metrics.append(judge_metrics)
-                judges_evaluations.append(judge_evaluation)
 
-            # Calculate mean and variance for each metric across all judges
-            metrics_stats = {}
+                # Record the statement and apply any metric elimination
+                recorded = self._record_statement(player, statement_content, judges_evaluations,
+                                                  players_eliminated_this_round)
 
-            if all_judges_metrics:
-                # Process each metric type
-                for metric_name in ["novelty_score", "relevance_score", "reasonableness_score"]:
-                    scores = [judge_metrics[metric_name] for judge_metrics in all_judges_metrics]
-                    
-                    if scores:
-                        # Calculate mean score
-                        mean_score = sum(scores) / len(scores)
-                        
-                        # Calculate variance
-                        if len(scores) > 1:
-                            variance = sum((x - mean_score) ** 2 for x in scores) / len(scores)
-                        else:
-                            variance = 0
-                        
-                        # Store stats
-                        metrics_stats[f"{metric_name}_mean"] = mean_score
-                        metrics_stats[f"{metric_name}_variance"] = variance
-                        metrics_stats[f"{metric_name}_all_values"] = {
-                            judge_eval["judge_id"]: judge_eval["metrics"][metric_name]
-                            for judge_eval in judges_evaluations
-                        }
-
-            # Check if player should be eliminated based on low novelty or reasonableness
-            novelty_mean = metrics_stats.get("novelty_score_mean", 1.0)
-            reasonableness_mean = metrics_stats.get("reasonableness_score_mean", 1.0)
-            
-            should_eliminate = novelty_mean <= 0.3 or reasonableness_mean <= 0.3
-            elimination_reason = None
-            
-            if should_eliminate:
-                if novelty_mean < 0.3:
-                    elimination_reason = f"Low novelty score: {novelty_mean:.2f}"
-                if reasonableness_mean < 0.3:
-                    if elimination_reason:
-                        elimination_reason += f" and low reasonableness score: {reasonableness_mean:.2f}"
-                    else:
-                        elimination_reason = f"Low reasonableness score: {reasonableness_mean:.2f}"
-
-            # Store all judges' evaluations and stats
-            metrics = {
-                "judges_evaluations": judges_evaluations,
-                "judges_stats": metrics_stats
-            }
+                if speculation is not None:
+                    speculative_statement = self._resolve_speculation(active_players[index + 1], *speculation)
+
+                if not recorded:
+                    return False
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+        self._round_order = None
+        return True
+
+    def _conduct_round_judged(self, active_players: List[Player],
+                              players_eliminated_this_round: List[Player]) -> bool:
+        """
+        Round-batch judging: every player speaks, then each judge scores the whole round in one call
+
+        Metric eliminations are applied in speaking order once the round is scored, up to the
+        first one that ends the game. The round is checkpointed as a whole, so a round
+        interrupted before it is scored is played again.
+
+        Returns:
+            bool: True if the round completed normally, False if the game ended
+        """
+        round_statements = []
+        for player in active_players:
+            history = self._prompt_history()
+            statement_content = player.generate_statement(history)
+            self.history.append_statement(self.current_statement_round, player.player_id, statement_content)
+            round_statements.append(self._round_statement(player, statement_content, history))
+
+        evaluations = self._evaluate_round_with_judges(round_statements)
+
+        for player, item, judges_evaluations in zip(active_players, round_statements, evaluations):
+            if not self._record_statement(player, item["statement"], judges_evaluations,
+                                          players_eliminated_this_round, batched=True):
+                # As in statement mode, the game ends here: later statements of the round are not recorded
+                break
+        self._save_checkpoint()
+
+        if self.game_over:
+            return False
+        self._round_order = None
+        return True
+
+    def _round_statement(self, player: Player, statement_content: str, history: str) -> Dict[str, Any]:
+        """A statement as passed to Judge.evaluate_round"""
+        return {
+            "player_id": player.player_id,
+            "statement": statement_content,
+            "word1": player.assigned_concept,
+            "word2": self._another_concept(player),
+            "history": history
+        }
+
+    def _speculate_next_statement(self, executor: ThreadPoolExecutor, player: Player, statement_content: str,
+                                  next_player: Player):
+        """
+        Start the next player's statement on the history as it will be if this statement is
+        recorded without an elimination
+
+        Returns:
+            Tuple: (history length it assumes, future of the speculative statement)
+        """
+        history = self._speculative_history(player, statement_content)
+        self._speculation_base[next_player.player_id] = next_player.last_analyze
+        future = executor.submit(contextvars.copy_context().run, next_player.generate_statement, history)
+        return len(self.history) + 1, future
+
+    def _resolve_speculation(self, next_player: Player, expected_events: int, future) -> Optional[str]:
+        """
+        Keep a speculative statement if the history it was generated on is the actual one
+
+        Returns:
+            str or None: The statement, or None if it was discarded (the previous player was
+                         eliminated or the game ended) and must be generated again
+        """
+        # Anything beyond the statement itself (an elimination notice) changes the history
+        if not self.game_over and len(self.history) == expected_events:
+            try:
+                return future.result()
+            finally:
+                del self._speculation_base[next_player.player_id]
+
+        # Discard it, and undo the analysis the player kept from it
+        futures_wait([future])
+        next_player.last_analyze = self._speculation_base.pop(next_player.player_id)
+        return None
+    
+    def _start_statement_round(self) -> List[Player]:
+        """
+        Open a new statement round: fix the speaking order and add the round header to the history
+
+        A round that was interrupted (restored from a checkpoint) is continued instead.
+
+        Returns:
+            List[Player]: Players still to speak in this round, in speaking order
+        """
+        if self._round_order is None:
+            active_players = [p for p in self.players if not p.eliminated]
+            self.rng.shuffle(active_players)
+            self.history.append_round(self.current_statement_round)
+            self._round_order = [p.player_id for p in active_players]
+            self._round_position = 0
+            self._round_eliminated = []
+
+        players_by_id = {p.player_id: p for p in self.players}
+        return [players_by_id[player_id] for player_id in self._round_order[self._round_position:]]
+
+    @property
+    def statement_history(self) -> str:
+        """The statement history as shown in prompts (rendered from the cached rounds of self.history)"""
+        return self.history.render()
+
+    def _prompt_history(self, history: Optional[StatementHistory] = None) -> str:
+        """
+        The statement history for one prompt, within the token budget if the game has one
+
+        The tokens of every budgeted history are recorded in game_record["prompt_budget"].
+        """
+        if self.prompt_budget is None:
+            return self.statement_history if history is None else history.render()
+
+        text, tokens, truncated = self.prompt_budget.view(self.history if history is None else history)
+        usage = self.game_record["prompt_budget"]
+        usage["history_tokens_per_call"].append(tokens)
+        usage["truncated_calls"] += int(truncated)
+        return text
+
+    def _speculative_history(self, player: Player, statement_content: str) -> str:
+        """The prompt history as it will be once a statement is recorded without an elimination"""
+        if self.prompt_budget is None:
+            return self.statement_history + self._statement_line(player, statement_content)
+
+        history = StatementHistory.from_list(self.history.to_list())
+        history.append_statement(self.current_statement_round, player.player_id, statement_content)
+        return self._prompt_history(history)
+
+    def _statement_line(self, player: Player, statement_content: str) -> str:
+        """A statement as it appears in the statement history"""
+        return self.history.format_statement(player.player_id, statement_content)
+
+    def _another_concept(self, player: Player) -> str:
+        """The concept of the other side, from the point of view of a player"""
+        return self.civilian_concept if player.assigned_concept == self.undercover_concept else self.undercover_concept
+
+    def _record_statement(self, player: Player, statement_content: str,
+                          judges_evaluations: List[Dict[str, Any]],
+                          players_eliminated_this_round: List[Player], batched: bool = False) -> bool:
+        """
+        Record a judged statement and eliminate the player if the judges' scores are too low
+
+        Parameters:
+            player: The player who made the statement
+            statement_content: The statement
+            judges_evaluations: Judge evaluations in judge order
+            players_eliminated_this_round: Players eliminated so far in this round (updated in place)
+            batched: The statement was judged with its round: it is already in the history and
+                     the round is checkpointed as a whole
+
+        Returns:
+            bool: False if the game ended because of an elimination, True otherwise
+        """
+        # Calculate mean and variance for each metric across all judges
+        metrics_stats = self._calculate_judges_stats(judges_evaluations)
+
+        # Check if player should be eliminated based on low novelty or reasonableness
+        novelty_mean = metrics_stats.get("novelty_score_mean", 1.0)
+        reasonableness_mean = metrics_stats.get("reasonableness_score_mean", 1.0)
+
+        should_eliminate = novelty_mean <= 0.3 or reasonableness_mean <= 0.3
+        elimination_reason = None
+
+        if should_eliminate:
+            if novelty_mean < 0.3:
+                elimination_reason = f"Low novelty score: {novelty_mean:.2f}"
+            if reasonableness_mean < 0.3:
+                if elimination_reason:
+                    elimination_reason += f" and low reasonableness score: {reasonableness_mean:.2f}"
+                else:
+                    elimination_reason = f"Low reasonableness score: {reasonableness_mean:.2f}"
+
+        # Store all judges' evaluations and stats
+        metrics = {
+            "judges_evaluations": judges_evaluations,
+            "judges_stats": metrics_stats
+        }
+
+        # Record the statement
+        statement_id = len(self.statements) + 1
+        statement = {
+            "statement_id": statement_id,
+            "player_id": player.player_id,
+            "llm_id": player.llm_id,
+            "content": statement_content,
+            "statement_round": self.current_statement_round,
+            "metrics": metrics,
+        }
+
+        self.statements.append(statement)
+        self.game_record["game_process"]["statements"].append(statement)
+        if not batched:
+            self.history.append_statement(self.current_statement_round, player.player_id, statement_content)
+
+        # Eliminate player if necessary
+        if should_eliminate:
+            player.eliminate(-1)
+            players_eliminated_this_round.append(player)
 
-            # Record the statement
-            statement_id = len(self.statements) + 1
-            statement = {
-                "statement_id": statement_id,
+            # Record the elimination in a special "metric_elimination" list
+            if "metric_eliminations" not in self.game_record["game_process"]:
+                self.game_record["game_process"]["metric_eliminations"] = []
+
+            eliminated_info = {
                 "player_id": player.player_id,
                 "llm_id": player.llm_id,
-                "content": statement_content,
-                "statement_round": self.current_statement_round,
-                "metrics": metrics,
+                "role": player.role,
+                "elimination_round": self.current_statement_round,
+                "elimination_reason": elimination_reason,
+                "metrics": {
+                    "novelty_mean": novelty_mean,
+                    "reasonableness_mean": reasonableness_mean
+                }
             }
-            
-            self.statements.append(statement)
-            self.game_record["game_process"]["statements"].append(statement)
-            self.statement_history += f"Player_{player.player_id}: {statement_content}\n"
-            
-            # Eliminate player if necessary
-            if should_eliminate:
-                player.eliminate(-1)
-                players_eliminated_this_round.append(player)
-                
-                # Record the elimination in a special "metric_elimination" list
-                if "metric_eliminations" not in self.game_record["game_process"]:
-                    self.game_record["game_process"]["metric_eliminations"] = []
-                    
-                eliminated_info = {
-                    "player_id": player.player_id,
-                    "llm_id": player.llm_id,
-                    "role": player.role,
-                    "elimination_round": self.current_statement_round,
-                    "elimination_reason": elimination_reason,
-                    "metrics": {
-                        "novelty_mean": novelty_mean,
-                        "reasonableness_mean": reasonableness_mean
-                    }
+
+            self.game_record["game_process"]["metric_eliminations"].append(eliminated_info)
+            self.history.append_elimination(self.current_statement_round, player.player_id, elimination_reason)
+
+            # After each elimination, check if the game should end
+            if self._check_win_conditions():
+                self.game_over = True
+
+        self._round_position += 1
+        if not batched:
+            self._save_checkpoint()
+        return not self.game_over
+
+    def _evaluate_statement_with_judges(self, statement_content: str, assigned_concept: str,
+                                        another_concept: str) -> List[Dict[str, Any]]:
+        """
+        Evaluate a statement with every judge concurrently
+
+        Each judge runs on its own worker thread, so the latency of a statement is the
+        slowest judge round-trip instead of the sum of all of them.
+
+        Parameters:
+            statement_content: The player's statement
+            assigned_concept: The concept assigned to the player
+            another_concept: The other concept in this game
+
+        Returns:
+            List of judge evaluations ({"judge_id", "metrics"}), in the same order as self.judges
+        """
+        if not self.judges:
+            return []
+
+        executor = ThreadPoolExecutor(max_workers=len(self.judges), thread_name_prefix="JudgeWorker")
+        futures = []
+        try:
+            # Each judge runs in a copy of the caller's context (active cassette etc.)
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    judge.evaluate_statement,
+                    self._prompt_history(),
+                    statement_content,
+                    assigned_concept,
+                    another_concept
+                )
+                for judge in self.judges
+            ]
+
+            # All judges start together, so they share one deadline
+            deadline = time.monotonic() + self.judge_timeout if self.judge_timeout is not None else None
+
+            judges_evaluations = []
+            for judge, future in zip(self.judges, futures):
+                remaining = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+                try:
+                    novelty_score, relevance_score, reasonableness_score = future.result(timeout=remaining)
+                except FutureTimeoutError:
+                    raise TimeoutError(
+                        f"Judge {judge.judge_id} did not respond within {self.judge_timeout} seconds"
+                    )
+
+                # Store judge evaluation with ID
+                judges_evaluations.append(
+                    self._judge_evaluation(judge, novelty_score, relevance_score, reasonableness_score)
+                )
+
+            return judges_evaluations
+        finally:
+            # Cancel the judges not started yet and do not block on one that timed out
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _evaluate_round_with_judges(self, round_statements: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Evaluate every statement of a round with every judge concurrently, one call per judge
+
+        Parameters:
+            round_statements: The statements of the round (see _round_statement)
+
+        Returns:
+            For each statement, its judge evaluations in the same order as self.judges
+        """
+        evaluations = [[] for _ in round_statements]
+        if not self.judges or not round_statements:
+            return evaluations
+
+        executor = ThreadPoolExecutor(max_workers=len(self.judges), thread_name_prefix="JudgeWorker")
+        futures = []
+        try:
+            futures = [
+                executor.submit(contextvars.copy_context().run, judge.evaluate_round, round_statements)
+                for judge in self.judges
+            ]
+
+            # The timeout covers each judge's call for the whole round
+            deadline = time.monotonic() + self.judge_timeout if self.judge_timeout is not None else None
+
+            for judge, future in zip(self.judges, futures):
+                remaining = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+                try:
+                    scores = future.result(timeout=remaining)
+                except FutureTimeoutError:
+                    raise TimeoutError(
+                        f"Judge {judge.judge_id} did not respond within {self.judge_timeout} seconds"
+                    )
+                for statement_evaluations, statement_scores in zip(evaluations, scores):
+                    statement_evaluations.append(self._judge_evaluation(judge, *statement_scores))
+
+            return evaluations
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _judge_evaluation(judge: Judge, novelty_score, relevance_score, reasonableness_score) -> Dict[str, Any]:
+        """One judge's evaluation of a statement, as stored in the game record"""
+        return {
+            "judge_id": judge.judge_id,
+            "metrics": {
+                "novelty_score": novelty_score,
+                "relevance_score": relevance_score,
+                "reasonableness_score": reasonableness_score
+            }
+        }
+
+    def _calculate_judges_stats(self, judges_evaluations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Calculate mean and variance for each metric across all judges
+
+        Parameters:
+            judges_evaluations: Judge evaluations in judge order
+
+        Returns:
+            Dict with "<metric>_mean", "<metric>_variance" and "<metric>_all_values" entries
+        """
+        metrics_stats = {}
+
+        if judges_evaluations:
+            # Process each metric type
+            for metric_name in ["novelty_score", "relevance_score", "reasonableness_score"]:
+                scores = [judge_eval["metrics"][metric_name] for judge_eval in judges_evaluations]
+
+                # Calculate mean score
+                mean_score = sum(scores) / len(scores)
+
+                # Calculate variance
+                if len(scores) > 1:
+                    variance = sum((x - mean_score) ** 2 for x in scores) / len(scores)
+                else:
+                    variance = 0
+
+                # Store stats
+                metrics_stats[f"{metric_name}_mean"] = mean_score
+                metrics_stats[f"{metric_name}_variance"] = variance
+                metrics_stats[f"{metric_name}_all_values"] = {
+                    judge_eval["judge_id"]: judge_eval["metrics"][metric_name]
+                    for judge_eval in judges_evaluations
                 }
-                
-                self.game_record["game_process"]["metric_eliminations"].append(eliminated_info)
-                self.statement_history += f"Player_{player.player_id} was eliminated due to: {elimination_reason}\n"
-                
-                # After each elimination, check if the game should end
-                if self._check_win_conditions():
-                    self.game_over = True
-                    return False
-            
-        return True
+
+        return metrics_stats
     
     def _check_win_conditions(self) -> bool:
         """Check if the game should end based on win conditions"""
@@ -333,23 +676,22 @@ class UndercoverAudienceGame:
         Parameters:
             round_number: The round number to update
         """
-        round_statements = [s for s in self.statements if s["statement_round"] == round_number]
-        
+        players_by_id = {p.player_id: p for p in self.players}
+
         # Format history for this round
         round_history = {
             "round_number": round_number,
             "statements": []
         }
         
-        for statement in round_statements:
-            player_id = statement["player_id"]
-            player = next((p for p in self.players if p.player_id == player_id), None)
+        for statement in self.history.statements(round_number):
+            player = players_by_id.get(statement.player_id)
             
             if player:
                 round_history["statements"].append({
-                    "player_id": player_id,
+                    "player_id": statement.player_id,
                     "llm_id": player.llm_id,
-                    "content": statement["content"]
+                    "content": statement.content
                 })
         
         # Add audience decision if available for this round
@@ -368,22 +710,35 @@ class UndercoverAudienceGame:
         self.current_voting_round += 1
         active_players = [p for p in self.players if not p.eliminated]
         
-        current_round_statements = ""
-        round_statements = [s for s in self.statements if s["statement_round"] == self.current_statement_round]
-        
-        for statement in round_statements:
-            player_id = statement["player_id"]
-            content = statement["content"]
-            current_round_statements += f"Player_{player_id}: {content}\n"
+        current_round_statements = self._current_round_statements()
 
         eliminated_id = self.audience.choose_player_to_eliminate(current_round_statements, active_players)[0]
 
+        self._finish_audience_decision(active_players, eliminated_id)
+
+    def _current_round_statements(self) -> str:
+        """The statements of the current statement round, as shown to the audience"""
+        return self.history.render_statements(self.current_statement_round)
+
+    def _finish_audience_decision(self, active_players: List[Player], eliminated_id: int):
+        """
+        Eliminate the player chosen by the audience and record the decision
+
+        Parameters:
+            active_players: Players who were active when the decision round started
+            eliminated_id: ID of the player chosen by the audience (None if it could not choose)
+        """
         eliminated_player = None
         for p in active_players:
             if p.player_id == eliminated_id:
                 eliminated_player = p
                 break
 
+        if eliminated_player is None:
+            # No valid choice: eliminate a random active player, drawn from the game's seeded rng
+            eliminated_player = self.rng.choice(active_players)
+            eliminated_id = eliminated_player.player_id
+
         eliminated_player.eliminate(self.current_voting_round)
 
         # Determine if the elimination was correct
@@ -439,6 +794,117 @@ class UndercoverAudienceGame:
             "game_decision_quality": correct_identifications / (correct_identifications + incorrect_identifications) if (correct_identifications + incorrect_identifications) > 0 else 0
         }
     
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Capture the full game state, so that an interrupted game can be resumed with restore()
+
+        Returns:
+            Dict: JSON-serializable snapshot
+        """
+        rng_version, rng_internal, rng_gauss = self.rng.getstate()
+        return {
+            "version": 2,
+            "game_record": self.game_record,
+            "players": [{
+                "player_id": p.player_id,
+                "role": p.role,
+                "assigned_concept": p.assigned_concept,
+                "another_concept": p.another_concept,
+                "eliminated": p.eliminated,
+                "eliminated_in_voting_round": p.eliminated_in_voting_round,
+                "is_winner": p.is_winner,
+                # A speculative statement in flight has not been made yet
+                "last_analyze": self._speculation_base.get(p.player_id, p.last_analyze)
+            } for p in self.players],
+            "audience_last_analyze": self.audience.last_analyze,
+            "current_statement_round": self.current_statement_round,
+            "current_voting_round": self.current_voting_round,
+            "game_over": self.game_over,
+            "winner_role": self.winner_role,
+            "history": self.history.to_list(),
+            "round_history": self.round_history,
+            "round_order": self._round_order,
+            "round_position": self._round_position,
+            "round_eliminated": [p.player_id for p in self._round_eliminated],
+            "rounds_since_voting": self._rounds_since_voting,
+            "rng_state": [rng_version, list(rng_internal), rng_gauss]
+        }
+
+    def restore(self, snapshot: Dict[str, Any]):
+        """
+        Restore a snapshot taken by snapshot(); run_game() then continues the game where it stopped
+
+        The game must have been created with the same players (IDs and LLMs), judges and settings.
+
+        Parameters:
+            snapshot: Snapshot of a game started with the same configuration
+
+        Raises:
+            ValueError: If the snapshot has an unknown version or was taken with different players
+        """
+        if snapshot.get("version") not in (1, 2):
+            raise ValueError(f"Unsupported checkpoint version: {snapshot.get('version')}")
+        recorded = sorted((p["player_id"], p["llm_id"]) for p in snapshot["game_record"]["players"])
+        if (recorded != sorted((p.player_id, p.llm_id) for p in self.players)
+                or sorted(info["player_id"] for info in snapshot["players"]) != [p[0] for p in recorded]):
+            raise ValueError("Checkpoint was taken by a game with different players")
+
+        self.game_record = snapshot["game_record"]
+        self.game_id = self.game_record["game_id"]
+        self.timestamp = self.game_record["timestamp"]
+        self.statements = list(self.game_record["game_process"]["statements"])
+        self.audience_decisions = list(self.game_record["game_process"]["audience_decisions"])
+
+        players_by_id = {p.player_id: p for p in self.players}
+        for info in snapshot["players"]:
+            player = players_by_id[info["player_id"]]
+            player.assign_role(info["role"], info["assigned_concept"], info["another_concept"])
+            player.eliminated = info["eliminated"]
+            player.eliminated_in_voting_round = info["eliminated_in_voting_round"]
+            player.is_winner = info["is_winner"]
+            player.last_analyze = info["last_analyze"]
+        self.audience.last_analyze = snapshot["audience_last_analyze"]
+
+        self.current_statement_round = snapshot["current_statement_round"]
+        self.current_voting_round = snapshot["current_voting_round"]
+        self.game_over = snapshot["game_over"]
+        self.winner_role = snapshot["winner_role"]
+        if "history" in snapshot:
+            self.history = StatementHistory.from_list(snapshot["history"])
+        else:
+            # Version 1 checkpoints hold the rendered history only
+            self.history = StatementHistory.from_text(snapshot["statement_history"])
+        # JSON turns the integer round numbers into strings
+        self.round_history = {int(k): v for k, v in snapshot["round_history"].items()}
+        self._round_order = snapshot["round_order"]
+        self._round_position = snapshot["round_position"]
+        self._round_eliminated = [players_by_id[player_id] for player_id in snapshot["round_eliminated"]]
+        self._rounds_since_voting = snapshot["rounds_since_voting"]
+
+        rng_version, rng_internal, rng_gauss = snapshot["rng_state"]
+        self.rng.setstate((rng_version, tuple(rng_internal), rng_gauss))
+        self.resumed = True
+
+    def _save_checkpoint(self):
+        """Write the snapshot to checkpoint_path, atomically so a crash never leaves a torn file"""
+        if not self.checkpoint_path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    @staticmethod
+    def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+        """Read a checkpoint file written by a game; None if there is none"""
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
     def get_game_record(self) -> Dict[str, Any]:
         """Get the complete game record"""
         return {"game_record": self.game_record}
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Tuple
+from undercover.compat import to_thread
 
 class Player(ABC):
     """
@@ -46,6 +47,19 @@ class Player(ABC):
         
 
 
+    async def agenerate_statement(self, statement_history) -> str:
+        """
+        Async version of generate_statement
+        The default runs generate_statement in a worker thread; LLM players override it
+        with a native coroutine
+        """
+        return await to_thread(self.generate_statement, statement_history)
+
+    def __repr__(self) -> str:
+        # Players are listed in prompts (e.g. the surviving players in a vote), so the
+        # representation must be stable across runs rather than a memory address
+        return f"Player_{self.player_id}"
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert player information to a dictionary for JSON serialization"""
         return {